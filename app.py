@@ -1,12 +1,16 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file
 from flask_cors import CORS
-import subprocess
+import atexit
 import json
 import os
+import sys
 import tempfile
+import threading
 import time
 from datetime import datetime
 import base64
+import io
+import zipfile
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend integration
@@ -18,76 +22,207 @@ OUTPUT_DIR = 'yantra_outputs'
 os.makedirs(YANTRA_FILES_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-def run_yantra_script(script_path, inputs):
+# Yantra modules are imported once per process and called directly
+sys.path.insert(0, os.path.abspath(YANTRA_FILES_DIR))
+import yantra_engine
+from yantra_pool import WorkerPool, WorkerTimeout
+from yantra_cache import (ResultCache, DiskResultStore, TieredResultCache, SingleFlight,
+                          ArtifactStore, GridStore, result_size)
+from yantra_jobs import JobManager, QueueFull
+
+# ====== RESULT CACHE ======
+# Memory LRU first, then a SQLite store under OUTPUT_DIR that survives
+# restarts (set YANTRA_DISK_CACHE_MAX_MB=0 to disable the disk tier)
+DISK_CACHE_MAX_MB = float(os.environ.get('YANTRA_DISK_CACHE_MAX_MB', 512))
+
+result_cache = TieredResultCache(
+    ResultCache(
+        max_bytes=int(float(os.environ.get('YANTRA_CACHE_MAX_MB', 64)) * 1024 * 1024),
+        ttl_seconds=float(os.environ.get('YANTRA_CACHE_TTL', 3600))
+    ),
+    DiskResultStore(
+        os.path.join(OUTPUT_DIR, 'yantra_cache.sqlite3'),
+        max_bytes=int(DISK_CACHE_MAX_MB * 1024 * 1024)
+    ) if DISK_CACHE_MAX_MB > 0 else None
+)
+ADMIN_TOKEN = os.environ.get('YANTRA_ADMIN_TOKEN')
+
+# Rendered images and other artifacts are served by URL from a
+# content-addressed directory; responses only inline base64 on request.
+# The directory is bounded in size and drops artifacts not saved again
+# within the retention period (YANTRA_ARTIFACT_RETENTION seconds).
+artifact_store = ArtifactStore(
+    os.path.join(OUTPUT_DIR, 'artifacts'),
+    max_bytes=int(float(os.environ.get('YANTRA_ARTIFACT_MAX_MB', 1024)) * 1024 * 1024),
+    max_age_seconds=float(os.environ.get('YANTRA_ARTIFACT_RETENTION', 7 * 24 * 3600))
+)
+ARTIFACT_MAX_AGE = 365 * 24 * 3600
+
+# Minute-by-minute solar grids, one memory-mapped .npy per site and year,
+# bounded like the artifacts: grids not requested again within
+# YANTRA_GRID_RETENTION seconds, or beyond YANTRA_GRID_MAX_MB, are removed
+GRID_DIR = os.path.join(OUTPUT_DIR, 'grids')
+grid_store = GridStore(
+    GRID_DIR,
+    max_bytes=int(float(os.environ.get('YANTRA_GRID_MAX_MB', 2048)) * 1024 * 1024),
+    max_age_seconds=float(os.environ.get('YANTRA_GRID_RETENTION', 7 * 24 * 3600))
+)
+
+# Identical requests arriving while one is still computing wait for and
+# share that computation instead of starting their own
+in_flight = SingleFlight()
+
+# ====== EXECUTION MODE ======
+# "inprocess" computes in the Flask process; "pool" hands jobs to
+# pre-warmed worker processes (see yantra_pool.py)
+EXECUTION_MODE = os.environ.get('YANTRA_EXECUTION_MODE', 'inprocess')
+POOL_SIZE = int(os.environ.get('YANTRA_POOL_SIZE', os.cpu_count() or 1))
+WORKER_MAX_JOBS = int(os.environ.get('YANTRA_WORKER_MAX_JOBS', 500))
+WORKER_MAX_RSS_MB = int(os.environ.get('YANTRA_WORKER_MAX_RSS_MB', 512))
+JOB_TIMEOUT = float(os.environ.get('YANTRA_JOB_TIMEOUT', 60))
+
+_worker_pool = None
+_worker_pool_lock = threading.Lock()
+
+def get_worker_pool():
     """
-    Run a yantra Python script with given inputs and capture output
+    Create the worker pool on first use so in-process mode never spawns workers
+    """
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = WorkerPool(
+                os.path.abspath(os.path.join(YANTRA_FILES_DIR, 'yantra_worker.py')),
+                os.path.abspath(YANTRA_FILES_DIR),
+                size=POOL_SIZE,
+                max_jobs_per_worker=WORKER_MAX_JOBS,
+                max_rss_mb=WORKER_MAX_RSS_MB,
+                job_timeout=JOB_TIMEOUT
+            )
+            atexit.register(_worker_pool.shutdown)
+        return _worker_pool
+
+def run_yantra_script(yantra_type, parameters, render=True):
+    """
+    Run a yantra job on an idle pooled worker and decode its reply
     """
     try:
-        # Create input string for the script
-        input_string = '\n'.join(inputs) + '\n'
-        
-        # Run the script with inputs
-        process = subprocess.Popen(
-            ['python', script_path],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            cwd=os.path.dirname(os.path.abspath(script_path))
-        )
-        
-        stdout, stderr = process.communicate(input=input_string, timeout=60)
-        
-        if process.returncode != 0:
-            return {"success": False, "error": f"Script error: {stderr}"}
-        
-        return {"success": True, "output": stdout, "error": stderr}
-        
-    except subprocess.TimeoutExpired:
-        process.kill()
-        return {"success": False, "error": "Script execution timeout"}
+        reply = get_worker_pool().run(yantra_type, parameters, render)
+    except WorkerTimeout:
+        return {"success": False, "error": "Script execution timeout", "status": 504}
+    except Exception as e:
+        return {"success": False, "error": f"Execution error: {str(e)}", "status": 500}
+
+    if not reply["success"]:
+        status = 400 if reply.get("error_type") == "invalid_parameters" else 500
+        return {"success": False, "error": reply["error"], "status": status}
+
+    return {
+        "success": True,
+        "yantra_data": reply["yantra_data"],
+        "output": reply["output"],
+        "artifacts": [
+            dict(artifact, data=base64.b64decode(artifact["data"]))
+            for artifact in reply["artifacts"]
+        ]
+    }
+
+def run_yantra_inprocess(yantra_type, parameters, render=True):
+    """
+    Run a yantra calculation directly in the Flask process
+    """
+    try:
+        result = yantra_engine.run_yantra(yantra_type, parameters, render)
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid parameter: {e}", "status": 400}
     except Exception as e:
-        return {"success": False, "error": f"Execution error: {str(e)}"}
+        return {"success": False, "error": f"Execution error: {str(e)}", "status": 500}
+    result["success"] = True
+    return result
 
-def find_generated_files(output_dir, yantra_name):
+def execute_yantra(yantra_type, parameters, render=True):
     """
-    Find generated JSON and image files
+    Dispatch a yantra job according to the configured execution mode
     """
-    json_file = None
-    image_file = None
-    
-    # Look for JSON file    
-    possible_json_names = [
-        "Samrat_Yantra_Calcs.json",
-        "rasi_valya_yantra.json", 
-        "dpcy.json",
-        "rama_yantra.json",
-        "diagsma_yantra.json"
-    ]
-    
-    for filename in os.listdir(output_dir):
-        if filename.endswith('.json') and any(name in filename for name in possible_json_names):
-            json_file = os.path.join(output_dir, filename)
-            break
-    
-    # Look for image files (PNG, JPG, etc.)
-    for filename in os.listdir(output_dir):
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg', '.svg')):
-            image_file = os.path.join(output_dir, filename)
-            break
-    
-    return json_file, image_file
+    if EXECUTION_MODE == 'pool':
+        return run_yantra_script(yantra_type, parameters, render)
+    return run_yantra_inprocess(yantra_type, parameters, render)
 
-def encode_image_to_base64(image_path):
+# ====== ASYNC JOBS ======
+# Jobs are drained by their own threads, so HTTP threads return as soon as
+# a job is queued; each job thread runs tasks through the normal cached
+# execution path (in-process or on the worker pool)
+JOB_WORKERS = int(os.environ.get('YANTRA_JOB_WORKERS', POOL_SIZE))
+JOB_QUEUE_SIZE = int(os.environ.get('YANTRA_JOB_QUEUE_SIZE', 64))
+JOB_RETENTION = float(os.environ.get('YANTRA_JOB_RETENTION', 3600))
+MAX_JOB_TASKS = int(os.environ.get('YANTRA_MAX_JOB_TASKS', 366))
+
+def run_job_task(yantra_type, parameters, render=True):
     """
-    Convert image file to base64 string
+    Compute one task of an async job. Artifacts are saved to the artifact
+    store and the job keeps only the script output and their manifest
+    entries (with URLs), so finished jobs hold neither rendered payloads
+    nor the full yantra geometry in memory.
     """
     try:
-        with open(image_path, 'rb') as img_file:
-            return base64.b64encode(img_file.read()).decode('utf-8')
-    except Exception as e:
-        return None
-    
+        result, _ = compute_cached(yantra_type, parameters, render)
+    except ValueError as e:
+        return {"success": False, "error": f"Invalid parameter: {e}", "status": 400}
+    if not result["success"]:
+        return result
+    manifest = yantra_engine.artifact_manifest(result["artifacts"])
+    for entry, artifact in zip(manifest, result["artifacts"]):
+        entry["url"] = artifact_url(artifact_store.save(artifact))
+    return {"success": True, "output": result["output"], "artifacts": manifest}
+
+job_manager = JobManager(run_job_task, workers=JOB_WORKERS, max_queue=JOB_QUEUE_SIZE,
+                         retention_seconds=JOB_RETENTION)
+
+def wants_inline_image(data):
+    """
+    Base64 image inlining is opt-in via ?inline_image=true or
+    "inline_image": true in the request body
+    """
+    flag = request.args.get('inline_image', data.get("inline_image", False))
+    if isinstance(flag, str):
+        return flag.lower() in ("1", "true", "yes")
+    return bool(flag)
+
+def wants_render(data):
+    """
+    Images are rendered unless ?render=false or "render": false is given,
+    in which case only the geometry JSON is computed and matplotlib is
+    never loaded
+    """
+    flag = request.args.get('render', data.get("render", True))
+    if isinstance(flag, str):
+        return flag.lower() not in ("0", "false", "no")
+    return bool(flag)
+
+def artifact_url(name):
+    return f"/api/artifacts/{name}"
+
+def compute_cached(yantra_type, parameters, render=True):
+    """
+    Serve a yantra result from the cache, or compute it once (coalescing
+    identical concurrent requests) and cache it. Returns (result, status)
+    where status is HIT, MISS or COALESCED. Raises ValueError on invalid
+    parameters.
+    """
+    key = yantra_engine.cache_key(yantra_type, parameters, render)
+    result = result_cache.get(key)
+    if result is not None:
+        return result, "HIT"
+
+    def compute():
+        computed = execute_yantra(yantra_type, parameters, render)
+        if computed["success"]:
+            result_cache.put(key, computed, result_size(computed))
+        return computed
+
+    result, shared = in_flight.run(key, compute)
+    return result, "COALESCED" if shared else "MISS"
+
 # ====== ROUTE: GENERIC YANTRA RUNNER ======
 @app.route('/api/yantra/<yantra_type>', methods=['POST'])
 def run_yantra(yantra_type):
@@ -107,322 +242,309 @@ def run_yantra(yantra_type):
            run_rama_yantra() if yantra_type == "rama" else \
            run_diagsma_yantra()
 
-# ====== ROUTE 1: SAMRAT YANTRA ======
-@app.route('/api/samrat-yantra', methods=['POST'])
-def run_samrat_yantra():
+# ====== ROUTE: BATCH YANTRA RUNNER ======
+@app.route('/api/yantra/<yantra_type>/batch', methods=['POST'])
+def run_yantra_batch(yantra_type):
     """
-    Run Samrat Yantra script with provided parameters
+    Evaluate hour-line angles, equation of time, declination and local
+    solar noon (or, for diagsma, sun and shadow bearings at a time) for
+    many sites/dates in one vectorised pass. Each parameter may be a list
+    (one per row) or a scalar shared by all rows; results come back as
+    columns.
     """
+    if yantra_type not in yantra_engine.BATCH_YANTRAS:
+        return jsonify({
+            "success": False,
+            "error": f"Batch mode is not available for '{yantra_type}'",
+            "batch_yantras": list(yantra_engine.BATCH_YANTRAS)
+        }), 400
+
     try:
         data = request.get_json()
-        
-        # Validate required parameters
-        required_params = ['latitude', 'longitude', 'scale_m', 'date']
-        for param in required_params:
-            if param not in data:
-                return jsonify({"success": False, "error": f"Missing parameter: {param}"}), 400
-        
-        # Prepare inputs for the script
-        inputs = [
-            str(data['latitude']),
-            str(data['longitude']),
-            str(data['scale_m']),
-            data['date']
-        ]
-        
-        # Path to Samrat Yantra script
-        script_path = os.path.abspath("yantra_files/Samrat_Yantra_Calcs.py")
-        
-        if not os.path.exists(script_path):
-            return jsonify({"success": False, "error": "Samrat Yantra script not found"}), 404
-        
-        # Run the script
-        result = run_yantra_script(script_path, inputs)
-        
-        if not result["success"]:
-            return jsonify(result), 500
-        
-        # Find generated files
-        json_file, image_file = find_generated_files('.', 'samrat')
-        
-        response_data = {
-            "yantra_type": "samrat",
-            "parameters": data,
-            "script_output": result["output"],
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Include JSON data if found
-        if json_file and os.path.exists(json_file):
-            try:
-                with open(json_file, 'r') as f:
-                    response_data["yantra_data"] = json.load(f)
-            except Exception as e:
-                response_data["json_error"] = str(e)
-        
-        # Include image data if found
-        if image_file and os.path.exists(image_file):
-            image_base64 = encode_image_to_base64(image_file)
-            if image_base64:
-                response_data["image"] = image_base64
-                response_data["image_format"] = os.path.splitext(image_file)[1][1:]
-        
-        return jsonify({"success": True, "data": response_data})
-        
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+
+        try:
+            result = yantra_engine.run_yantra_batch(yantra_type, data)
+        except ValueError as e:
+            return jsonify({"success": False, "error": f"Invalid parameter: {e}"}), 400
+
+        result["timestamp"] = datetime.now().isoformat()
+        return jsonify({"success": True, "data": result})
+
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
-# ====== ROUTE 2: RASIVALAYA YANTRA ======
-@app.route('/api/rasivalaya-yantra', methods=['POST'])
-def run_rasivalaya_yantra():
+# ====== ROUTE: SAMRAT SHADOW TRACK ======
+TRACK_CHUNK_SAMPLES = 4096
+
+@app.route('/api/yantra/samrat/shadow-track', methods=['POST'])
+def samrat_shadow_track():
     """
-    Run Rasivalaya Yantra script with provided parameters
+    Hour-line angle of the Samrat shadow for every second (or step_seconds)
+    of daylight. Body: latitude, longitude, date, optional step_seconds.
+    ?format=json (default) returns metadata plus the float32 samples base64
+    encoded; ?format=binary streams raw little-endian float32 samples in
+    chunks, with the metadata in the X-Shadow-Track header.
     """
     try:
         data = request.get_json()
-        
-        required_params = ['latitude', 'longitude', 'scale_m', 'date']
-        for param in required_params:
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+        for param in ("latitude", "longitude", "date"):
             if param not in data:
                 return jsonify({"success": False, "error": f"Missing parameter: {param}"}), 400
-        
-        inputs = [
-            str(data['latitude']),
-            str(data['longitude']),
-            str(data['scale_m']),
-            data['date']
-        ]
-        
-        script_path = os.path.abspath("yantra_files/rasi_valya_yantra.py")
-        
-        if not os.path.exists(script_path):
-            return jsonify({"success": False, "error": "Rasivalaya Yantra script not found"}), 404
-        
-        result = run_yantra_script(script_path, inputs)
-        
-        if not result["success"]:
-            return jsonify(result), 500
-        
-        json_file, image_file = find_generated_files('.', 'rasivalaya')
-        
-        response_data = {
-            "yantra_type": "rasivalaya",
-            "parameters": data,
-            "script_output": result["output"],
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if json_file and os.path.exists(json_file):
-            try:
-                with open(json_file, 'r') as f:
-                    response_data["yantra_data"] = json.load(f)
-            except Exception as e:
-                response_data["json_error"] = str(e)
-        
-        if image_file and os.path.exists(image_file):
-            image_base64 = encode_image_to_base64(image_file)
-            if image_base64:
-                response_data["image"] = image_base64
-                response_data["image_format"] = os.path.splitext(image_file)[1][1:]
-        
-        return jsonify({"success": True, "data": response_data})
-        
+
+        try:
+            meta, angles = yantra_engine.run_samrat_shadow_track(data)
+        except ValueError as e:
+            return jsonify({"success": False, "error": f"Invalid parameter: {e}"}), 400
+
+        if request.args.get('format', 'json') == 'binary':
+            def chunks():
+                for start in range(0, angles.size, TRACK_CHUNK_SAMPLES):
+                    yield angles[start:start + TRACK_CHUNK_SAMPLES].tobytes()
+
+            response = Response(chunks(), mimetype='application/octet-stream')
+            response.headers["X-Shadow-Track"] = json.dumps(meta)
+            response.headers["Content-Length"] = str(angles.nbytes)
+            return response
+
+        meta["hour_line_angle_deg"] = base64.b64encode(angles.tobytes()).decode('ascii')
+        meta["encoding"] = "base64"
+        return jsonify({"success": True, "data": meta})
+
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
-# ====== ROUTE 3: DHRUVA-PROTHA-CHAKRA YANTRA ======
-@app.route('/api/dhruva-yantra', methods=['POST'])
-def run_dhruva_yantra():
+# ====== ROUTE: DHRUVA STAR TRAILS ======
+@app.route('/api/yantra/dhruva/star-trails', methods=['POST'])
+def dhruva_star_trails():
     """
-    Run Dhruva-Protha-Chakra Yantra script with provided parameters
+    Trail of every catalog star across the Dhruva-Protha-Chakra from dusk
+    to dawn. Body: latitude, longitude, date, optional scale_m,
+    cadence_minutes (default 1) and max_magnitude. Each trail segment is
+    an encoded polyline of (x, y) in units of resolution_m.
     """
     try:
         data = request.get_json()
-        
-        required_params = ['latitude', 'longitude', 'scale_m', 'date', 'time']
-        for param in required_params:
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+        for param in ("latitude", "longitude", "date"):
             if param not in data:
                 return jsonify({"success": False, "error": f"Missing parameter: {param}"}), 400
-        
-        inputs = [
-            str(data['latitude']),
-            str(data['longitude']),
-            str(data['scale_m']),
-            data['date'],
-            data['time']
-        ]
-        
-        script_path = os.path.abspath("yantra_files/dpcy_yantra.py")
-        
-        if not os.path.exists(script_path):
-            return jsonify({"success": False, "error": "Dhruva-Protha-Chakra Yantra script not found"}), 404
-        
-        result = run_yantra_script(script_path, inputs)
-        
-        if not result["success"]:
-            return jsonify(result), 500
-        
-        json_file, image_file = find_generated_files('.', 'dhruva')
-        
-        response_data = {
-            "yantra_type": "dhruva_protha_chakra",
-            "parameters": data,
-            "script_output": result["output"],
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if json_file and os.path.exists(json_file):
-            try:
-                with open(json_file, 'r') as f:
-                    response_data["yantra_data"] = json.load(f)
-            except Exception as e:
-                response_data["json_error"] = str(e)
-        
-        if image_file and os.path.exists(image_file):
-            image_base64 = encode_image_to_base64(image_file)
-            if image_base64:
-                response_data["image"] = image_base64
-                response_data["image_format"] = os.path.splitext(image_file)[1][1:]
-        
-        return jsonify({"success": True, "data": response_data})
-        
+
+        try:
+            # Concurrent requests for the same night share one computation
+            trails = in_flight.run(
+                ("star-trails", json.dumps(data, sort_keys=True)),
+                lambda: yantra_engine.run_dhruva_star_trails(data)
+            )[0]
+        except ValueError as e:
+            return jsonify({"success": False, "error": f"Invalid parameter: {e}"}), 400
+
+        return jsonify({"success": True, "data": trails})
+
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
-# ====== ROUTE 4: RAMA YANTRA ======
-@app.route('/api/rama-yantra', methods=['POST'])
-def run_rama_yantra():
+# ====== ROUTE: RAMA RISE/SET/TRANSIT EVENTS ======
+@app.route('/api/yantra/rama/events', methods=['POST'])
+def rama_events():
     """
-    Run Rama Yantra script with provided parameters
+    Rise, set and culmination times (with rise/set azimuths and
+    culmination altitudes) of the Rama Yantra bodies for every day of a
+    date range. Body: latitude, longitude, start_date, optional end_date
+    (default start_date). Results are cached per site and date range.
     """
     try:
         data = request.get_json()
-        
-        required_params = ['latitude', 'longitude', 'scale_m', 'date', 'time']
-        for param in required_params:
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+        for param in ("latitude", "longitude", "start_date"):
             if param not in data:
                 return jsonify({"success": False, "error": f"Missing parameter: {param}"}), 400
-        
-        inputs = [
-            str(data['latitude']),
-            str(data['longitude']),
-            str(data['scale_m']),
-            data['date'],
-            data['time']
-        ]
-        
-        script_path = os.path.abspath("yantra_files/rama_yantra.py")
-        
-        if not os.path.exists(script_path):
-            return jsonify({"success": False, "error": "Rama Yantra script not found"}), 404
-        
-        result = run_yantra_script(script_path, inputs)
-        
-        if not result["success"]:
-            return jsonify(result), 500
-        
-        json_file, image_file = find_generated_files('.', 'rama')
-        
-        response_data = {
-            "yantra_type": "rama",
-            "parameters": data,
-            "script_output": result["output"],
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if json_file and os.path.exists(json_file):
-            try:
-                with open(json_file, 'r') as f:
-                    response_data["yantra_data"] = json.load(f)
-            except Exception as e:
-                response_data["json_error"] = str(e)
-        
-        if image_file and os.path.exists(image_file):
-            image_base64 = encode_image_to_base64(image_file)
-            if image_base64:
-                response_data["image"] = image_base64
-                response_data["image_format"] = os.path.splitext(image_file)[1][1:]
-        
-        return jsonify({"success": True, "data": response_data})
-        
+
+        try:
+            key = yantra_engine.event_cache_key(data)
+        except ValueError as e:
+            return jsonify({"success": False, "error": f"Invalid parameter: {e}"}), 400
+
+        # Cached in the shape of an execution result (no artifacts) so the
+        # disk tier can hold it too
+        cached, cache_status = result_cache.get(key), "HIT"
+        if cached is None:
+            def compute():
+                events = yantra_engine.run_rama_events(data)
+                computed = {"events": events, "artifacts": []}
+                result_cache.put(key, computed, len(json.dumps(events)))
+                return computed
+
+            cached, shared = in_flight.run(key, compute)
+            cache_status = "COALESCED" if shared else "MISS"
+
+        response = jsonify({"success": True, "data": cached["events"]})
+        response.headers["X-Cache"] = cache_status
+        return response
+
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
-    
-# ====== ROUTE 5: DIAGSMA YANTRA ======
-@app.route('/api/diagsma_yantra', methods=['POST'])
-def run_diagsma_yantra():
+
+# ====== ROUTE: ANNUAL SOLAR GRID ======
+@app.route('/api/yantra/year-grid', methods=['POST'])
+def year_grid():
     """
-    Run Diagsma Yantra script with provided parameters
+    Sun position at every minute of every day of a year for a site,
+    written to a memory-mapped grid file, with the analemma (at
+    clock_time, default 12:00) and seasonal altitude envelope derived
+    from it. Body: latitude, longitude, year, optional clock_time, scale_m.
     """
     try:
         data = request.get_json()
-        
-        required_params = ['latitude', 'longitude', 'scale_m', 'date', 'time']
-        for param in required_params:
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+        for param in ("latitude", "longitude", "year"):
             if param not in data:
                 return jsonify({"success": False, "error": f"Missing parameter: {param}"}), 400
-        
-        inputs = [
-            str(data['latitude']),
-            str(data['longitude']),
-            str(data['scale_m']),
-            data['date'],
-            data['time']
-        ]
-        
-        script_path = os.path.abspath("yantra_files/diagsma_yantra.py")
-        
-        if not os.path.exists(script_path):
-            return jsonify({"success": False, "error": "Diagsma Yantra script not found"}), 404
-        
-        result = run_yantra_script(script_path, inputs)
-        
+
+        try:
+            # Concurrent requests for the same grid file share one generation
+            name, summary = yantra_engine.run_year_grid(
+                data, GRID_DIR,
+                lambda name, generate: in_flight.run(("year-grid", name),
+                                                     lambda: grid_store.ensure(name, generate))[0]
+            )
+        except ValueError as e:
+            return jsonify({"success": False, "error": f"Invalid parameter: {e}"}), 400
+
+        summary["grid_url"] = f"/api/yantra/year-grid/{name}"
+        summary["timestamp"] = datetime.now().isoformat()
+        return jsonify({"success": True, "data": summary})
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/yantra/year-grid/<name>', methods=['GET'])
+def download_year_grid(name):
+    """
+    Download a generated grid as a .npy file
+    """
+    path = grid_store.path(name)
+    if path is None:
+        return jsonify({"success": False, "error": "Grid not found"}), 404
+    return send_file(os.path.abspath(path), mimetype='application/octet-stream',
+                     as_attachment=True, download_name=name, conditional=True)
+
+def build_yantra_response(yantra_type):
+    """
+    Validate the request body, compute the yantra and build the JSON
+    response shared by all yantra routes
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+
+        # Validate required parameters
+        for param in yantra_engine.missing_parameters(yantra_type, data):
+            return jsonify({"success": False, "error": f"Missing parameter: {param}"}), 400
+
+        try:
+            result, cache_status = compute_cached(yantra_type, data, wants_render(data))
+        except ValueError as e:
+            return jsonify({"success": False, "error": f"Invalid parameter: {e}"}), 400
         if not result["success"]:
-            return jsonify(result), 500
-        
-        json_file, image_file = find_generated_files('.', 'diagsma')
-        
+            return jsonify({"success": False, "error": result["error"]}), result["status"]
+
+        # Artifacts are referenced by content-hashed URL rather than inlined
+        manifest = yantra_engine.artifact_manifest(result["artifacts"])
+        for entry, artifact in zip(manifest, result["artifacts"]):
+            entry["url"] = artifact_url(artifact_store.save(artifact))
+
         response_data = {
-            "yantra_type": "diagsma",
+            "yantra_type": yantra_engine.YANTRAS[yantra_type]["response_type"],
             "parameters": data,
             "script_output": result["output"],
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            "yantra_data": result["yantra_data"],
+            "artifacts": manifest
         }
-        
-        if json_file and os.path.exists(json_file):
-            try:
-                with open(json_file, 'r') as f:
-                    response_data["yantra_data"] = json.load(f)
-            except Exception as e:
-                response_data["json_error"] = str(e)
-        
-        if image_file and os.path.exists(image_file):
-            image_base64 = encode_image_to_base64(image_file)
-            if image_base64:
-                response_data["image"] = image_base64
-                response_data["image_format"] = os.path.splitext(image_file)[1][1:]
-        
-        return jsonify({"success": True, "data": response_data})
-        
+
+        image = yantra_engine.find_artifact(result["artifacts"], "image")
+        if image:
+            response_data["image_url"] = yantra_engine.find_artifact(manifest, "image")["url"]
+            response_data["image_format"] = os.path.splitext(image["name"])[1][1:]
+            if wants_inline_image(data):
+                response_data["image"] = base64.b64encode(image["data"]).decode('utf-8')
+
+        response = jsonify({"success": True, "data": response_data})
+        response.headers["X-Cache"] = cache_status
+        return response
+
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+# ====== ROUTE 1: SAMRAT YANTRA ======
+@app.route('/api/samrat-yantra', methods=['POST'])
+def run_samrat_yantra():
+    """
+    Run Samrat Yantra calculation with provided parameters
+    """
+    return build_yantra_response("samrat")
+
+# ====== ROUTE 2: RASIVALAYA YANTRA ======
+@app.route('/api/rasivalaya-yantra', methods=['POST'])
+def run_rasivalaya_yantra():
+    """
+    Run Rasivalaya Yantra calculation with provided parameters
+    """
+    return build_yantra_response("rasivalaya")
+
+# ====== ROUTE 3: DHRUVA-PROTHA-CHAKRA YANTRA ======
+@app.route('/api/dhruva-yantra', methods=['POST'])
+def run_dhruva_yantra():
+    """
+    Run Dhruva-Protha-Chakra Yantra calculation with provided parameters
+    """
+    return build_yantra_response("dhruva")
+
+# ====== ROUTE 4: RAMA YANTRA ======
+@app.route('/api/rama-yantra', methods=['POST'])
+def run_rama_yantra():
+    """
+    Run Rama Yantra calculation with provided parameters
+    """
+    return build_yantra_response("rama")
+
+# ====== ROUTE 5: DIAGSMA YANTRA ======
+@app.route('/api/diagsma_yantra', methods=['POST'])
+def run_diagsma_yantra():
+    """
+    Run Diagsma Yantra calculation with provided parameters
+    """
+    return build_yantra_response("diagsma")
+
 # ====== HEALTH CHECK & INFO ROUTES ======
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """
     Health check endpoint
     """
-    return jsonify({
+    health = {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
+        "execution_mode": EXECUTION_MODE,
         "available_yantras": [
             "samrat-yantra",
             "rasivalaya-yantra", 
             "dhruva-yantra",
             "rama-yantra"
         ]
-    })
+    }
+    health["jobs"] = job_manager.stats()
+    if _worker_pool is not None:
+        health["worker_pool"] = _worker_pool.describe()
+    return jsonify(health)
 
 @app.route('/api/yantras', methods=['GET'])
 def list_yantras():
@@ -574,6 +696,180 @@ def get_example_request(yantra_type):
         }
     }
 
+# ====== JOB ROUTES ======
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a yantra computation and return its job id immediately.
+    Body: {"yantra_type": "samrat", "parameters": {...} or [{...}, ...],
+           "dates": [...] (optional, one task per date), "render": true}
+    """
+    try:
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({"success": False, "error": "Request body must be a JSON object"}), 400
+
+        yantra_type = data.get("yantra_type")
+        if yantra_type not in yantra_engine.YANTRAS:
+            return jsonify({"success": False, "error": "Invalid yantra type"}), 400
+
+        parameters = data.get("parameters", {})
+        tasks = parameters if isinstance(parameters, list) else [parameters]
+        if "dates" in data:
+            if not isinstance(data["dates"], list) or len(tasks) != 1:
+                return jsonify({"success": False,
+                                "error": "dates must be a list used with a single parameter set"}), 400
+            tasks = [dict(tasks[0], date=date) for date in data["dates"]]
+        if not 0 < len(tasks) <= MAX_JOB_TASKS:
+            return jsonify({"success": False,
+                            "error": f"A job must have between 1 and {MAX_JOB_TASKS} tasks"}), 400
+
+        # Reject bad input now rather than failing the job later
+        render = wants_render(data)
+        for index, task in enumerate(tasks):
+            if not isinstance(task, dict):
+                return jsonify({"success": False, "error": f"Task {index}: parameters must be an object"}), 400
+            for param in yantra_engine.missing_parameters(yantra_type, task):
+                return jsonify({"success": False, "error": f"Task {index}: missing parameter: {param}"}), 400
+            try:
+                yantra_engine.parse_parameters(yantra_type, task)
+            except ValueError as e:
+                return jsonify({"success": False, "error": f"Task {index}: invalid parameter: {e}"}), 400
+
+        try:
+            job = job_manager.submit(yantra_type, tasks, render)
+        except QueueFull as e:
+            response = jsonify({"success": False, "error": str(e)})
+            response.headers["Retry-After"] = "5"
+            return response, 503
+
+        response = jsonify({
+            "success": True,
+            "job": job.describe(),
+            "status_url": f"/api/jobs/{job.id}",
+            "result_url": f"/api/jobs/{job.id}/result"
+        })
+        response.headers["Location"] = f"/api/jobs/{job.id}"
+        return response, 202
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+def job_artifact_name(job, index, artifact):
+    """Artifact file name inside a job result, prefixed by task for multi-task jobs"""
+    if len(job.tasks) == 1:
+        return artifact["name"]
+    return f"{index:03d}_{artifact['name']}"
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Report a job's status and progress; finished jobs also list their artifacts
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+
+    description = job.describe()
+    if job.status == "succeeded":
+        description["artifacts"] = [
+            dict(artifact, name=job_artifact_name(job, index, artifact), task=index)
+            for index, result in enumerate(job.results)
+            for artifact in yantra_engine.artifact_manifest(result["artifacts"])
+        ]
+    return jsonify({"success": True, "job": description})
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """
+    Stream a finished job's artifacts: one artifact when ?artifact=<name>
+    is given, otherwise a zip of every artifact plus a manifest.json
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    if job.status == "failed":
+        return jsonify({"success": False, "error": job.error, "job": job.describe()}), 409
+    if not job.finished:
+        response = jsonify({"success": False, "error": "Job has not finished", "job": job.describe()})
+        response.headers["Retry-After"] = "1"
+        return response, 202
+
+    named = [
+        (job_artifact_name(job, index, artifact), artifact_store.path(artifact_store.file_name(artifact)),
+         artifact)
+        for index, result in enumerate(job.results)
+        for artifact in result["artifacts"]
+    ]
+    wanted = request.args.get('artifact')
+    if wanted:
+        named = [entry for entry in named if entry[0] == wanted]
+        if not named:
+            return jsonify({"success": False, "error": "Artifact not found"}), 404
+    # Payloads live in the artifact store, which may have evicted them
+    if any(path is None for _, path, _ in named):
+        return jsonify({"success": False, "error": "Job artifacts have expired"}), 410
+
+    if wanted:
+        _, path, artifact = named[0]
+        return send_file(path, mimetype=artifact["media_type"], download_name=wanted)
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as bundle:
+        manifest = {"job": job.describe(), "outputs": [result["output"] for result in job.results]}
+        bundle.writestr("manifest.json", json.dumps(manifest, indent=2))
+        for name, path, _ in named:
+            bundle.write(path, name)
+    archive.seek(0)
+    return send_file(archive, mimetype="application/zip", as_attachment=True,
+                     download_name=f"yantra_job_{job.id}.zip")
+
+# ====== ARTIFACT ROUTES ======
+@app.route('/api/artifacts/<name>', methods=['GET'])
+def get_artifact(name):
+    """
+    Serve a content-addressed artifact. The name is the payload's SHA-256,
+    so the content never changes: it carries a strong ETag, may be cached
+    forever and supports conditional and Range requests.
+    """
+    path = artifact_store.path(name)
+    if path is None:
+        return jsonify({"success": False, "error": "Artifact not found"}), 404
+
+    response = send_file(path, conditional=True, etag=name.split('.')[0],
+                         max_age=ARTIFACT_MAX_AGE)
+    response.headers["Cache-Control"] = f"public, max-age={ARTIFACT_MAX_AGE}, immutable"
+    return response
+
+# ====== ADMIN ROUTES ======
+def admin_authorized():
+    """
+    Admin routes are open unless YANTRA_ADMIN_TOKEN is set, in which case
+    the X-Admin-Token header must match it
+    """
+    return ADMIN_TOKEN is None or request.headers.get('X-Admin-Token') == ADMIN_TOKEN
+
+@app.route('/api/admin/cache', methods=['GET'])
+def cache_stats():
+    """
+    Result cache size and hit/miss counters, request coalescing and the
+    sizes of the artifact and year-grid directories
+    """
+    if not admin_authorized():
+        return jsonify({"success": False, "error": "Unauthorized"}), 401
+    return jsonify({"success": True, "cache": result_cache.stats(), "coalescing": in_flight.stats(),
+                    "artifacts": artifact_store.stats(), "grids": grid_store.stats()})
+
+@app.route('/api/admin/cache/flush', methods=['POST'])
+def flush_cache():
+    """
+    Drop every cached yantra result
+    """
+    if not admin_authorized():
+        return jsonify({"success": False, "error": "Unauthorized"}), 401
+    removed = result_cache.clear()
+    return jsonify({"success": True, "flushed_entries": removed, "cache": result_cache.stats()})
+
 # ====== FILE MANAGEMENT ROUTES ======
 @app.route('/api/upload-yantra-script', methods=['POST'])
 def upload_yantra_script():
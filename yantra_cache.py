@@ -0,0 +1,440 @@
+"""
+Result cache for yantra computations.
+
+Yantra outputs are deterministic for a given yantra type and parameter
+set, so results are keyed on a hash of the canonicalised parameters and
+kept in a size-bounded LRU with a time-to-live, optionally backed by a
+SQLite store on disk that survives restarts. Identical requests that
+arrive while the first is still computing share its result through a
+single-flight group instead of computing again. Artifacts handed to
+clients by URL live in a content-addressed directory, named by their
+SHA-256, so a URL always refers to the same bytes; it and the directory
+of generated year grids are bounded by size and age.
+"""
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+def result_size(result):
+    """Approximate memory held by an execution result, in bytes"""
+    return len(result.get("output", "")) + sum(a["size"] for a in result.get("artifacts", []))
+
+class ResultCache:
+    """Thread-safe LRU cache bounded by total payload bytes, with per-entry TTL"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl_seconds=3600, clock=time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (value, size, expires_at)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, size):
+        """Store a value; entries larger than the whole cache are not kept"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, self.clock() + self.ttl_seconds)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        """Drop every entry, returning how many were removed"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+class DiskResultStore:
+    """
+    Durable result store in a SQLite file, bounded by total payload bytes
+    and evicting the least recently used entries first
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA foreign_keys=ON")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                meta TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+            CREATE TABLE IF NOT EXISTS artifacts (
+                key TEXT NOT NULL REFERENCES results (key) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                data BLOB NOT NULL,
+                PRIMARY KEY (key, position)
+            );
+        """)
+        self._db.commit()
+
+    def get(self, key):
+        """Load a stored result, or None if the key is not on disk"""
+        entry = self.get_entry(key)
+        return None if entry is None else entry[0]
+
+    def get_entry(self, key):
+        """(result, size) of a stored result as given to put, or None if not on disk"""
+        with self._lock:
+            row = self._db.execute("SELECT meta, size FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            blobs = self._db.execute(
+                "SELECT data FROM artifacts WHERE key = ? ORDER BY position", (key,)
+            ).fetchall()
+            self._db.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+            self.hits += 1
+
+        result = json.loads(row[0])
+        for artifact, (data,) in zip(result["artifacts"], blobs):
+            artifact["data"] = bytes(data)
+        return result, row[1]
+
+    def put(self, key, value, size):
+        """Persist a result and evict least recently used entries over quota"""
+        if size > self.max_bytes:
+            return
+        meta = dict(value, artifacts=[
+            {k: v for k, v in artifact.items() if k != "data"} for artifact in value["artifacts"]
+        ])
+        now = time.time()
+        with self._lock:
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._db.execute(
+                "INSERT INTO results (key, meta, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(meta), size, now, now)
+            )
+            self._db.executemany(
+                "INSERT INTO artifacts (key, position, data) VALUES (?, ?, ?)",
+                [(key, i, artifact["data"]) for i, artifact in enumerate(value["artifacts"])]
+            )
+            self._evict_over_quota()
+            self._db.commit()
+
+    def _evict_over_quota(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM results ORDER BY last_access"
+        ).fetchall():
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            self._db.execute("DELETE FROM results")
+            self._db.commit()
+            return count
+
+    def stats(self):
+        with self._lock:
+            entries, total = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": total,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+class TieredResultCache:
+    """
+    In-memory LRU in front of an optional disk store. Disk hits are
+    promoted into memory so popular results survive restarts and are then
+    served from RAM.
+    """
+
+    def __init__(self, memory, disk=None):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            entry = self.disk.get_entry(key)
+            if entry is not None:
+                # Promote with the size the entry was stored with, which
+                # callers may have measured differently from result_size
+                value, size = entry
+                self.memory.put(key, value, size)
+        return value
+
+    def put(self, key, value, size):
+        self.memory.put(key, value, size)
+        if self.disk is not None:
+            self.disk.put(key, value, size)
+
+    def clear(self):
+        removed = self.memory.clear()
+        if self.disk is not None:
+            removed = max(removed, self.disk.clear())
+        return removed
+
+    def stats(self):
+        stats = self.memory.stats()
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+class BoundedDirectory:
+    """
+    A directory of generated files bounded by total bytes and by age since
+    a file was last used (touch() refreshes it); the least recently used
+    files are removed first. Only names matching NAME_PATTERN are managed.
+    """
+
+    NAME_PATTERN = re.compile(r".+")
+
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024, max_age_seconds=7 * 24 * 3600,
+                 clock=time.time):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._files())
+        self._next_sweep = 0
+
+    def path(self, name):
+        """Path of a stored file, or None if the name is invalid or unknown"""
+        if not self.NAME_PATTERN.match(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+    def touch(self, name):
+        """Mark a stored file as just used; False if it does not exist"""
+        try:
+            os.utime(os.path.join(self.directory, name))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def added(self, size, keep=None):
+        """
+        Account for a newly written file of size bytes and evict if
+        needed, never removing the file at path keep
+        """
+        with self._lock:
+            self._bytes += size
+        self._evict(keep)
+
+    def _files(self):
+        """(path, size, mtime) of every managed file"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if self.NAME_PATTERN.match(entry.name):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _evict(self, keep=None):
+        """
+        Remove expired files and the least recently used beyond max_bytes,
+        except the file at path keep (one the caller is about to read).
+        The directory is scanned when over quota, or once per
+        max_age_seconds / 10 to expire old files.
+        """
+        now = self.clock()
+        with self._lock:
+            if self._bytes <= self.max_bytes and now < self._next_sweep:
+                return
+            self._next_sweep = now + self.max_age_seconds / 10
+            files = sorted(self._files(), key=lambda f: f[2])
+            total = sum(size for _, size, _ in files)
+            for path, size, mtime in files:
+                if total <= self.max_bytes and now - mtime <= self.max_age_seconds:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self.evictions += 1
+            self._bytes = total
+
+    def stats(self):
+        with self._lock:
+            return {
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "evictions": self.evictions
+            }
+
+class ArtifactStore(BoundedDirectory):
+    """
+    Content-addressed artifact files: each payload is written once to
+    <sha256><ext> and never changes afterwards. Saving an existing
+    artifact refreshes its age in the bounded directory.
+    """
+
+    NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(\.[a-z0-9]+)?$")
+
+    def file_name(self, artifact):
+        return artifact["sha256"] + os.path.splitext(artifact["name"])[1].lower()
+
+    def save(self, artifact):
+        """Write an artifact if it is not stored yet and return its file name"""
+        name = self.file_name(artifact)
+        if not self.touch(name):
+            # Write to a temporary file and rename so readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(artifact["data"])
+            os.replace(tmp_path, os.path.join(self.directory, name))
+            self.added(len(artifact["data"]))
+        else:
+            self._evict()
+        return name
+
+class GridStore(BoundedDirectory):
+    """
+    Generated solar year grids (solar_grid_*.npy), kept in a bounded
+    directory: reusing a grid refreshes its age, and a grid is written
+    only when it is missing.
+    """
+
+    NAME_PATTERN = re.compile(r"^solar_grid_[\w.+-]+\.npy$")
+
+    def ensure(self, name, generate):
+        """
+        Path of grid name, calling generate(path) to write it first when
+        it is not stored yet
+        """
+        path = os.path.join(self.directory, name)
+        if not self.touch(name):
+            generate(path)
+            self.added(os.path.getsize(path), keep=path)
+        else:
+            self._evict(keep=path)
+        return path
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs
+    the function, callers arriving while it is in flight wait on the same
+    future and receive the same result (or exception)
+    """
+
+    def __init__(self):
+        self._in_flight = {}  # key -> Future
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def run(self, key, fn):
+        """Return (result, shared) where shared is True for coalesced callers"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+        return future.result(), False
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                "in_flight": len(self._in_flight),
+                "executions": self.leaders,
+                "coalesced": self.coalesced,
+                "coalesced_rate": round(self.coalesced / calls, 4) if calls else 0.0
+            }
@@ -1,43 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import yantra_astro
 import json
 from datetime import datetime, timedelta
 
-# ====== INPUT ======
-latitude = float(input("Enter Latitude (e.g., 28.6139): "))
-longitude = float(input("Enter Longitude (e.g., 77.2090): "))
-scale_m = float(input("Enter scale (meters, e.g., 3.0): "))
-date_str = input("Enter date (YYYY-MM-DD): ")
-
-# ====== DATE HANDLING ======
-date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-day_of_year = date_obj.timetuple().tm_yday
-
-# ====== LOCAL SOLAR TIME CALC ======
-standard_meridian = 82.5  # IST
-
-# Equation of Time (more precise)
-B = 2 * np.pi * (day_of_year - 1) / 365
-EoT = 229.18 * (
-    0.000075 + 0.001868*np.cos(B) - 0.032077*np.sin(B)
-    - 0.014615*np.cos(2*B) - 0.040849*np.sin(2*B)
-)
-
-# Longitude correction (minutes)
-longitude_correction = 4 * (longitude - standard_meridian)
-
-# True Solar Time at local noon
-LST_noon = 12 + (longitude_correction + EoT) / 60  # in hours
-
-# ====== SOLAR DECLINATION ======
-# δ = 23.45° * sin(360*(284 + n)/365)
-declination = 23.45 * np.sin(np.radians(360 * (284 + day_of_year)/365))
-
-# ====== PARAMETERS ======
-platform_radius = scale_m
-gnomon_height = scale_m
-gnomon_tilt = latitude  
-hours = np.arange(-6, 7, 1)  # -6 to +6 hrs from noon
+# ====== CONSTANTS ======
+standard_meridian = yantra_astro.STANDARD_MERIDIAN  # IST
+FIGURE_SIZE = (8, 8)
 
 # ====== HOUR LINE CALC (using declination) ======
 def hour_line_angle(phi_deg, delta_deg, t_hours):
@@ -50,98 +18,237 @@ def hour_line_angle(phi_deg, delta_deg, t_hours):
     H = np.radians(15 * t_hours)  # hour angle
     phi = np.radians(phi_deg)
     delta = np.radians(delta_deg)
-    theta = np.arctan(np.sin(phi) * np.tan(H))
+    # arctan2 form of arctan(sin φ tan H): identical within ±6 h of noon and
+    # continuous beyond, where the sun is behind the east-west line
+    theta = np.arctan2(np.sin(phi) * np.sin(H), np.cos(H))
     return np.degrees(theta)
 
-hour_lines = []
-for t in hours:
-    theta = hour_line_angle(latitude, declination, t)
-    x_end = platform_radius * np.sin(np.radians(theta))
-    y_end = platform_radius * np.cos(np.radians(theta))
-    hour_lines.append({
-        "time": f"{12+t:02.0f}:00",
-        "t": 12+t,
-        "angle_deg": theta,
-        "start": [0,0],
-        "end": [x_end, y_end]
-    })
-
-# ====== FIGURE ======
-plt.figure(figsize=(8,8))
-
-# Platform (circle)
-circle = plt.Circle((0,0), platform_radius, fill=False, color='saddlebrown', linewidth=3)
-plt.gca().add_patch(circle)
-
-# Side walls
-plt.fill_between([-platform_radius, -platform_radius/2], -platform_radius, platform_radius, 
-                 color='peru', alpha=0.3)
-plt.fill_between([platform_radius/2, platform_radius], -platform_radius, platform_radius, 
-                 color='peru', alpha=0.3)
-
-# Hour lines
-for line in hour_lines:
-    x0, y0 = line['start']
-    x1, y1 = line['end']
-    plt.plot([x0,x1],[y0,y1], color='red', linewidth=1)
-
-# ====== GREEN LINE for actual solar time ======
-# Use fractional hours for higher accuracy
-t_frac = LST_noon - 12
-theta_frac = hour_line_angle(latitude, declination, t_frac)
-x_end_frac = platform_radius * np.sin(np.radians(theta_frac))
-y_end_frac = platform_radius * np.cos(np.radians(theta_frac))
-total_seconds = LST_noon * 3600  # convert hours to total seconds
-LST_hour = int(total_seconds // 3600)
-LST_minute = int((total_seconds % 3600) // 60)
-LST_second = int(total_seconds % 60)
-
-if LST_second == 60:
-    LST_minute += 1
-    LST_second = 0
-if LST_minute == 60:
-    LST_hour += 1
-    LST_minute = 0
-LST_str = f"{LST_hour:02d}:{LST_minute:02d}"
-
-plt.plot([0, x_end_frac], [0, y_end_frac], color='green', linewidth=2.5, 
-         label=f"Solar Time ≈ {LST_str}")
-
-# Gnomon
-gnomon_top = [0, gnomon_height * np.tan(np.radians(gnomon_tilt))]
-plt.plot([0,0], [0, gnomon_top[1]], color='blue', linewidth=4, label='Gnomon')
-plt.fill_betweenx([0, gnomon_top[1]], -0.2, 0.2, color='lightblue', alpha=0.5)
-
-# ====== FINAL STYLING ======
-plt.gca().set_aspect('equal')
-plt.title(f"Samrat Yantra Simulation (Lat {latitude}, Scale {scale_m} m)")
-plt.xlabel("X (m)")
-plt.ylabel("Y (m)")
-plt.legend()
-plt.grid(True)
-plt.show()
-
-# ====== JSON SAVE ======
-output = {
-    "yantra_type": "samrat",
-    "latitude": latitude,
-    "longitude": longitude,
-    "scale_m": scale_m,
-    "date": date_str,
-    "solar_time_highlighted": LST_str,
-    "components": {
-        "platform": {"radius_m": platform_radius},
-        "gnomon": {"height_m": gnomon_height, "tilt_deg": gnomon_tilt},
-        "hour_lines": hour_lines,
-        "fractional_line": {
-            "t_hours": LST_noon,
-            "angle_deg": theta_frac,
-            "end": [x_end_frac, y_end_frac]
+def format_solar_time(hours):
+    """Format decimal solar hours as HH:MM"""
+    total_seconds = hours * 3600  # convert hours to total seconds
+    LST_hour = int(total_seconds // 3600)
+    LST_minute = int((total_seconds % 3600) // 60)
+    LST_second = int(total_seconds % 60)
+
+    if LST_second == 60:
+        LST_minute += 1
+        LST_second = 0
+    if LST_minute == 60:
+        LST_hour += 1
+        LST_minute = 0
+    return f"{LST_hour:02d}:{LST_minute:02d}"
+
+# ====== CALCULATION ======
+def compute_samrat_yantra(latitude: float, longitude: float, scale_m: float, date_str: str,
+                          tolerance_mm: float = None) -> dict:
+    """
+    Compute Samrat Yantra geometry for a site and date. With tolerance_mm,
+    the platform also carries a fabrication outline (outline_m) within
+    that chord error.
+    Returns the JSON-serialisable yantra description.
+    """
+    # ====== EPHEMERIS ======
+    # Equation of Time and solar declination for the date
+    ephemeris = yantra_astro.solar_ephemeris(date_str)
+    EoT = ephemeris["equation_of_time_min"]
+    declination = ephemeris["declination_deg"]
+
+    # ====== LOCAL SOLAR TIME CALC ======
+    # True Solar Time at local noon
+    LST_noon = yantra_astro.local_solar_time(12, EoT, longitude, standard_meridian)  # in hours
+
+    # ====== PARAMETERS ======
+    platform_radius = scale_m
+    gnomon_height = scale_m
+    gnomon_tilt = latitude
+    hours = np.arange(-6, 7, 1)  # -6 to +6 hrs from noon
+
+    hour_lines = []
+    for t in hours:
+        theta = hour_line_angle(latitude, declination, t)
+        x_end = platform_radius * np.sin(np.radians(theta))
+        y_end = platform_radius * np.cos(np.radians(theta))
+        hour_lines.append({
+            "time": f"{12+t:02.0f}:00",
+            "t": int(12+t),
+            "angle_deg": float(theta),
+            "start": [0,0],
+            "end": [float(x_end), float(y_end)]
+        })
+
+    # ====== GREEN LINE for actual solar time ======
+    # Use fractional hours for higher accuracy
+    t_frac = LST_noon - 12
+    theta_frac = hour_line_angle(latitude, declination, t_frac)
+    x_end_frac = platform_radius * np.sin(np.radians(theta_frac))
+    y_end_frac = platform_radius * np.cos(np.radians(theta_frac))
+    LST_str = format_solar_time(LST_noon)
+
+    result = {
+        "yantra_type": "samrat",
+        "latitude": latitude,
+        "longitude": longitude,
+        "scale_m": scale_m,
+        "date": date_str,
+        "solar_time_highlighted": LST_str,
+        "components": {
+            "platform": {"radius_m": platform_radius},
+            "gnomon": {"height_m": gnomon_height, "tilt_deg": gnomon_tilt},
+            "hour_lines": hour_lines,
+            "fractional_line": {
+                "t_hours": float(LST_noon),
+                "angle_deg": float(theta_frac),
+                "end": [float(x_end_frac), float(y_end_frac)]
+            }
         }
     }
-}
 
-with open("samrat_yantra.json", "w") as f:
-    json.dump(output, f, indent=2)
+    # ====== FABRICATION OUTLINES ======
+    if tolerance_mm:
+        result["chord_tolerance_mm"] = tolerance_mm
+        result["components"]["platform"]["outline_m"] = yantra_astro.outline_json(
+            yantra_astro.circle_points(platform_radius, yantra_astro.fabrication_tolerance(tolerance_mm)))
+    return result
 
-print(f"✅ Samrat Yantra generated! Highlighted Solar Time ≈ {LST_str}. JSON saved as samrat_yantra.json")
+# ====== BATCH CALCULATION ======
+def compute_samrat_batch(latitude, longitude, scale_m, dates):
+    """
+    Vectorised Samrat Yantra hour lines for many (site, date) rows at once.
+    All arguments are equal-length 1-D arrays; returns a dict of columns,
+    with the 13 hour-line angles as an (N, 13) array.
+    """
+    hours = np.arange(-6, 7, 1)
+
+    # Equation of Time, declination and solar noon for every row
+    ephemeris = yantra_astro.solar_ephemeris(dates)
+    EoT = ephemeris["equation_of_time_min"]
+    declination = ephemeris["declination_deg"]
+    LST_noon = yantra_astro.local_solar_time(12, EoT, longitude, standard_meridian)
+
+    # (N, 13) hour lines and the (N,) solar time line in one broadcast each
+    hour_angles = hour_line_angle(latitude[:, None], declination[:, None], hours[None, :])
+    theta_frac = hour_line_angle(latitude, declination, LST_noon - 12)
+
+    return {
+        "hour_offsets": hours,
+        "equation_of_time_min": EoT,
+        "declination_deg": declination,
+        "local_solar_noon_hours": LST_noon,
+        "hour_line_angle_deg": hour_angles,
+        "solar_time_line_angle_deg": theta_frac,
+        "solar_time_line_end_x_m": scale_m * np.sin(np.radians(theta_frac)),
+        "solar_time_line_end_y_m": scale_m * np.cos(np.radians(theta_frac)),
+    }
+
+# ====== SHADOW TRACK ======
+def compute_samrat_shadow_track(latitude, longitude, date_str, step_seconds=1):
+    """
+    Hour-line angle of the gnomon's shadow for every step_seconds of
+    daylight on a date (about 45k samples at one-second resolution).
+    Returns (meta, angles): samples are evenly spaced in true solar time,
+    so meta carries the first sample's solar time and the step instead of
+    a timestamp per sample; angles is a float32 array.
+    """
+    ephemeris = yantra_astro.solar_ephemeris(date_str)
+    EoT = ephemeris["equation_of_time_min"]
+    declination = ephemeris["declination_deg"]
+    clock_correction = yantra_astro.longitude_correction(longitude, standard_meridian) + EoT
+
+    # Daylight spans ±H0 around solar noon; sample it on a grid centred on noon
+    half_day_seconds = yantra_astro.sunrise_hour_angle(latitude, declination) / 15 * 3600
+    half_steps = int(half_day_seconds // step_seconds)
+    offsets = np.arange(-half_steps, half_steps + 1) * step_seconds  # seconds from solar noon
+    if half_day_seconds == 0:  # polar night
+        offsets = offsets[:0]
+
+    angles = hour_line_angle(latitude, declination, offsets / 3600).astype("<f4")
+
+    meta = {
+        "yantra_type": "samrat",
+        "latitude": latitude,
+        "longitude": longitude,
+        "date": date_str,
+        "declination_deg": float(declination),
+        "equation_of_time_min": float(EoT),
+        "count": int(angles.size),
+        "step_seconds": step_seconds,
+        "start_solar_seconds": int(43200 - half_steps * step_seconds),
+        # clock time = solar time - clock_offset_seconds
+        "clock_offset_seconds": float(clock_correction * 60),
+        "solar_noon_clock": format_solar_time(12 - clock_correction / 60),
+        "dtype": "float32",
+        "byte_order": "little",
+    }
+    return meta, angles
+
+def summarize_samrat_yantra(result):
+    """One-line console summary of a computed Samrat Yantra"""
+    return (f"✅ Samrat Yantra generated! Highlighted Solar Time ≈ "
+            f"{result['solar_time_highlighted']}.")
+
+# ====== FIGURE ======
+def draw_samrat_yantra(ax, result):
+    """Draw a computed Samrat Yantra onto a matplotlib Axes"""
+    from matplotlib.patches import Circle
+
+    components = result["components"]
+    platform_radius = components["platform"]["radius_m"]
+    gnomon_height = components["gnomon"]["height_m"]
+    gnomon_tilt = components["gnomon"]["tilt_deg"]
+
+    # Platform (circle)
+    circle = Circle((0,0), platform_radius, fill=False, color='saddlebrown', linewidth=3)
+    ax.add_patch(circle)
+
+    # Side walls
+    ax.fill_between([-platform_radius, -platform_radius/2], -platform_radius, platform_radius,
+                    color='peru', alpha=0.3)
+    ax.fill_between([platform_radius/2, platform_radius], -platform_radius, platform_radius,
+                    color='peru', alpha=0.3)
+
+    # Hour lines
+    for line in components["hour_lines"]:
+        x0, y0 = line['start']
+        x1, y1 = line['end']
+        ax.plot([x0,x1],[y0,y1], color='red', linewidth=1)
+
+    # Actual solar time
+    x_end_frac, y_end_frac = components["fractional_line"]["end"]
+    ax.plot([0, x_end_frac], [0, y_end_frac], color='green', linewidth=2.5,
+            label=f"Solar Time ≈ {result['solar_time_highlighted']}")
+
+    # Gnomon
+    gnomon_top = [0, gnomon_height * np.tan(np.radians(gnomon_tilt))]
+    ax.plot([0,0], [0, gnomon_top[1]], color='blue', linewidth=4, label='Gnomon')
+    ax.fill_betweenx([0, gnomon_top[1]], -0.2, 0.2, color='lightblue', alpha=0.5)
+
+    # ====== FINAL STYLING ======
+    ax.set_aspect('equal')
+    ax.set_title(f"Samrat Yantra Simulation (Lat {result['latitude']}, Scale {result['scale_m']} m)")
+    ax.set_xlabel("X (m)")
+    ax.set_ylabel("Y (m)")
+    ax.legend()
+    ax.grid(True)
+
+# ====== SCRIPT MODE ======
+def main():
+    import matplotlib.pyplot as plt
+
+    latitude = float(input("Enter Latitude (e.g., 28.6139): "))
+    longitude = float(input("Enter Longitude (e.g., 77.2090): "))
+    scale_m = float(input("Enter scale (meters, e.g., 3.0): "))
+    date_str = input("Enter date (YYYY-MM-DD): ")
+
+    output = compute_samrat_yantra(latitude, longitude, scale_m, date_str)
+
+    fig, ax = plt.subplots(figsize=FIGURE_SIZE)
+    draw_samrat_yantra(ax, output)
+    plt.show()
+
+    with open("samrat_yantra.json", "w") as f:
+        json.dump(output, f, indent=2)
+
+    print(f"{summarize_samrat_yantra(output)} JSON saved as samrat_yantra.json")
+
+if __name__ == "__main__":
+    main()
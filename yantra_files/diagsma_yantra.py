@@ -1,81 +1,52 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import yantra_astro
 import json
 from datetime import datetime, timedelta
 
-# ====== INPUT ======
-latitude = float(input("Enter Latitude (e.g., 28.6139): "))
-longitude = float(input("Enter Longitude (e.g., 77.2090): "))
-scale_m = float(input("Enter scale (meters, e.g., 4.0): "))
-date_str = input("Enter date (YYYY-MM-DD): ")
-time_str = input("Enter time (HH:MM, 24hr format): ")
-
-# ====== DATE AND TIME HANDLING ======
-date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-time_obj = datetime.strptime(time_str, "%H:%M")
-datetime_obj = datetime.combine(date_obj.date(), time_obj.time())
-day_of_year = date_obj.timetuple().tm_yday
-hour_decimal = time_obj.hour + time_obj.minute / 60.0
+# ====== CONSTANTS ======
+standard_meridian = yantra_astro.STANDARD_MERIDIAN  # IST
+FIGURE_SIZE = (16, 16)
 
 # ====== MAGNETIC DECLINATION CALCULATION ======
-# Simplified magnetic declination model (varies by location)
-# This is approximate - real applications would use detailed magnetic models
+# Simplified magnetic declination model (varies by location), only used
+# when no declination grid or IGRF coefficients are available
 def calculate_magnetic_declination(lat, lon, year=2024):
     """
     Simplified magnetic declination calculation
-    Returns magnetic declination in degrees (positive = East, negative = West)
+    Returns magnetic declination in degrees (positive = East, negative = West);
+    takes scalars or broadcastable arrays
     """
     # Simplified model based on location
     # For India, magnetic declination is generally between 0° to 2° West
-    if 6 <= lat <= 38 and 68 <= lon <= 98:  # India region
-        declination = -1.2 + 0.03 * (lat - 20) - 0.01 * (lon - 77)
-    else:
-        # Global approximation
-        declination = -11.5 + 0.4 * lat - 0.02 * lon
-    
-    return declination
-
-magnetic_declination = calculate_magnetic_declination(latitude, longitude)
-
-# ====== SOLAR CALCULATIONS FOR TRUE NORTH ======
-standard_meridian = 82.5  # IST
-
-# Equation of Time
-B = 2 * np.pi * (day_of_year - 1) / 365
-EoT = 229.18 * (
-    0.000075 + 0.001868*np.cos(B) - 0.032077*np.sin(B)
-    - 0.014615*np.cos(2*B) - 0.040849*np.sin(2*B)
-)
-
-# Longitude correction
-longitude_correction = 4 * (longitude - standard_meridian)
-
-# Solar declination
-declination = 23.45 * np.sin(np.radians(360 * (284 + day_of_year)/365))
-
-# Solar hour angle
-solar_time = hour_decimal + (longitude_correction + EoT) / 60
-hour_angle = 15 * (solar_time - 12)
-
-# Solar altitude and azimuth
-lat_rad = np.radians(latitude)
-dec_rad = np.radians(declination)
-ha_rad = np.radians(hour_angle)
-
-sin_alt = np.sin(dec_rad) * np.sin(lat_rad) + np.cos(dec_rad) * np.cos(lat_rad) * np.cos(ha_rad)
-solar_altitude = np.degrees(np.arcsin(np.clip(sin_alt, -1, 1)))
-
-cos_az = (np.sin(dec_rad) - np.sin(lat_rad) * sin_alt) / (np.cos(lat_rad) * np.cos(np.radians(solar_altitude)))
-solar_azimuth = np.degrees(np.arccos(np.clip(cos_az, -1, 1)))
-if np.sin(ha_rad) > 0:
-    solar_azimuth = 360 - solar_azimuth
-
-# ====== DIGANSHA YANTRA PARAMETERS ======
-yantra_radius = scale_m
-inner_compass_radius = scale_m * 0.8
-direction_line_radius = scale_m * 0.9
-gnomon_height = scale_m * 0.3
-central_post_radius = scale_m * 0.02
+    india = (6 <= lat) & (lat <= 38) & (68 <= lon) & (lon <= 98)  # India region
+    declination = np.where(india,
+                           -1.2 + 0.03 * (lat - 20) - 0.01 * (lon - 77),
+                           -11.5 + 0.4 * lat - 0.02 * lon)  # Global approximation
+    declination = declination + np.zeros_like(year, dtype=np.float64)  # broadcast over epochs
+
+    return declination if declination.ndim else float(declination)
+
+# A declination grid (lat x lon x epoch) sampled from IGRF, or from the
+# model YANTRA_DECLINATION_GRID was built from, replaces the formula
+# above; see yantra_astro/magnetic.py for the format
+def magnetic_declinations(latitudes, longitudes, years):
+    """
+    Magnetic declination in degrees (positive = East) for whole arrays of
+    sites and decimal years: interpolated from the declination grid, or
+    from calculate_magnetic_declination when none is available
+    """
+    path = yantra_astro.declination_grid_path()
+    if path is None:
+        return np.asarray(calculate_magnetic_declination(
+            np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64),
+            np.asarray(years, dtype=np.float64)))
+    grid = yantra_astro.load_declination_grid(path)
+    return yantra_astro.interpolate_declination(grid, latitudes, longitudes, years)
+
+def magnetic_to_true_azimuth(magnetic_azimuth_deg, latitudes, longitudes, years):
+    """True azimuths (0-360) for compass bearings read at the given sites and dates"""
+    declination = magnetic_declinations(latitudes, longitudes, years)
+    return (np.asarray(magnetic_azimuth_deg) + declination) % 360
 
 # ====== DIRECTION SYSTEMS ======
 # 32-point compass rose (traditional navigation)
@@ -85,13 +56,13 @@ compass_directions = [
     {"name": "E", "angle": 90, "type": "cardinal", "color": "#FF0000", "full_name": "East"},
     {"name": "S", "angle": 180, "type": "cardinal", "color": "#FF0000", "full_name": "South"},
     {"name": "W", "angle": 270, "type": "cardinal", "color": "#FF0000", "full_name": "West"},
-    
+
     # Intercardinal directions
     {"name": "NE", "angle": 45, "type": "intercardinal", "color": "#0066CC", "full_name": "Northeast"},
     {"name": "SE", "angle": 135, "type": "intercardinal", "color": "#0066CC", "full_name": "Southeast"},
     {"name": "SW", "angle": 225, "type": "intercardinal", "color": "#0066CC", "full_name": "Southwest"},
     {"name": "NW", "angle": 315, "type": "intercardinal", "color": "#0066CC", "full_name": "Northwest"},
-    
+
     # Half-wind directions
     {"name": "NNE", "angle": 22.5, "type": "half-wind", "color": "#00AA44", "full_name": "North-northeast"},
     {"name": "ENE", "angle": 67.5, "type": "half-wind", "color": "#00AA44", "full_name": "East-northeast"},
@@ -101,7 +72,7 @@ compass_directions = [
     {"name": "WSW", "angle": 247.5, "type": "half-wind", "color": "#00AA44", "full_name": "West-southwest"},
     {"name": "WNW", "angle": 292.5, "type": "half-wind", "color": "#00AA44", "full_name": "West-northwest"},
     {"name": "NNW", "angle": 337.5, "type": "half-wind", "color": "#00AA44", "full_name": "North-northwest"},
-    
+
     # Quarter-wind directions (for precision)
     {"name": "NbE", "angle": 11.25, "type": "quarter-wind", "color": "#AA6600", "full_name": "North by East"},
     {"name": "NEbN", "angle": 33.75, "type": "quarter-wind", "color": "#AA6600", "full_name": "Northeast by North"},
@@ -133,34 +104,62 @@ vedic_directions = [
     {"name": "वायव्य (Vayavya)", "angle": 315, "english": "Northwest", "deity": "Vayu", "element": "Air"}
 ]
 
-# ====== DIRECTION MEASUREMENT FUNCTIONS ======
-def get_direction_from_angle(angle_deg):
+# Sector colors based on elements
+element_colors = {
+    "Earth": "#8B4513",
+    "Water": "#4169E1",
+    "Air": "#87CEEB",
+    "Fire": "#FF6347"
+}
+
+# ====== DIRECTION CLASSIFICATION ======
+# Every direction system divides the circle into equal steps, so the
+# nearest direction is an integer bin, round(azimuth / step) modulo the
+# number of points, looked up in a label table ordered by angle.
+def direction_labels(directions):
+    """Names of evenly spaced directions, ordered clockwise from North"""
+    return np.array([d["name"] for d in sorted(directions, key=lambda d: d["angle"])])
+
+direction_label_tables = {
+    "32_point": direction_labels(compass_directions),
+    "16_point": direction_labels([d for d in compass_directions if d["type"] != "quarter-wind"]),
+    "8_point": direction_labels([d for d in compass_directions if d["type"] in ("cardinal", "intercardinal")]),
+    "vedic": direction_labels(vedic_directions)
+}
+
+def classify_azimuths(azimuths_deg, systems=None):
     """
-    Convert angle to nearest compass direction
+    Nearest direction of every azimuth in each direction system (all of
+    direction_label_tables by default), in constant time per element.
+    Returns {system: {"index", "label", "error_deg"}} with arrays shaped
+    like the input; error_deg is the signed offset of the azimuth from
+    its direction (positive clockwise). Azimuths halfway between two
+    directions go to the clockwise one. NaN azimuths (e.g. no shadow)
+    get index -1, an empty label and a NaN error.
     """
-    # Normalize angle to 0-360
-    angle_deg = angle_deg % 360
-    
-    # Find closest direction
-    min_diff = float('inf')
-    closest_dir = None
-    
-    for direction in compass_directions:
-        diff = min(abs(direction["angle"] - angle_deg), 
-                  abs(direction["angle"] - angle_deg + 360),
-                  abs(direction["angle"] - angle_deg - 360))
-        if diff < min_diff:
-            min_diff = diff
-            closest_dir = direction
-    
-    return closest_dir, min_diff
-
-def create_azimuth_scale():
+    azimuths = np.asarray(azimuths_deg, dtype=np.float64) % 360
+    valid = np.isfinite(azimuths)
+    azimuths = np.where(valid, azimuths, 0.0)
+
+    classified = {}
+    for system in systems or direction_label_tables:
+        labels = direction_label_tables[system]
+        step = 360.0 / labels.size
+        bins = np.floor(azimuths / step + 0.5)
+        index = np.where(valid, bins % labels.size, -1).astype(np.int16)
+        classified[system] = {
+            "index": index,
+            "label": np.where(valid, labels[index], ""),
+            "error_deg": np.where(valid, azimuths - bins * step, np.nan)
+        }
+    return classified
+
+def create_azimuth_scale(yantra_radius):
     """
     Create degree markings around the yantra
     """
     scale_marks = []
-    
+
     # Major marks every 10 degrees
     for angle in range(0, 360, 10):
         scale_marks.append({
@@ -169,395 +168,521 @@ def create_azimuth_scale():
             "length": yantra_radius * 0.05,
             "label": f"{angle}°"
         })
-    
+
     # Minor marks every 5 degrees
     for angle in range(0, 360, 5):
         if angle % 10 != 0:
             scale_marks.append({
                 "angle": angle,
-                "type": "minor", 
+                "type": "minor",
                 "length": yantra_radius * 0.03,
                 "label": None
             })
-    
+
     return scale_marks
 
 # ====== SHADOW ANALYSIS ======
-def calculate_shadow_direction():
+def calculate_shadow_direction(solar_altitude, solar_azimuth, gnomon_height, yantra_radius):
     """
     Calculate shadow direction and length for direction finding
     """
     if solar_altitude > 0:
         # Shadow points opposite to sun
         shadow_azimuth = (solar_azimuth + 180) % 360
-        
+
         # Shadow length based on sun altitude
         shadow_length = gnomon_height / np.tan(np.radians(solar_altitude))
-        
+
         # Limit shadow length to yantra size
         max_shadow = yantra_radius * 0.8
         if shadow_length > max_shadow:
             shadow_length = max_shadow
-            
+
         return shadow_azimuth, shadow_length
     else:
         return None, 0
 
-shadow_azimuth, shadow_length = calculate_shadow_direction()
-
 # ====== WIND ROSE CREATION ======
-def create_wind_rose_pattern():
+def create_wind_rose_pattern(yantra_radius):
     """
     Create traditional wind rose pattern with decorative elements
     """
     rose_points = []
-    
+
     # Main compass points with extended rays
     main_angles = [0, 45, 90, 135, 180, 225, 270, 315]
-    
+
     for angle in main_angles:
         # Inner ray
         inner_length = yantra_radius * 0.6
         outer_length = yantra_radius * 0.95
-        
+
         angle_rad = np.radians(angle)
-        
+
         # Create decorative points
         points = []
         for r in np.linspace(inner_length, outer_length, 5):
             x = r * np.sin(angle_rad)
             y = r * np.cos(angle_rad)
             points.append([x, y])
-        
+
         rose_points.append({
             "angle": angle,
             "points": points,
             "type": "main" if angle % 90 == 0 else "inter"
         })
-    
+
     return rose_points
 
-# ====== FIGURE SETUP ======
-fig, ax = plt.subplots(1, 1, figsize=(16, 16))
-
-# ====== DRAW MAIN YANTRA CIRCLE ======
-# Outer boundary
-outer_circle = plt.Circle((0, 0), yantra_radius, fill=False, color='black', linewidth=4)
-ax.add_patch(outer_circle)
-
-# Inner compass circle
-inner_circle = plt.Circle((0, 0), inner_compass_radius, fill=False, color='darkblue', linewidth=2, linestyle='--', alpha=0.7)
-ax.add_patch(inner_circle)
-
-# Central post
-central_post = plt.Circle((0, 0), central_post_radius,facecolor="#654321",edgecolor="black",linewidth=2)
-
-ax.add_patch(central_post)
-
-# ====== DRAW AZIMUTH SCALE ======
-azimuth_scale = create_azimuth_scale()
-for mark in azimuth_scale:
-    angle_rad = np.radians(mark["angle"])
-    
-    if mark["type"] == "major":
-        # Major tick marks
-        inner_radius = yantra_radius - mark["length"]
-        outer_radius = yantra_radius + mark["length"] * 0.3
-        
-        x1 = inner_radius * np.sin(angle_rad)
-        y1 = inner_radius * np.cos(angle_rad)
-        x2 = outer_radius * np.sin(angle_rad)
-        y2 = outer_radius * np.cos(angle_rad)
-        
-        ax.plot([x1, x2], [y1, y2], color='black', linewidth=2)
-        
-        # Degree labels
-        label_radius = yantra_radius + mark["length"] * 0.6
-        label_x = label_radius * np.sin(angle_rad)
-        label_y = label_radius * np.cos(angle_rad)
-        
-        if mark["angle"] % 30 == 0:  # Show every 30 degrees
-            ax.text(label_x, label_y, mark["label"], ha='center', va='center',
-                   fontsize=9, fontweight='bold',
-                   bbox=dict(boxstyle="round,pad=0.2", facecolor='lightblue', alpha=0.8))
-    else:
-        # Minor tick marks
-        inner_radius = yantra_radius - mark["length"]
-        outer_radius = yantra_radius
-        
-        x1 = inner_radius * np.sin(angle_rad)
-        y1 = inner_radius * np.cos(angle_rad)
-        x2 = outer_radius * np.sin(angle_rad)
-        y2 = outer_radius * np.cos(angle_rad)
-        
-        ax.plot([x1, x2], [y1, y2], color='gray', linewidth=1, alpha=0.7)
-
-# ====== DRAW COMPASS DIRECTIONS ======
-for direction in compass_directions:
-    angle_rad = np.radians(direction["angle"])
-    
-    # Direction line length based on type
-    if direction["type"] == "cardinal":
-        line_length = direction_line_radius
-        line_width = 4
-        alpha = 1.0
-    elif direction["type"] == "intercardinal":
-        line_length = direction_line_radius * 0.9
-        line_width = 3
-        alpha = 0.9
-    elif direction["type"] == "half-wind":
-        line_length = direction_line_radius * 0.7
-        line_width = 2
-        alpha = 0.7
-    else:  # quarter-wind
-        line_length = direction_line_radius * 0.5
-        line_width = 1
-        alpha = 0.5
-    
-    x_end = line_length * np.sin(angle_rad)
-    y_end = line_length * np.cos(angle_rad)
-    
-    ax.plot([0, x_end], [0, y_end], color=direction["color"], 
-           linewidth=line_width, alpha=alpha)
-    
-    # Direction labels for major directions
-    if direction["type"] in ["cardinal", "intercardinal"]:
-        label_radius = line_length + yantra_radius * 0.08
-        label_x = label_radius * np.sin(angle_rad)
-        label_y = label_radius * np.cos(angle_rad)
-        
-        ax.text(label_x, label_y, direction["name"], ha='center', va='center',
-               fontsize=12, fontweight='bold', color=direction["color"],
-               bbox=dict(boxstyle="round,pad=0.3", facecolor='white', 
-                        edgecolor=direction["color"], alpha=0.9))
-
-# ====== DRAW VEDIC DIRECTION SYSTEM ======
-vedic_radius = yantra_radius * 0.5
-for i, vdir in enumerate(vedic_directions):
-    angle_rad = np.radians(vdir["angle"])
-    
-    # Create sector for each direction
-    start_angle = vdir["angle"] - 22.5
-    end_angle = vdir["angle"] + 22.5
-    
-    # Sector colors based on elements
-    element_colors = {
-        "Earth": "#8B4513",
-        "Water": "#4169E1", 
-        "Air": "#87CEEB",
-        "Fire": "#FF6347"
-    }
-    
-    color = element_colors.get(vdir["element"], "#CCCCCC")
-    
-    # Draw sector
-    angles = np.linspace(np.radians(start_angle), np.radians(end_angle), 20)
-    inner_r = yantra_radius * 0.3
-    outer_r = vedic_radius
-    
-    x_outer = outer_r * np.sin(angles)
-    y_outer = outer_r * np.cos(angles)
-    x_inner = inner_r * np.sin(angles[::-1])
-    y_inner = inner_r * np.cos(angles[::-1])
-    
-    x_sector = np.concatenate([x_outer, x_inner])
-    y_sector = np.concatenate([y_outer, y_inner])
-    
-    ax.fill(x_sector, y_sector, color=color, alpha=0.3, 
-           edgecolor='black', linewidth=1)
-    
-    # Vedic direction labels
-    label_radius = (inner_r + outer_r) / 2
-    label_x = label_radius * np.sin(angle_rad)
-    label_y = label_radius * np.cos(angle_rad)
-    
-    ax.text(label_x, label_y, vdir["name"].split('(')[0], 
-           ha='center', va='center', fontsize=8, fontweight='bold',
-           bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
-
-# ====== DRAW TRUE NORTH INDICATOR ======
-true_north_x = yantra_radius * 1.15 * np.sin(np.radians(0))
-true_north_y = yantra_radius * 1.15 * np.cos(np.radians(0))
-ax.plot([0, 0], [0, true_north_y], color='red', linewidth=6, alpha=0.8, 
-        label='True North')
-ax.scatter(0, true_north_y, color='red', s=200, marker='^', 
-          edgecolors='darkred', linewidth=2, zorder=10)
-
-# ====== DRAW MAGNETIC NORTH INDICATOR ======
-magnetic_north_angle = magnetic_declination
-magnetic_north_rad = np.radians(magnetic_north_angle)
-magnetic_north_x = yantra_radius * 1.1 * np.sin(magnetic_north_rad)
-magnetic_north_y = yantra_radius * 1.1 * np.cos(magnetic_north_rad)
-ax.plot([0, magnetic_north_x], [0, magnetic_north_y], color='blue', 
-        linewidth=4, alpha=0.8, label=f'Magnetic North ({magnetic_declination:.1f}°)')
-ax.scatter(magnetic_north_x, magnetic_north_y, color='blue', s=150, marker='^', 
-          edgecolors='darkblue', linewidth=2, zorder=10)
-
-# ====== DRAW CURRENT SUN POSITION ======
-if solar_altitude > 0:
-    sun_direction_rad = np.radians(solar_azimuth)
-    sun_x = direction_line_radius * np.sin(sun_direction_rad)
-    sun_y = direction_line_radius * np.cos(sun_direction_rad)
-    
-    ax.plot([0, sun_x], [0, sun_y], color='gold', linewidth=5, 
-           label=f'Sun Direction (Az: {solar_azimuth:.1f}°)')
-    ax.scatter(sun_x, sun_y, color='gold', s=300, marker='*', 
-              edgecolors='orange', linewidth=2, zorder=10)
-    
-    # Sun position info
-    sun_direction, sun_accuracy = get_direction_from_angle(solar_azimuth)
-    ax.text(sun_x, sun_y + yantra_radius * 0.05,
-           f'☀️ {sun_direction["name"]}\n{solar_azimuth:.1f}° | Alt: {solar_altitude:.1f}°',
-           ha='center', va='bottom', fontsize=10, fontweight='bold',
-           bbox=dict(boxstyle="round,pad=0.3", facecolor='yellow', alpha=0.9))
-
-# ====== DRAW SHADOW DIRECTION ======
-if shadow_azimuth is not None:
-    shadow_rad = np.radians(shadow_azimuth)
-    shadow_x = shadow_length * 0.1 * np.sin(shadow_rad)  # Scale for display
-    shadow_y = shadow_length * 0.1 * np.cos(shadow_rad)
-    
-    ax.plot([0, shadow_x], [0, shadow_y], color='gray', linewidth=4, 
-           alpha=0.7, linestyle=':', label=f'Shadow Direction')
-    ax.scatter(shadow_x, shadow_y, color='gray', s=100, marker='o', 
-              alpha=0.7, zorder=8)
-
-# ====== DRAW WIND ROSE PATTERN ======
-wind_rose = create_wind_rose_pattern()
-for rose_point in wind_rose:
-    points = np.array(rose_point["points"])
-    color = '#FF0000' if rose_point["type"] == "main" else '#0066CC'
-    alpha = 0.6 if rose_point["type"] == "main" else 0.4
-    
-    ax.plot(points[:, 0], points[:, 1], color=color, linewidth=1, alpha=alpha)
-
-# ====== MEASUREMENT GRID ======
-# Concentric circles for distance measurement
-for r in [0.25, 0.5, 0.75]:
-    radius = yantra_radius * r
-    circle = plt.Circle((0, 0), radius, fill=False, color='lightgray', 
-                       linewidth=1, alpha=0.4, linestyle=':')
-    ax.add_patch(circle)
-
-# ====== GNOMON FOR SHADOW MEASUREMENT ======
-# Central gnomon post
-ax.plot([0, 0], [0, gnomon_height * 0.1], color='#654321', linewidth=8, 
-        label=f'Gnomon ({gnomon_height:.1f}m)')
-
-# Gnomon shadow for time/direction finding
-if shadow_azimuth is not None and solar_altitude > 0:
-    # Actual shadow visualization
-    shadow_display_length = min(shadow_length * 0.1, yantra_radius * 0.6)
-    shadow_x_display = shadow_display_length * np.sin(shadow_rad)
-    shadow_y_display = shadow_display_length * np.cos(shadow_rad)
-    
-    ax.plot([0, shadow_x_display], [0, shadow_y_display], 
-           color='darkgray', linewidth=3, alpha=0.8, linestyle='-', 
-           label=f'Current Shadow (Length: {shadow_length:.1f}m)')
-
-# ====== DIRECTION FINDING INDICATORS ======
-# Show current time's directional significance
-current_solar_direction, _ = get_direction_from_angle(solar_azimuth) if solar_altitude > 0 else (None, None)
-
-# ====== FINAL STYLING ======
-ax.set_aspect('equal')
-ax.set_xlim(-yantra_radius*1.3, yantra_radius*1.3)
-ax.set_ylim(-yantra_radius*1.3, yantra_radius*1.3)
-
-# Title with comprehensive information
-title_text = f"Digansha Yantra - Directional Measurement Instrument\n"
-title_text += f"Location: {latitude:.2f}°N, {longitude:.2f}°E | {date_str} {time_str}\n"
-title_text += f"Magnetic Declination: {magnetic_declination:.2f}° | "
-if solar_altitude > 0:
-    title_text += f"Sun: {current_solar_direction['name'] if current_solar_direction else 'Unknown'} {solar_azimuth:.1f}°"
-else:
-    title_text += "Sun below horizon"
-
-plt.title(title_text, fontsize=14, pad=20)
-
-plt.xlabel("East-West (meters)", fontsize=12)
-plt.ylabel("North-South (meters)", fontsize=12)
-plt.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
-# The Flask app will look for this exact file.
-plt.savefig("rasivalaya_yantra_output.png", bbox_inches='tight', dpi=150)
-
-# ====== JSON SAVE ======
-output = {
-    "yantra_type": "digansha",
-    "latitude": latitude,
-    "longitude": longitude,
-    "scale_m": scale_m,
-    "observation_date": date_str,
-    "observation_time": time_str,
-    "magnetic_declination_deg": round(magnetic_declination, 3),
-    "solar_data": {
-        "altitude_deg": round(solar_altitude, 2) if solar_altitude > 0 else None,
-        "azimuth_deg": round(solar_azimuth, 2) if solar_altitude > 0 else None,
-        "declination_deg": round(declination, 2),
-        "hour_angle_deg": round(hour_angle, 2),
-        "equation_of_time_min": round(EoT, 2),
-        "direction": current_solar_direction["name"] if current_solar_direction else None
-    },
-    "shadow_data": {
-        "shadow_azimuth_deg": round(shadow_azimuth, 2) if shadow_azimuth is not None else None,
-        "shadow_length_m": round(shadow_length, 2) if shadow_length > 0 else None,
-        "gnomon_height_m": gnomon_height
-    },
-    "components": {
-        "yantra": {"radius_m": yantra_radius},
-        "inner_compass": {"radius_m": inner_compass_radius},
-        "central_post": {"radius_m": central_post_radius},
-        "direction_lines": {"radius_m": direction_line_radius}
-    },
-    "direction_systems": {
-        "compass_directions": [
+def vedic_sector_outline(vedic_direction, yantra_radius, tolerance):
+    """Closed outline of a Vedic direction's 45° sector, to within tolerance (metres)"""
+    # Bearings run clockwise from north; the outline is built counterclockwise from east
+    start_bearing = vedic_direction["angle"] - 22.5
+    end_bearing = vedic_direction["angle"] + 22.5
+    return yantra_astro.annulus_sector(yantra_radius * 0.3, yantra_radius * 0.5,
+                                       90 - end_bearing, 90 - start_bearing, tolerance)
+
+# ====== CALCULATION ======
+def compute_diagsma_yantra(latitude: float, longitude: float, scale_m: float,
+                           date_str: str, time_str: str, tolerance_mm: float = None) -> dict:
+    """
+    Compute Digansha Yantra directions, sun bearing and shadow. With
+    tolerance_mm, circles and Vedic sectors also carry fabrication
+    outlines (outline_m) within that chord error.
+    Returns the JSON-serialisable yantra description.
+    """
+    # ====== DATE AND TIME HANDLING ======
+    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    time_obj = datetime.strptime(time_str, "%H:%M")
+    hour_decimal = time_obj.hour + time_obj.minute / 60.0
+
+    magnetic_declination = float(magnetic_declinations(latitude, longitude, yantra_astro.decimal_year(date_str)))
+
+    # ====== SOLAR CALCULATIONS FOR TRUE NORTH ======
+    # Equation of Time, declination, hour angle and solar altitude/azimuth
+    sun = yantra_astro.solar_position(date_str, hour_decimal, latitude, longitude, standard_meridian)
+    EoT = sun["equation_of_time_min"]
+    declination = sun["declination_deg"]
+    hour_angle = sun["hour_angle_deg"]
+    solar_altitude = sun["altitude_deg"]
+    solar_azimuth = sun["azimuth_deg"]
+
+    # ====== DIGANSHA YANTRA PARAMETERS ======
+    yantra_radius = scale_m
+    inner_compass_radius = scale_m * 0.8
+    direction_line_radius = scale_m * 0.9
+    gnomon_height = scale_m * 0.3
+    central_post_radius = scale_m * 0.02
+
+    shadow_azimuth, shadow_length = calculate_shadow_direction(
+        solar_altitude, solar_azimuth, gnomon_height, yantra_radius
+    )
+
+    # ====== DIRECTION FINDING INDICATORS ======
+    # Show current time's directional significance on the 32-point rose
+    sun_visible = bool(solar_altitude > 0)
+    solar_label, shadow_label = classify_azimuths(
+        [solar_azimuth if sun_visible else np.nan, np.nan if shadow_azimuth is None else shadow_azimuth],
+        ["32_point"])["32_point"]["label"].tolist()
+
+    azimuth_scale = create_azimuth_scale(yantra_radius)
+
+    result = {
+        "yantra_type": "digansha",
+        "latitude": latitude,
+        "longitude": longitude,
+        "scale_m": scale_m,
+        "observation_date": date_str,
+        "observation_time": time_str,
+        "magnetic_declination_deg": round(magnetic_declination, 3),
+        "solar_data": {
+            "altitude_deg": round(float(solar_altitude), 2) if sun_visible else None,
+            "azimuth_deg": round(float(solar_azimuth), 2) if sun_visible else None,
+            "declination_deg": round(float(declination), 2),
+            "hour_angle_deg": round(float(hour_angle), 2),
+            "equation_of_time_min": round(float(EoT), 2),
+            "direction": solar_label or None
+        },
+        "shadow_data": {
+            "shadow_azimuth_deg": round(float(shadow_azimuth), 2) if shadow_azimuth is not None else None,
+            "shadow_length_m": round(float(shadow_length), 2) if shadow_length > 0 else None,
+            "shadow_direction": shadow_label or None,
+            "gnomon_height_m": gnomon_height
+        },
+        "components": {
+            "yantra": {"radius_m": yantra_radius},
+            "inner_compass": {"radius_m": inner_compass_radius},
+            "central_post": {"radius_m": central_post_radius},
+            "direction_lines": {"radius_m": direction_line_radius}
+        },
+        "direction_systems": {
+            "compass_directions": [
+                {
+                    "name": d["name"],
+                    "angle_deg": d["angle"],
+                    "type": d["type"],
+                    "full_name": d["full_name"]
+                } for d in compass_directions
+            ],
+            "vedic_directions": [
+                {
+                    "sanskrit_name": vd["name"],
+                    "english_name": vd["english"],
+                    "angle_deg": vd["angle"],
+                    "deity": vd["deity"],
+                    "element": vd["element"]
+                } for vd in vedic_directions
+            ]
+        },
+        "azimuth_scale": [
             {
-                "name": d["name"],
-                "angle_deg": d["angle"], 
-                "type": d["type"],
-                "full_name": d["full_name"]
-            } for d in compass_directions
+                "angle_deg": mark["angle"],
+                "type": mark["type"],
+                "label": mark["label"]
+            } for mark in azimuth_scale if mark["type"] == "major"
         ],
-        "vedic_directions": [
-            {
-                "sanskrit_name": vd["name"],
-                "english_name": vd["english"],
-                "angle_deg": vd["angle"],
-                "deity": vd["deity"],
-                "element": vd["element"]
-            } for vd in vedic_directions
-        ]
-    },
-    "azimuth_scale": [
-        {
-            "angle_deg": mark["angle"],
-            "type": mark["type"],
-            "label": mark["label"]
-        } for mark in azimuth_scale if mark["type"] == "major"
-    ],
-    "measurements": {
-        "precision_deg": 1.0,
-        "azimuth_range": "0-360 degrees",
-        "magnetic_correction_available": True,
-        "shadow_measurement_available": solar_altitude > 0,
-        "vedic_system_integrated": True
+        "measurements": {
+            "precision_deg": 1.0,
+            "azimuth_range": "0-360 degrees",
+            "magnetic_correction_available": True,
+            "shadow_measurement_available": sun_visible,
+            "vedic_system_integrated": True
+        }
     }
-}
 
-with open("digansha_yantra.json", "w") as f:
-    json.dump(output, f, indent=2)
+    # ====== FABRICATION OUTLINES ======
+    if tolerance_mm:
+        components = result["components"]
+        tolerance = yantra_astro.fabrication_tolerance(tolerance_mm)
+        result["chord_tolerance_mm"] = tolerance_mm
+        for name, radius in [("yantra", yantra_radius), ("inner_compass", inner_compass_radius),
+                             ("central_post", central_post_radius)]:
+            components[name]["outline_m"] = yantra_astro.outline_json(yantra_astro.circle_points(radius, tolerance))
+        for entry, vdir in zip(result["direction_systems"]["vedic_directions"], vedic_directions):
+            entry["outline_m"] = yantra_astro.outline_json(vedic_sector_outline(vdir, yantra_radius, tolerance))
+    return result
+
+# ====== BATCH CALCULATION ======
+def compute_diagsma_batch(latitude, longitude, scale_m, dates, clock_hours, compass_bearing_deg=None):
+    """
+    Vectorised Digansha bearings for many (site, date, clock time) rows
+    at once: sun and shadow azimuths with their nearest direction in every
+    direction system, shadow length and magnetic declination. With
+    compass_bearing_deg (a bearing read on a magnetic compass at each
+    row's site), also its true bearing and direction. All arguments are
+    equal-length 1-D arrays; returns a dict of columns. Sun and shadow
+    direction labels are empty while the sun is below the horizon.
+    """
+    sun = yantra_astro.solar_position(dates, clock_hours, latitude, longitude, standard_meridian)
+    altitude = sun["altitude_deg"]
+    solar_azimuth = sun["azimuth_deg"] % 360
+    shadow_azimuth = (solar_azimuth + 180) % 360
+    sun_visible = altitude > 0
+
+    # Shadow of the gnomon, limited to the yantra like calculate_shadow_direction
+    gnomon_height = scale_m * 0.3
+    with np.errstate(divide="ignore"):
+        shadow_length = np.where(sun_visible,
+                                 np.minimum(gnomon_height / np.tan(np.radians(np.maximum(altitude, 0))),
+                                            scale_m * 0.8), 0.0)
+
+    years = yantra_astro.decimal_year(dates)
+    columns = {
+        "altitude_deg": altitude,
+        "azimuth_deg": solar_azimuth,
+        "sun_visible": sun_visible,
+        "declination_deg": sun["declination_deg"],
+        "equation_of_time_min": sun["equation_of_time_min"],
+        "shadow_azimuth_deg": shadow_azimuth,
+        "shadow_length_m": shadow_length,
+        "magnetic_declination_deg": magnetic_declinations(latitude, longitude, years),
+    }
+    bearings = [("solar", np.where(sun_visible, solar_azimuth, np.nan)),
+                ("shadow", np.where(sun_visible, shadow_azimuth, np.nan))]
+    if compass_bearing_deg is not None:
+        columns["true_bearing_deg"] = magnetic_to_true_azimuth(compass_bearing_deg, latitude, longitude, years)
+        bearings.append(("true_bearing", columns["true_bearing_deg"]))
+    for prefix, azimuths in bearings:
+        for system, classified in classify_azimuths(azimuths).items():
+            columns[f"{prefix}_direction_{system}"] = classified["label"]
+    return columns
+
+def summarize_diagsma_yantra(result):
+    """Console summary of a computed Digansha Yantra"""
+    magnetic_declination = result["magnetic_declination_deg"]
+    solar = result["solar_data"]
+    shadow = result["shadow_data"]
+    lines = [
+        f"✅ Digansha Yantra generated!",
+        f"🧭 Magnetic Declination: {magnetic_declination:.2f}° {'East' if magnetic_declination > 0 else 'West'}",
+    ]
+    if solar["altitude_deg"] is not None:
+        lines.append(f"☀️ Sun Position: {solar['direction'] or 'Unknown'} {solar['azimuth_deg']:.1f}° "
+                     f"(Alt: {solar['altitude_deg']:.1f}°)")
+        if shadow["shadow_azimuth_deg"] is not None:
+            lines.append(f"🔍 Shadow Direction: {shadow['shadow_direction']} {shadow['shadow_azimuth_deg']:.1f}° "
+                         f"(Length: {shadow['shadow_length_m']:.1f}m)")
+    else:
+        lines.append(f"☀️ Sun below horizon - use for stellar/lunar observations")
+    lines.append(f"🎯 True North: 0.0° | Magnetic North: {magnetic_declination:.1f}°")
+    return "\n".join(lines)
+
+# ====== FIGURE ======
+def draw_diagsma_yantra(ax, result):
+    """Draw a computed Digansha Yantra onto a matplotlib Axes"""
+    from matplotlib.patches import Circle
+
+    latitude = result["latitude"]
+    longitude = result["longitude"]
+    components = result["components"]
+    yantra_radius = components["yantra"]["radius_m"]
+    inner_compass_radius = components["inner_compass"]["radius_m"]
+    central_post_radius = components["central_post"]["radius_m"]
+    direction_line_radius = components["direction_lines"]["radius_m"]
+    gnomon_height = result["shadow_data"]["gnomon_height_m"]
+    magnetic_declination = result["magnetic_declination_deg"]
+    solar_altitude = result["solar_data"]["altitude_deg"]
+    solar_azimuth = result["solar_data"]["azimuth_deg"]
+    shadow_azimuth = result["shadow_data"]["shadow_azimuth_deg"]
+    shadow_length = result["shadow_data"]["shadow_length_m"] or 0
+    sun_visible = solar_altitude is not None
+
+    # ====== DRAW MAIN YANTRA CIRCLE ======
+    # Outer boundary
+    outer_circle = Circle((0, 0), yantra_radius, fill=False, color='black', linewidth=4)
+    ax.add_patch(outer_circle)
+
+    # Inner compass circle
+    inner_circle = Circle((0, 0), inner_compass_radius, fill=False, color='darkblue', linewidth=2, linestyle='--', alpha=0.7)
+    ax.add_patch(inner_circle)
+
+    # Central post
+    central_post = Circle((0, 0), central_post_radius,facecolor="#654321",edgecolor="black",linewidth=2)
+
+    ax.add_patch(central_post)
+
+    # ====== DRAW AZIMUTH SCALE ======
+    for mark in create_azimuth_scale(yantra_radius):
+        angle_rad = np.radians(mark["angle"])
+
+        if mark["type"] == "major":
+            # Major tick marks
+            inner_radius = yantra_radius - mark["length"]
+            outer_radius = yantra_radius + mark["length"] * 0.3
+
+            x1 = inner_radius * np.sin(angle_rad)
+            y1 = inner_radius * np.cos(angle_rad)
+            x2 = outer_radius * np.sin(angle_rad)
+            y2 = outer_radius * np.cos(angle_rad)
+
+            ax.plot([x1, x2], [y1, y2], color='black', linewidth=2)
+
+            # Degree labels
+            label_radius = yantra_radius + mark["length"] * 0.6
+            label_x = label_radius * np.sin(angle_rad)
+            label_y = label_radius * np.cos(angle_rad)
+
+            if mark["angle"] % 30 == 0:  # Show every 30 degrees
+                ax.text(label_x, label_y, mark["label"], ha='center', va='center',
+                       fontsize=9, fontweight='bold',
+                       bbox=dict(boxstyle="round,pad=0.2", facecolor='lightblue', alpha=0.8))
+        else:
+            # Minor tick marks
+            inner_radius = yantra_radius - mark["length"]
+            outer_radius = yantra_radius
+
+            x1 = inner_radius * np.sin(angle_rad)
+            y1 = inner_radius * np.cos(angle_rad)
+            x2 = outer_radius * np.sin(angle_rad)
+            y2 = outer_radius * np.cos(angle_rad)
+
+            ax.plot([x1, x2], [y1, y2], color='gray', linewidth=1, alpha=0.7)
+
+    # ====== DRAW COMPASS DIRECTIONS ======
+    for direction in compass_directions:
+        angle_rad = np.radians(direction["angle"])
+
+        # Direction line length based on type
+        if direction["type"] == "cardinal":
+            line_length = direction_line_radius
+            line_width = 4
+            alpha = 1.0
+        elif direction["type"] == "intercardinal":
+            line_length = direction_line_radius * 0.9
+            line_width = 3
+            alpha = 0.9
+        elif direction["type"] == "half-wind":
+            line_length = direction_line_radius * 0.7
+            line_width = 2
+            alpha = 0.7
+        else:  # quarter-wind
+            line_length = direction_line_radius * 0.5
+            line_width = 1
+            alpha = 0.5
+
+        x_end = line_length * np.sin(angle_rad)
+        y_end = line_length * np.cos(angle_rad)
+
+        ax.plot([0, x_end], [0, y_end], color=direction["color"],
+               linewidth=line_width, alpha=alpha)
+
+        # Direction labels for major directions
+        if direction["type"] in ["cardinal", "intercardinal"]:
+            label_radius = line_length + yantra_radius * 0.08
+            label_x = label_radius * np.sin(angle_rad)
+            label_y = label_radius * np.cos(angle_rad)
+
+            ax.text(label_x, label_y, direction["name"], ha='center', va='center',
+                   fontsize=12, fontweight='bold', color=direction["color"],
+                   bbox=dict(boxstyle="round,pad=0.3", facecolor='white',
+                            edgecolor=direction["color"], alpha=0.9))
+
+    # ====== DRAW VEDIC DIRECTION SYSTEM ======
+    vedic_radius = yantra_radius * 0.5
+    tolerance = yantra_astro.axes_tolerance(ax, yantra_radius * 2.6)
+    for i, vdir in enumerate(vedic_directions):
+        angle_rad = np.radians(vdir["angle"])
+
+        # Draw sector
+        sector = vedic_sector_outline(vdir, yantra_radius, tolerance)
+        inner_r = yantra_radius * 0.3
+        outer_r = vedic_radius
+        color = element_colors.get(vdir["element"], "#CCCCCC")
+
+        ax.fill(sector[:, 0], sector[:, 1], color=color, alpha=0.3,
+               edgecolor='black', linewidth=1)
+
+        # Vedic direction labels
+        label_radius = (inner_r + outer_r) / 2
+        label_x = label_radius * np.sin(angle_rad)
+        label_y = label_radius * np.cos(angle_rad)
 
-print(f"✅ Digansha Yantra generated!")
-print(f"🧭 Magnetic Declination: {magnetic_declination:.2f}° {'East' if magnetic_declination > 0 else 'West'}")
-if solar_altitude > 0:
-    print(f"☀️ Sun Position: {current_solar_direction['name'] if current_solar_direction else 'Unknown'} {solar_azimuth:.1f}° (Alt: {solar_altitude:.1f}°)")
+        ax.text(label_x, label_y, vdir["name"].split('(')[0],
+               ha='center', va='center', fontsize=8, fontweight='bold',
+               bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
+
+    # ====== DRAW TRUE NORTH INDICATOR ======
+    true_north_y = yantra_radius * 1.15 * np.cos(np.radians(0))
+    ax.plot([0, 0], [0, true_north_y], color='red', linewidth=6, alpha=0.8,
+            label='True North')
+    ax.scatter(0, true_north_y, color='red', s=200, marker='^',
+              edgecolors='darkred', linewidth=2, zorder=10)
+
+    # ====== DRAW MAGNETIC NORTH INDICATOR ======
+    magnetic_north_rad = np.radians(magnetic_declination)
+    magnetic_north_x = yantra_radius * 1.1 * np.sin(magnetic_north_rad)
+    magnetic_north_y = yantra_radius * 1.1 * np.cos(magnetic_north_rad)
+    ax.plot([0, magnetic_north_x], [0, magnetic_north_y], color='blue',
+            linewidth=4, alpha=0.8, label=f'Magnetic North ({magnetic_declination:.1f}°)')
+    ax.scatter(magnetic_north_x, magnetic_north_y, color='blue', s=150, marker='^',
+              edgecolors='darkblue', linewidth=2, zorder=10)
+
+    # ====== DRAW CURRENT SUN POSITION ======
+    if sun_visible:
+        sun_direction_rad = np.radians(solar_azimuth)
+        sun_x = direction_line_radius * np.sin(sun_direction_rad)
+        sun_y = direction_line_radius * np.cos(sun_direction_rad)
+
+        ax.plot([0, sun_x], [0, sun_y], color='gold', linewidth=5,
+               label=f'Sun Direction (Az: {solar_azimuth:.1f}°)')
+        ax.scatter(sun_x, sun_y, color='gold', s=300, marker='*',
+                  edgecolors='orange', linewidth=2, zorder=10)
+
+        # Sun position info
+        ax.text(sun_x, sun_y + yantra_radius * 0.05,
+               f'☀️ {result["solar_data"]["direction"]}\n{solar_azimuth:.1f}° | Alt: {solar_altitude:.1f}°',
+               ha='center', va='bottom', fontsize=10, fontweight='bold',
+               bbox=dict(boxstyle="round,pad=0.3", facecolor='yellow', alpha=0.9))
+
+    # ====== DRAW SHADOW DIRECTION ======
     if shadow_azimuth is not None:
-        shadow_direction, _ = get_direction_from_angle(shadow_azimuth)
-        print(f"🔍 Shadow Direction: {shadow_direction['name']} {shadow_azimuth:.1f}° (Length: {shadow_length:.1f}m)")
-else:
-    print(f"☀️ Sun below horizon - use for stellar/lunar observations")
-print(f"🎯 True North: 0.0° | Magnetic North: {magnetic_declination:.1f}°")
-print(f"📊 JSON saved as digansha_yantra.json")
\ No newline at end of file
+        shadow_rad = np.radians(shadow_azimuth)
+        shadow_x = shadow_length * 0.1 * np.sin(shadow_rad)  # Scale for display
+        shadow_y = shadow_length * 0.1 * np.cos(shadow_rad)
+
+        ax.plot([0, shadow_x], [0, shadow_y], color='gray', linewidth=4,
+               alpha=0.7, linestyle=':', label=f'Shadow Direction')
+        ax.scatter(shadow_x, shadow_y, color='gray', s=100, marker='o',
+                  alpha=0.7, zorder=8)
+
+    # ====== DRAW WIND ROSE PATTERN ======
+    for rose_point in create_wind_rose_pattern(yantra_radius):
+        points = np.array(rose_point["points"])
+        color = '#FF0000' if rose_point["type"] == "main" else '#0066CC'
+        alpha = 0.6 if rose_point["type"] == "main" else 0.4
+
+        ax.plot(points[:, 0], points[:, 1], color=color, linewidth=1, alpha=alpha)
+
+    # ====== MEASUREMENT GRID ======
+    # Concentric circles for distance measurement
+    for r in [0.25, 0.5, 0.75]:
+        radius = yantra_radius * r
+        circle = Circle((0, 0), radius, fill=False, color='lightgray',
+                        linewidth=1, alpha=0.4, linestyle=':')
+        ax.add_patch(circle)
+
+    # ====== GNOMON FOR SHADOW MEASUREMENT ======
+    # Central gnomon post
+    ax.plot([0, 0], [0, gnomon_height * 0.1], color='#654321', linewidth=8,
+            label=f'Gnomon ({gnomon_height:.1f}m)')
+
+    # Gnomon shadow for time/direction finding
+    if shadow_azimuth is not None and sun_visible:
+        # Actual shadow visualization
+        shadow_display_length = min(shadow_length * 0.1, yantra_radius * 0.6)
+        shadow_x_display = shadow_display_length * np.sin(shadow_rad)
+        shadow_y_display = shadow_display_length * np.cos(shadow_rad)
+
+        ax.plot([0, shadow_x_display], [0, shadow_y_display],
+               color='darkgray', linewidth=3, alpha=0.8, linestyle='-',
+               label=f'Current Shadow (Length: {shadow_length:.1f}m)')
+
+    # ====== FINAL STYLING ======
+    ax.set_aspect('equal')
+    ax.set_xlim(-yantra_radius*1.3, yantra_radius*1.3)
+    ax.set_ylim(-yantra_radius*1.3, yantra_radius*1.3)
+
+    # Title with comprehensive information
+    title_text = f"Digansha Yantra - Directional Measurement Instrument\n"
+    title_text += (f"Location: {latitude:.2f}°N, {longitude:.2f}°E | "
+                   f"{result['observation_date']} {result['observation_time']}\n")
+    title_text += f"Magnetic Declination: {magnetic_declination:.2f}° | "
+    if sun_visible:
+        title_text += f"Sun: {result['solar_data']['direction'] or 'Unknown'} {solar_azimuth:.1f}°"
+    else:
+        title_text += "Sun below horizon"
+
+    ax.set_title(title_text, fontsize=14, pad=20)
+
+    ax.set_xlabel("East-West (meters)", fontsize=12)
+    ax.set_ylabel("North-South (meters)", fontsize=12)
+    ax.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10)
+    ax.grid(True, alpha=0.3)
+    ax.figure.tight_layout()
+
+# ====== SCRIPT MODE ======
+def main():
+    import matplotlib.pyplot as plt
+
+    latitude = float(input("Enter Latitude (e.g., 28.6139): "))
+    longitude = float(input("Enter Longitude (e.g., 77.2090): "))
+    scale_m = float(input("Enter scale (meters, e.g., 4.0): "))
+    date_str = input("Enter date (YYYY-MM-DD): ")
+    time_str = input("Enter time (HH:MM, 24hr format): ")
+
+    output = compute_diagsma_yantra(latitude, longitude, scale_m, date_str, time_str)
+
+    fig, ax = plt.subplots(1, 1, figsize=FIGURE_SIZE)
+    draw_diagsma_yantra(ax, output)
+    # Save before show() so the figure is not already closed
+    fig.savefig("rasivalaya_yantra_output.png", bbox_inches='tight', dpi=150)
+    plt.show()
+
+    with open("digansha_yantra.json", "w") as f:
+        json.dump(output, f, indent=2)
+
+    print(summarize_diagsma_yantra(output))
+    print(f"📊 JSON saved as digansha_yantra.json")
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,17 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import yantra_astro
 import json
+import os
 from datetime import datetime, timedelta
 
-# ====== INPUT ======
-latitude = float(input("Enter Latitude (e.g., 28.6139): "))
-longitude = float(input("Enter Longitude (e.g., 77.2090): "))
-scale_m = float(input("Enter scale (meters, e.g., 4.0): "))
-date_str = input("Enter date (YYYY-MM-DD): ")
-time_str = input("Enter time (HH:MM, 24hr format): ")
-
-# ====== DATE AND TIME HANDLING ======
-date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-time_obj = datetime.strptime(time_str, "%H:%M")
-datetime_obj = datetime.combine(date_obj.date(), time_obj.time())
-day_of_year = date_obj.timetuple().tm_yday
-hour_decimal = time_obj.hour + time_obj.minute / 60.0
-
-# ====== SIDEREAL TIME CALCULATION ======
-# Greenwich Sidereal Time at 0h UT
-J2000_epoch = datetime(2000, 1, 1, 12, 0, 0)  # J2000.0 epoch
-days_since_J2000 = (datetime_obj - J2000_epoch).total_seconds() / 86400.0
-centuries_since_J2000 = days_since_J2000 / 36525.0
-
-# Greenwich Mean Sidereal Time at 0h UT (in hours)
-GMST0 = 18.697374558 + 24.06570982441908 * days_since_J2000
-GMST0 = GMST0 % 24
-
-# Current Greenwich Mean Sidereal Time
-GMST = (GMST0 + 1.00273790935 * hour_decimal) % 24
-
-# Local Sidereal Time
-LST = (GMST + longitude / 15.0) % 24
+# ====== CONSTANTS ======
+FIGURE_SIZE = (14, 14)
 
 # ====== POLARIS COORDINATES ======
-# Polaris (α UMi) coordinates for current epoch
+# Polaris (α UMi) catalog coordinates; precessed to the date of observation
 polaris_ra_hours = 2.530  # Right Ascension in hours (J2000)
 polaris_dec_deg = 89.264  # Declination in degrees (J2000)
 
-# Precession correction (simplified)
-precession_correction = 0.0139 * centuries_since_J2000  # degrees per century
-current_polaris_dec = polaris_dec_deg + precession_correction
-
-# Hour Angle of Polaris
-polaris_hour_angle = (LST - polaris_ra_hours) % 24
-if polaris_hour_angle > 12:
-    polaris_hour_angle -= 24
-
 # ====== CIRCUMPOLAR STAR PATTERNS ======
 # Major circumpolar constellations visible around Polaris
 circumpolar_stars = [
@@ -58,82 +23,86 @@ circumpolar_stars = [
     {"name": "Alioth", "ra": 12.900, "dec": 55.960, "mag": 1.8, "constellation": "UMa"},
     {"name": "Mizar", "ra": 13.420, "dec": 54.925, "mag": 2.3, "constellation": "UMa"},
     {"name": "Alkaid", "ra": 13.792, "dec": 49.313, "mag": 1.9, "constellation": "UMa"},
-    
+
     # Cassiopeia - 5 main stars (W-shaped)
     {"name": "Schedar", "ra": 0.675, "dec": 56.538, "mag": 2.2, "constellation": "Cas"},
     {"name": "Caph", "ra": 0.153, "dec": 59.150, "mag": 2.3, "constellation": "Cas"},
     {"name": "Gamma Cas", "ra": 0.945, "dec": 60.717, "mag": 2.5, "constellation": "Cas"},
     {"name": "Ruchbah", "ra": 1.430, "dec": 60.235, "mag": 2.7, "constellation": "Cas"},
     {"name": "Segin", "ra": 1.906, "dec": 63.670, "mag": 3.4, "constellation": "Cas"},
-    
+
     # Draco - Dragon constellation
     {"name": "Thuban", "ra": 14.073, "dec": 64.376, "mag": 3.7, "constellation": "Dra"},
     {"name": "Etamin", "ra": 17.943, "dec": 51.489, "mag": 2.2, "constellation": "Dra"},
     {"name": "Rastaban", "ra": 17.507, "dec": 52.301, "mag": 2.8, "constellation": "Dra"},
-    
+
     # Cepheus
     {"name": "Alderamin", "ra": 21.310, "dec": 62.585, "mag": 2.4, "constellation": "Cep"},
     {"name": "Alfirk", "ra": 21.477, "dec": 70.561, "mag": 3.2, "constellation": "Cep"},
 ]
 
-# ====== PARAMETERS ======
-yantra_radius = scale_m
-central_pole_height = scale_m * 1.2
-inner_circle_radius = scale_m * 0.1  # Central Polaris circle
-outer_ring_radius = scale_m * 0.9    # Outer measurement ring
+# ====== STAR CATALOG ======
+# Point YANTRA_STAR_CATALOG at a packed .npy or CSV catalog (see yantra_astro.stars) to plot
+# the full naked-eye sky; otherwise the circumpolar stars above are used
+STAR_CATALOG_PATH = os.environ.get("YANTRA_STAR_CATALOG")
+DEFAULT_MAX_MAGNITUDE = 6.5  # naked-eye limit
+MAX_STAR_LABELS = 40  # name labels drawn, brightest first
+builtin_star_catalog = yantra_astro.star_catalog_from_records(circumpolar_stars)
 
-# ====== COORDINATE TRANSFORMATION ======
-def celestial_to_local(ra_hours, dec_deg, lst_hours, lat_deg):
-    """Convert celestial coordinates to local horizontal coordinates"""
-    # Hour angle
-    ha = (lst_hours - ra_hours) * 15  # Convert to degrees
-    
-    # Convert to radians
-    ha_rad = np.radians(ha)
-    dec_rad = np.radians(dec_deg)
-    lat_rad = np.radians(lat_deg)
-    
-    # Calculate altitude and azimuth
-    sin_alt = np.sin(dec_rad) * np.sin(lat_rad) + np.cos(dec_rad) * np.cos(lat_rad) * np.cos(ha_rad)
-    altitude = np.degrees(np.arcsin(sin_alt))
-    
-    cos_az = (np.sin(dec_rad) - np.sin(lat_rad) * sin_alt) / (np.cos(lat_rad) * np.cos(np.radians(altitude)))
-    azimuth = np.degrees(np.arccos(np.clip(cos_az, -1, 1)))
-    
-    if np.sin(ha_rad) > 0:
-        azimuth = 360 - azimuth
-    
-    return altitude, azimuth
+# Stars that the constellation_patterns index into
+pattern_star_names = {star["name"] for star in circumpolar_stars}
+
+def star_catalog():
+    """The configured star catalog, or the built-in circumpolar stars"""
+    if STAR_CATALOG_PATH:
+        return yantra_astro.load_star_catalog(STAR_CATALOG_PATH)
+    return builtin_star_catalog
 
+constellation_colors = {
+    'UMa': '#FF6B6B',    # Ursa Major - Red
+    'Cas': '#4ECDC4',    # Cassiopeia - Teal
+    'Dra': '#45B7D1',    # Draco - Blue
+    'Cep': '#96CEB4',    # Cepheus - Green
+}
+
+# Constellation line patterns (indices into visible stars of that constellation)
+constellation_patterns = {
+    'UMa': [(0,1), (1,2), (2,3), (3,4), (4,5), (5,6), (3,0)],  # Big Dipper
+    'Cas': [(0,1), (1,2), (2,3), (3,4)],  # W-shape
+    'Dra': [(0,1), (1,2)],  # Simplified dragon
+    'Cep': [(0,1)]  # Simplified
+}
+
+# ====== COORDINATE TRANSFORMATION ======
 def polar_projection(altitude, azimuth, max_radius):
     """Project celestial coordinates onto polar grid"""
     # Distance from pole (90° - altitude) scaled to radius
     r = max_radius * (90 - altitude) / 90
-    
+
     # Convert azimuth to mathematical angle (counterclockwise from east)
     theta = np.radians(90 - azimuth)
-    
+
     x = r * np.cos(theta)
     y = r * np.sin(theta)
-    
+
     return x, y
 
 # ====== HOUR ANGLE GRID ======
-def create_hour_circles():
+def create_hour_circles(yantra_radius):
     """Create hour angle circles for sidereal time measurement"""
     hour_circles = []
-    
+
     # 24 hour lines radiating from center
     for h in range(24):
         angle = h * 15 - 90  # Start from north (0°)
         angle_rad = np.radians(angle)
-        
+
         x_end = yantra_radius * np.cos(angle_rad)
         y_end = yantra_radius * np.sin(angle_rad)
-        
+
         # Sidereal hour (slightly different from solar hour)
         sidereal_hour = h * 23.93447 / 24  # Sidereal hour conversion
-        
+
         hour_circles.append({
             "hour": h,
             "sidereal_hour": sidereal_hour,
@@ -142,15 +111,15 @@ def create_hour_circles():
             "end": [x_end, y_end],
             "label": f"{h:02d}h"
         })
-    
+
     return hour_circles
 
 # ====== DECLINATION CIRCLES ======
-def create_declination_circles():
+def create_declination_circles(yantra_radius):
     """Create concentric circles for different declinations"""
     dec_circles = []
     declinations = [30, 45, 60, 75, 85]  # Declination values in degrees
-    
+
     for dec in declinations:
         radius = yantra_radius * (90 - dec) / 90
         dec_circles.append({
@@ -158,269 +127,478 @@ def create_declination_circles():
             "radius": radius,
             "color": "lightgray"
         })
-    
+
     return dec_circles
 
-# ====== POLARIS POSITION CALCULATION ======
-polaris_altitude, polaris_azimuth = celestial_to_local(
-    polaris_ra_hours, current_polaris_dec, LST, latitude
-)
-polaris_x, polaris_y = polar_projection(polaris_altitude, polaris_azimuth, yantra_radius)
-
-# ====== CIRCUMPOLAR STAR POSITIONS ======
-star_positions = []
-for star in circumpolar_stars:
-    alt, az = celestial_to_local(star["ra"], star["dec"], LST, latitude)
-    
-    # Only include stars above horizon
-    if alt > 0:
-        x, y = polar_projection(alt, az, yantra_radius)
-        star_positions.append({
-            "name": star["name"],
-            "constellation": star["constellation"],
-            "magnitude": star["mag"],
-            "x": x,
-            "y": y,
-            "altitude": alt,
-            "azimuth": az
-        })
+# ====== CALCULATION ======
+def compute_dhruva_yantra(latitude: float, longitude: float, scale_m: float,
+                          date_str: str, time_str: str,
+                          max_magnitude: float = DEFAULT_MAX_MAGNITUDE,
+                          tolerance_mm: float = None) -> dict:
+    """
+    Compute Dhruva-Protha-Chakra Yantra geometry and star positions for
+    every catalog star above the horizon and at least as bright as
+    max_magnitude. With tolerance_mm, circles also carry fabrication
+    outlines (outline_m) within that chord error.
+    Returns the JSON-serialisable yantra description.
+    """
+    # ====== DATE AND TIME HANDLING ======
+    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    time_obj = datetime.strptime(time_str, "%H:%M")
+    datetime_obj = datetime.combine(date_obj.date(), time_obj.time())
+
+    # ====== SIDEREAL TIME CALCULATION ======
+    days_since_J2000 = float(yantra_astro.days_since_j2000(np.datetime64(datetime_obj)))
+
+    # Greenwich Mean Sidereal Time and Local Sidereal Time (hours)
+    GMST, LST = yantra_astro.sidereal_time(np.datetime64(datetime_obj), longitude)
+
+    # ====== PRECESSION & NUTATION ======
+    # J2000 -> true equator and equinox of date (cached per date); apparent
+    # sidereal time pairs with the true-of-date coordinates
+    frame, equation_of_equinoxes = yantra_astro.apparent_frame(date_str)
+    apparent_LST = (LST + equation_of_equinoxes) % 24
+
+    current_polaris_ra, current_polaris_dec = yantra_astro.rotate_equatorial(
+        polaris_ra_hours, polaris_dec_deg, frame)
+    precession_correction = float(current_polaris_dec - polaris_dec_deg)
+
+    # Hour Angle of Polaris
+    polaris_hour_angle = (apparent_LST - current_polaris_ra) % 24
+    if polaris_hour_angle > 12:
+        polaris_hour_angle -= 24
+
+    # ====== PARAMETERS ======
+    yantra_radius = scale_m
+    central_pole_height = scale_m * 1.2
+    inner_circle_radius = scale_m * 0.1  # Central Polaris circle
+
+    # ====== POLARIS POSITION CALCULATION ======
+    polaris_altitude, polaris_azimuth = yantra_astro.equatorial_to_horizontal(
+        current_polaris_ra, current_polaris_dec, apparent_LST, latitude
+    )
+    polaris_x, polaris_y = polar_projection(polaris_altitude, polaris_azimuth, yantra_radius)
+
+    # ====== STAR POSITIONS ======
+    # The band index yields only stars that can be above the horizon and are
+    # bright enough (queried with the zenith carried back to J2000); those
+    # are precessed with one matrix product and transformed in one broadcast
+    catalog = star_catalog()
+    zenith_ra, zenith_dec = yantra_astro.catalog_frame_zenith(apparent_LST, latitude, frame)
+    stars = catalog.above_horizon_candidates(zenith_ra, zenith_dec, max_magnitude)
+    star_ra, star_dec = yantra_astro.rotate_equatorial(stars["ra_hours"], stars["dec_deg"], frame)
+    altitude, azimuth = yantra_astro.equatorial_to_horizontal(star_ra, star_dec, apparent_LST, latitude)
+    visible = altitude > 0
+    stars, altitude, azimuth = stars[visible], altitude[visible], azimuth[visible]
+    star_x, star_y = polar_projection(altitude, azimuth, yantra_radius)
+
+    # Circumpolar: a member of the built-in circumpolar set, or a star that
+    # never sets at this latitude
+    never_sets = star_dec[visible] * np.sign(latitude) > 90 - abs(latitude)
+    builtin = np.isin(yantra_astro.star_labels(stars, "name"), list(pattern_star_names))
+    visible_circumpolar = int((never_sets | builtin).sum())
+
+    declination_circles = create_declination_circles(yantra_radius)
+    hour_circles = create_hour_circles(yantra_radius)
+
+    result = {
+        "yantra_type": "dhruva_protha_chakra",
+        "latitude": latitude,
+        "longitude": longitude,
+        "scale_m": scale_m,
+        "observation_date": date_str,
+        "observation_time": time_str,
+        "local_sidereal_time_hours": round(float(LST), 4),
+        "polaris_data": {
+            "right_ascension_hours": round(float(current_polaris_ra), 4),
+            "declination_deg": round(float(current_polaris_dec), 3),
+            "altitude_deg": round(float(polaris_altitude), 2),
+            "azimuth_deg": round(float(polaris_azimuth), 2),
+            "hour_angle_hours": round(float(polaris_hour_angle), 3),
+            "position_x_m": round(float(polaris_x), 3),
+            "position_y_m": round(float(polaris_y), 3)
+        },
+        "components": {
+            "yantra": {"radius_m": yantra_radius},
+            "central_pole": {"height_m": central_pole_height, "tilt_deg": latitude},
+            "inner_circle": {"radius_m": inner_circle_radius},
+            "declination_circles": [
+                {"declination_deg": dc["declination"], "radius_m": dc["radius"]}
+                for dc in declination_circles
+            ],
+            "hour_angle_lines": [
+                {
+                    "hour": hc["hour"],
+                    "sidereal_hour": round(hc["sidereal_hour"], 3),
+                    "angle_deg": hc["angle_deg"]
+                } for hc in hour_circles
+            ]
+        },
+        "visible_stars": [
+            {
+                "name": name,
+                "constellation": constellation,
+                "magnitude": magnitude,
+                "altitude_deg": alt,
+                "azimuth_deg": az,
+                "x_pos_m": x,
+                "y_pos_m": y
+            } for name, constellation, magnitude, alt, az, x, y in zip(
+                yantra_astro.star_labels(stars, "name"), yantra_astro.star_labels(stars, "constellation"),
+                np.round(stars["magnitude"].astype(np.float64), 2).tolist(),
+                np.round(altitude, 2).tolist(), np.round(azimuth, 2).tolist(),
+                np.round(star_x, 3).tolist(), np.round(star_y, 3).tolist())
+        ],
+        "astronomical_data": {
+            "days_since_J2000": round(days_since_J2000, 2),
+            "greenwich_mean_sidereal_time": round(float(GMST), 4),
+            "local_sidereal_time": round(float(LST), 4),
+            "precession_correction_deg": round(precession_correction, 4),
+            "equation_of_equinoxes_s": round(equation_of_equinoxes * 3600, 3),
+            "visible_circumpolar_stars": visible_circumpolar,
+            "visible_stars": len(stars),
+            "catalog_stars": len(catalog),
+            "max_magnitude": max_magnitude
+        }
+    }
 
-# ====== FIGURE SETUP ======
-fig, ax = plt.subplots(1, 1, figsize=(14, 14))
-
-# ====== DRAW DECLINATION CIRCLES ======
-declination_circles = create_declination_circles()
-for dec_circle in declination_circles:
-    circle = plt.Circle((0, 0), dec_circle["radius"], fill=False, 
-                       color=dec_circle["color"], linewidth=1, alpha=0.6)
-    ax.add_patch(circle)
-    
-    # Add declination labels
-    ax.text(dec_circle["radius"], 0, f"{dec_circle['declination']}°", 
-           ha='left', va='center', fontsize=8, color='gray')
-
-# ====== DRAW OUTER YANTRA BOUNDARY ======
-outer_boundary = plt.Circle((0, 0), yantra_radius, fill=False, 
-                           color='black', linewidth=4)
-ax.add_patch(outer_boundary)
-
-# Inner measurement circle
-inner_boundary = plt.Circle((0, 0), inner_circle_radius, fill=True, 
-                           color='darkblue', alpha=0.8)
-ax.add_patch(inner_boundary)
-
-# ====== DRAW HOUR ANGLE LINES ======
-hour_circles = create_hour_circles()
-for i, hour_line in enumerate(hour_circles):
-    x0, y0 = hour_line['start']
-    x1, y1 = hour_line['end']
-    
-    # Highlight current sidereal time
-    if abs(hour_line['hour'] - LST) < 0.5 or abs(hour_line['hour'] - LST - 24) < 0.5:
-        ax.plot([x0, x1], [y0, y1], color='red', linewidth=3, alpha=0.8)
+    # ====== FABRICATION OUTLINES ======
+    if tolerance_mm:
+        components = result["components"]
+        tolerance = yantra_astro.fabrication_tolerance(tolerance_mm)
+        result["chord_tolerance_mm"] = tolerance_mm
+        for name, radius in [("yantra", yantra_radius), ("inner_circle", inner_circle_radius)]:
+            components[name]["outline_m"] = yantra_astro.outline_json(yantra_astro.circle_points(radius, tolerance))
+        for entry in components["declination_circles"]:
+            entry["outline_m"] = yantra_astro.outline_json(yantra_astro.circle_points(entry["radius_m"], tolerance))
+    return result
+
+# ====== STAR TRAILS ======
+TWILIGHT_ALTITUDE_DEG = -12.0  # nautical twilight: the sun's altitude at dusk and dawn
+TRAIL_CHUNK_ELEMENTS = 250_000  # (time x star) positions evaluated per broadcast
+DEFAULT_TRAIL_RESOLUTION_M = 0.001
+DECLINATION_MARGIN_DEG = 1.0  # J2000 -> date precession, 1900-2100
+POLARIS_MATCH_DEG = 0.1  # a catalog star this close to Polaris' J2000 position is Polaris
+
+def night_window(latitude, longitude, date_str):
+    """
+    UT hours (from 0h of date_str) of dusk and of the following dawn.
+    Their difference is 24 during polar night and 0 when twilight lasts all night.
+    """
+    ephemeris = yantra_astro.solar_ephemeris(np.datetime64(date_str) + np.timedelta64(12, "h"))
+    H = yantra_astro.altitude_hour_angle(latitude, ephemeris["declination_deg"], TWILIGHT_ALTITUDE_DEG)
+    # Solar time -> UT: remove the longitude (from Greenwich) and the equation of time
+    correction = (yantra_astro.longitude_correction(longitude, 0) + ephemeris["equation_of_time_min"]) / 60
+    return float(12 + H / 15 - correction), float(36 - H / 15 - correction)
+
+def polaris_row(stars):
+    """Index of Polaris among catalog rows (matched by J2000 position), or None"""
+    if len(stars) == 0:
+        return None
+    polaris = yantra_astro.equatorial_vectors(polaris_ra_hours, polaris_dec_deg)
+    cosines = yantra_astro.equatorial_vectors(stars["ra_hours"], stars["dec_deg"]) @ polaris
+    index = int(np.argmax(cosines))
+    return index if cosines[index] >= np.cos(np.radians(POLARIS_MATCH_DEG)) else None
+
+def trail_runs(visible):
+    """(star, first sample, points) of every unbroken run of True in a (star, time) mask"""
+    edges = np.diff(np.pad(visible, ((0, 0), (1, 1))).astype(np.int8), axis=1)
+    star, first = np.nonzero(edges == 1)
+    _, stop = np.nonzero(edges == -1)
+    return star, first, stop - first
+
+def compute_dhruva_star_trails(latitude: float, longitude: float, scale_m: float, date_str: str,
+                               cadence_minutes: int = 1, max_magnitude: float = DEFAULT_MAX_MAGNITUDE,
+                               resolution_m: float = DEFAULT_TRAIL_RESOLUTION_M) -> dict:
+    """
+    Trails across the Dhruva-Protha-Chakra of every catalog star (and
+    Polaris) from dusk on date_str to the next dawn, sampled every
+    cadence_minutes. Positions for all samples and stars come from one
+    (time x star) broadcast, run in star chunks so memory stays bounded
+    for any catalog. Each star's trail is split where it sets and rises
+    again, and every piece is an encoded polyline of (x, y) in units of
+    resolution_m (see yantra_astro.polyline).
+    """
+    dusk, dawn = night_window(latitude, longitude, date_str)
+    offsets = np.arange(0, round((dawn - dusk) * 60) + 1, cadence_minutes) if dawn > dusk else np.arange(0)
+    start = np.datetime64(date_str, "s") + np.timedelta64(int(round(dusk * 3600)), "s")
+    timestamps = start + offsets.astype("timedelta64[m]")
+
+    # Sidereal time per sample; one precession/nutation frame serves the night
+    _, LST = yantra_astro.sidereal_time(timestamps, longitude)
+    frame, equation_of_equinoxes = yantra_astro.apparent_frame(date_str)
+    apparent_LST = (LST + equation_of_equinoxes) % 24
+
+    # Only stars that rise at this latitude, by declination band
+    catalog = star_catalog()
+    if latitude >= 0:
+        stars = catalog.declination_range(latitude - 90 - DECLINATION_MARGIN_DEG, 90, max_magnitude)
     else:
-        ax.plot([x0, x1], [y0, y1], color='darkblue', linewidth=1, alpha=0.6)
-    
-    # Add hour labels at outer edge
-    label_radius = yantra_radius * 1.05
-    label_x = label_radius * np.cos(np.radians(hour_line['angle_deg']))
-    label_y = label_radius * np.sin(np.radians(hour_line['angle_deg']))
-    
-    if i % 2 == 0:  # Show every other hour for clarity
-        ax.text(label_x, label_y, hour_line['label'], ha='center', va='center',
-               fontsize=9, fontweight='bold',
-               bbox=dict(boxstyle="round,pad=0.2", facecolor='lightblue', alpha=0.7))
-
-# ====== DRAW POLARIS POSITION ======
-ax.scatter(polaris_x, polaris_y, color='gold', s=300, marker='*', 
-          edgecolors='orange', linewidth=2, zorder=10, label='Polaris (Dhruva)')
-
-# Draw Polaris movement circle (due to precession)
-precession_radius = yantra_radius * 0.02  # Small circle showing precession
-precession_circle = plt.Circle((polaris_x, polaris_y), precession_radius, 
-                              fill=False, color='gold', linewidth=2, linestyle='--', alpha=0.7)
-ax.add_patch(precession_circle)
-
-# ====== DRAW CIRCUMPOLAR STARS ======
-constellation_colors = {
-    'UMa': '#FF6B6B',    # Ursa Major - Red
-    'Cas': '#4ECDC4',    # Cassiopeia - Teal  
-    'Dra': '#45B7D1',    # Draco - Blue
-    'Cep': '#96CEB4',    # Cepheus - Green
-}
-
-# Group stars by constellation for connecting lines
-constellations = {}
-for star in star_positions:
-    const = star['constellation']
-    if const not in constellations:
-        constellations[const] = []
-    constellations[const].append(star)
-
-# Draw constellation patterns
-constellation_patterns = {
-    'UMa': [(0,1), (1,2), (2,3), (3,4), (4,5), (5,6), (3,0)],  # Big Dipper
-    'Cas': [(0,1), (1,2), (2,3), (3,4)],  # W-shape
-    'Dra': [(0,1), (1,2)],  # Simplified dragon
-    'Cep': [(0,1)]  # Simplified
-}
-
-for const_name, stars in constellations.items():
-    if const_name in constellation_patterns and len(stars) > 1:
-        color = constellation_colors.get(const_name, 'white')
-        
-        # Draw constellation lines
-        pattern = constellation_patterns[const_name]
-        for connection in pattern:
-            if connection[0] < len(stars) and connection[1] < len(stars):
-                star1 = stars[connection[0]]
-                star2 = stars[connection[1]]
-                ax.plot([star1['x'], star2['x']], [star1['y'], star2['y']], 
-                       color=color, linewidth=1.5, alpha=0.6)
-
-# Draw individual stars
-for star in star_positions:
-    # Star size based on magnitude (brighter = larger, lower magnitude = brighter)
-    size = max(50, 200 - star['magnitude'] * 30)
-    color = constellation_colors.get(star['constellation'], 'white')
-    
-    ax.scatter(star['x'], star['y'], color=color, s=size, marker='o',
-              edgecolors='white', linewidth=1, alpha=0.8, zorder=8)
-    
-    # Add star names for brighter stars
-    if star['magnitude'] < 3.0:
-        ax.text(star['x'], star['y'] + yantra_radius * 0.03, star['name'],
-               ha='center', va='bottom', fontsize=7, color='white',
-               bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.7))
-
-# ====== CENTRAL POLE REPRESENTATION ======
-# The gnomon represents the celestial pole
-pole_x = 0
-pole_y = 0
-gnomon_tilt_x = central_pole_height * 0.1 * np.sin(np.radians(latitude))
-gnomon_tilt_y = central_pole_height * 0.1 * np.cos(np.radians(latitude))
-
-ax.plot([pole_x, gnomon_tilt_x], [pole_y, gnomon_tilt_y], 
-        color='darkblue', linewidth=8, label=f'Celestial Pole Axis (tilted {latitude:.1f}°)')
-
-# ====== CURRENT SIDEREAL TIME INDICATOR ======
-current_hour_angle = LST * 15 - 90  # Convert to degrees from north
-current_angle_rad = np.radians(current_hour_angle)
-indicator_radius = yantra_radius * 0.8
-
-indicator_x = indicator_radius * np.cos(current_angle_rad)
-indicator_y = indicator_radius * np.sin(current_angle_rad)
-
-ax.plot([0, indicator_x], [0, indicator_y], color='lime', linewidth=4,
-        label=f'Current LST: {LST:.2f}h ({int(LST):02d}:{int((LST%1)*60):02d})')
-
-# Add time indicator marker
-ax.scatter(indicator_x, indicator_y, color='lime', s=200, marker='D',
-          edgecolors='green', linewidth=2, zorder=9)
-
-# ====== DIRECTIONAL MARKERS ======
-directions = [('N', 90), ('E', 0), ('S', -90), ('W', 180)]
-for direction, angle in directions:
-    dir_radius = yantra_radius * 1.15
-    dir_x = dir_radius * np.cos(np.radians(angle))
-    dir_y = dir_radius * np.sin(np.radians(angle))
-    ax.text(dir_x, dir_y, direction, ha='center', va='center',
-           fontsize=14, fontweight='bold',
-           bbox=dict(boxstyle="circle,pad=0.3", facecolor='lightcyan', edgecolor='navy'))
-
-# ====== SEASONAL POLE STAR VARIATION ======
-# Show how pole star position varies slightly with season
-season_angles = np.linspace(0, 2*np.pi, 12)
-for i, angle in enumerate(season_angles):
-    seasonal_x = polaris_x + precession_radius * 0.3 * np.cos(angle)
-    seasonal_y = polaris_y + precession_radius * 0.3 * np.sin(angle)
-    ax.scatter(seasonal_x, seasonal_y, color='yellow', s=20, alpha=0.5, marker='.')
-
-# ====== FINAL STYLING ======
-ax.set_aspect('equal')
-ax.set_xlim(-yantra_radius*1.3, yantra_radius*1.3)
-ax.set_ylim(-yantra_radius*1.3, yantra_radius*1.3)
-ax.set_facecolor('black')
-
-plt.title(f"Dhruva-Protha-Chakra Yantra - Polar Star Tracker\n"
-          f"Location: {latitude:.2f}°N, {longitude:.2f}°E | {date_str} {time_str}\n"
-          f"LST: {LST:.3f}h | Polaris Alt: {polaris_altitude:.1f}° | "
-          f"Visible Stars: {len(star_positions)}", 
-          fontsize=14, pad=20, color='white')
-
-plt.xlabel("East-West (meters)", fontsize=12, color='white')
-plt.ylabel("North-South (meters)", fontsize=12, color='white')
-plt.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10,
-          facecolor='lightgray', edgecolor='black')
-
-# Make axes labels white for dark background
-ax.tick_params(colors='white')
-ax.xaxis.label.set_color('white')
-ax.yaxis.label.set_color('white')
-
-plt.grid(True, alpha=0.3, color='gray')
-plt.tight_layout()
-plt.show()
-
-# ====== JSON SAVE ======
-output = {
-    "yantra_type": "dhruva_protha_chakra",
-    "latitude": latitude,
-    "longitude": longitude, 
-    "scale_m": scale_m,
-    "observation_date": date_str,
-    "observation_time": time_str,
-    "local_sidereal_time_hours": round(LST, 4),
-    "polaris_data": {
-        "right_ascension_hours": polaris_ra_hours,
-        "declination_deg": round(current_polaris_dec, 3),
-        "altitude_deg": round(polaris_altitude, 2),
-        "azimuth_deg": round(polaris_azimuth, 2),
-        "hour_angle_hours": round(polaris_hour_angle, 3),
-        "position_x_m": round(polaris_x, 3),
-        "position_y_m": round(polaris_y, 3)
-    },
-    "components": {
-        "yantra": {"radius_m": yantra_radius},
-        "central_pole": {"height_m": central_pole_height, "tilt_deg": latitude},
-        "inner_circle": {"radius_m": inner_circle_radius},
-        "declination_circles": [
-            {"declination_deg": dc["declination"], "radius_m": dc["radius"]}
-            for dc in declination_circles
-        ],
-        "hour_angle_lines": [
+        stars = catalog.declination_range(-90, latitude + 90 + DECLINATION_MARGIN_DEG, max_magnitude)
+    # Polaris is always traced: as its catalog row, or as an extra last row
+    # when the catalog (or the magnitude limit) leaves it out
+    extra_polaris = polaris_row(stars) is None
+    ra, dec = stars["ra_hours"], stars["dec_deg"]
+    if extra_polaris:
+        ra, dec = np.append(ra, polaris_ra_hours), np.append(dec, polaris_dec_deg)
+    ra, dec = yantra_astro.rotate_equatorial(ra, dec, frame)
+
+    chunk = max(1, TRAIL_CHUNK_ELEMENTS // max(len(timestamps), 1))
+    runs, polylines = [], []
+    for lo in range(0, len(ra), chunk):
+        altitude, azimuth = yantra_astro.equatorial_to_horizontal(
+            ra[None, lo:lo + chunk], dec[None, lo:lo + chunk], apparent_LST[:, None], latitude)
+        visible = (altitude > 0).T
+        x, y = polar_projection(altitude.T[visible], azimuth.T[visible], scale_m)
+        star, first, points = trail_runs(visible)
+        runs.append(np.stack([lo + star, first, points], axis=1))
+        polylines += yantra_astro.encode_polylines(x, y, points, resolution_m)
+    runs = np.concatenate(runs) if runs else np.empty((0, 3), dtype=np.int64)
+
+    # Group the runs by star
+    names = yantra_astro.star_labels(stars, "name")
+    constellations = yantra_astro.star_labels(stars, "constellation")
+    magnitudes = np.round(stars["magnitude"].astype(np.float64), 2).tolist()
+    if extra_polaris:
+        names, constellations, magnitudes = names + ["Polaris"], constellations + ["UMi"], magnitudes + [2.0]
+    trails = {}
+    for (index, first, points), polyline in zip(runs.tolist(), polylines):
+        trails.setdefault(index, []).append(
+            {"start_sample": first, "points": points, "polyline": polyline})
+
+    return {
+        "yantra_type": "dhruva_protha_chakra_star_trails",
+        "latitude": latitude,
+        "longitude": longitude,
+        "scale_m": scale_m,
+        "observation_date": date_str,
+        "dusk_ut": str(timestamps[0])[:16] if len(timestamps) else None,
+        "dawn_ut": str(timestamps[-1])[:16] if len(timestamps) else None,
+        "twilight_altitude_deg": TWILIGHT_ALTITUDE_DEG,
+        "cadence_minutes": cadence_minutes,
+        "samples": len(timestamps),
+        "encoding": "polyline",
+        "resolution_m": resolution_m,
+        "max_magnitude": max_magnitude,
+        "catalog_stars": len(catalog),
+        "trails": [
             {
-                "hour": hc["hour"],
-                "sidereal_hour": round(hc["sidereal_hour"], 3),
-                "angle_deg": hc["angle_deg"]
-            } for hc in hour_circles
-        ]
-    },
-    "visible_stars": [
-        {
-            "name": star["name"],
-            "constellation": star["constellation"],
-            "magnitude": star["magnitude"],
-            "altitude_deg": round(star["altitude"], 2),
-            "azimuth_deg": round(star["azimuth"], 2),
-            "x_pos_m": round(star["x"], 3),
-            "y_pos_m": round(star["y"], 3)
-        } for star in star_positions
-    ],
-    "astronomical_data": {
-        "days_since_J2000": round(days_since_J2000, 2),
-        "greenwich_mean_sidereal_time": round(GMST, 4),
-        "local_sidereal_time": round(LST, 4),
-        "precession_correction_deg": round(precession_correction, 4),
-        "visible_circumpolar_stars": len(star_positions)
+                "name": names[index],
+                "constellation": constellations[index],
+                "magnitude": magnitudes[index],
+                "segments": segments,
+            } for index, segments in sorted(trails.items())
+        ],
     }
-}
-
-with open("dhruva_protha_chakra_yantra.json", "w") as f:
-    json.dump(output, f, indent=2)
 
-print(f"✅ Dhruva-Protha-Chakra Yantra generated!")
-print(f"⭐ Polaris Position: Alt {polaris_altitude:.1f}°, Az {polaris_azimuth:.1f}°")
-print(f"🕐 Local Sidereal Time: {LST:.3f}h ({int(LST):02d}:{int((LST%1)*60):02d})")
-print(f"🌌 Visible Circumpolar Stars: {len(star_positions)}")
-print(f"📊 JSON saved as dhruva_protha_chakra_yantra.json")
\ No newline at end of file
+def summarize_dhruva_yantra(result):
+    """Console summary of a computed Dhruva-Protha-Chakra Yantra"""
+    LST = result["local_sidereal_time_hours"]
+    polaris = result["polaris_data"]
+    return "\n".join([
+        f"✅ Dhruva-Protha-Chakra Yantra generated!",
+        f"⭐ Polaris Position: Alt {polaris['altitude_deg']:.1f}°, Az {polaris['azimuth_deg']:.1f}°",
+        f"🕐 Local Sidereal Time: {LST:.3f}h ({int(LST):02d}:{int((LST%1)*60):02d})",
+        f"🌌 Visible Circumpolar Stars: {result['astronomical_data']['visible_circumpolar_stars']}"
+        f" (of {result['astronomical_data']['visible_stars']} visible stars)",
+    ])
+
+# ====== FIGURE ======
+def draw_dhruva_yantra(ax, result):
+    """Draw a computed Dhruva-Protha-Chakra Yantra onto a matplotlib Axes"""
+    from matplotlib.patches import Circle
+
+    latitude = result["latitude"]
+    longitude = result["longitude"]
+    components = result["components"]
+    yantra_radius = components["yantra"]["radius_m"]
+    central_pole_height = components["central_pole"]["height_m"]
+    inner_circle_radius = components["inner_circle"]["radius_m"]
+    LST = result["local_sidereal_time_hours"]
+    polaris_x = result["polaris_data"]["position_x_m"]
+    polaris_y = result["polaris_data"]["position_y_m"]
+    star_positions = result["visible_stars"]
+
+    # ====== DRAW DECLINATION CIRCLES ======
+    for dec_circle in create_declination_circles(yantra_radius):
+        circle = Circle((0, 0), dec_circle["radius"], fill=False,
+                        color=dec_circle["color"], linewidth=1, alpha=0.6)
+        ax.add_patch(circle)
+
+        # Add declination labels
+        ax.text(dec_circle["radius"], 0, f"{dec_circle['declination']}°",
+               ha='left', va='center', fontsize=8, color='gray')
+
+    # ====== DRAW OUTER YANTRA BOUNDARY ======
+    outer_boundary = Circle((0, 0), yantra_radius, fill=False,
+                            color='black', linewidth=4)
+    ax.add_patch(outer_boundary)
+
+    # Inner measurement circle
+    inner_boundary = Circle((0, 0), inner_circle_radius, fill=True,
+                            color='darkblue', alpha=0.8)
+    ax.add_patch(inner_boundary)
+
+    # ====== DRAW HOUR ANGLE LINES ======
+    for i, hour_line in enumerate(create_hour_circles(yantra_radius)):
+        x0, y0 = hour_line['start']
+        x1, y1 = hour_line['end']
+
+        # Highlight current sidereal time
+        if abs(hour_line['hour'] - LST) < 0.5 or abs(hour_line['hour'] - LST - 24) < 0.5:
+            ax.plot([x0, x1], [y0, y1], color='red', linewidth=3, alpha=0.8)
+        else:
+            ax.plot([x0, x1], [y0, y1], color='darkblue', linewidth=1, alpha=0.6)
+
+        # Add hour labels at outer edge
+        label_radius = yantra_radius * 1.05
+        label_x = label_radius * np.cos(np.radians(hour_line['angle_deg']))
+        label_y = label_radius * np.sin(np.radians(hour_line['angle_deg']))
+
+        if i % 2 == 0:  # Show every other hour for clarity
+            ax.text(label_x, label_y, hour_line['label'], ha='center', va='center',
+                   fontsize=9, fontweight='bold',
+                   bbox=dict(boxstyle="round,pad=0.2", facecolor='lightblue', alpha=0.7))
+
+    # ====== DRAW POLARIS POSITION ======
+    ax.scatter(polaris_x, polaris_y, color='gold', s=300, marker='*',
+              edgecolors='orange', linewidth=2, zorder=10, label='Polaris (Dhruva)')
+
+    # Draw Polaris movement circle (due to precession)
+    precession_radius = yantra_radius * 0.02  # Small circle showing precession
+    precession_circle = Circle((polaris_x, polaris_y), precession_radius,
+                               fill=False, color='gold', linewidth=2, linestyle='--', alpha=0.7)
+    ax.add_patch(precession_circle)
+
+    # ====== DRAW CIRCUMPOLAR STARS ======
+    # Group stars by constellation for connecting lines
+    constellations = {}
+    for star in star_positions:
+        const = star['constellation']
+        if star['name'] not in pattern_star_names:
+            continue
+        if const not in constellations:
+            constellations[const] = []
+        constellations[const].append(star)
+
+    for const_name, stars in constellations.items():
+        if const_name in constellation_patterns and len(stars) > 1:
+            color = constellation_colors.get(const_name, 'white')
+
+            # Draw constellation lines
+            pattern = constellation_patterns[const_name]
+            for connection in pattern:
+                if connection[0] < len(stars) and connection[1] < len(stars):
+                    star1 = stars[connection[0]]
+                    star2 = stars[connection[1]]
+                    ax.plot([star1['x_pos_m'], star2['x_pos_m']], [star1['y_pos_m'], star2['y_pos_m']],
+                           color=color, linewidth=1.5, alpha=0.6)
+
+    # Draw all stars in one scatter; size based on magnitude (brighter = larger)
+    if star_positions:
+        magnitudes = np.array([star['magnitude'] for star in star_positions])
+        sizes = np.maximum(50, 200 - magnitudes * 30)
+        colors = [constellation_colors.get(star['constellation'], 'white') for star in star_positions]
+        ax.scatter([star['x_pos_m'] for star in star_positions], [star['y_pos_m'] for star in star_positions],
+                   color=colors, s=sizes, marker='o', edgecolors='white', linewidth=1, alpha=0.8, zorder=8)
+
+    # Add star names for the brightest stars
+    named = [star for star in star_positions if star['magnitude'] < 3.0 and star['name']]
+    for star in sorted(named, key=lambda star: star['magnitude'])[:MAX_STAR_LABELS]:
+            ax.text(star['x_pos_m'], star['y_pos_m'] + yantra_radius * 0.03, star['name'],
+                   ha='center', va='bottom', fontsize=7, color='white',
+                   bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.7))
+
+    # ====== CENTRAL POLE REPRESENTATION ======
+    # The gnomon represents the celestial pole
+    pole_x = 0
+    pole_y = 0
+    gnomon_tilt_x = central_pole_height * 0.1 * np.sin(np.radians(latitude))
+    gnomon_tilt_y = central_pole_height * 0.1 * np.cos(np.radians(latitude))
+
+    ax.plot([pole_x, gnomon_tilt_x], [pole_y, gnomon_tilt_y],
+            color='darkblue', linewidth=8, label=f'Celestial Pole Axis (tilted {latitude:.1f}°)')
+
+    # ====== CURRENT SIDEREAL TIME INDICATOR ======
+    current_hour_angle = LST * 15 - 90  # Convert to degrees from north
+    current_angle_rad = np.radians(current_hour_angle)
+    indicator_radius = yantra_radius * 0.8
+
+    indicator_x = indicator_radius * np.cos(current_angle_rad)
+    indicator_y = indicator_radius * np.sin(current_angle_rad)
+
+    ax.plot([0, indicator_x], [0, indicator_y], color='lime', linewidth=4,
+            label=f'Current LST: {LST:.2f}h ({int(LST):02d}:{int((LST%1)*60):02d})')
+
+    # Add time indicator marker
+    ax.scatter(indicator_x, indicator_y, color='lime', s=200, marker='D',
+              edgecolors='green', linewidth=2, zorder=9)
+
+    # ====== DIRECTIONAL MARKERS ======
+    directions = [('N', 90), ('E', 0), ('S', -90), ('W', 180)]
+    for direction, angle in directions:
+        dir_radius = yantra_radius * 1.15
+        dir_x = dir_radius * np.cos(np.radians(angle))
+        dir_y = dir_radius * np.sin(np.radians(angle))
+        ax.text(dir_x, dir_y, direction, ha='center', va='center',
+               fontsize=14, fontweight='bold',
+               bbox=dict(boxstyle="circle,pad=0.3", facecolor='lightcyan', edgecolor='navy'))
+
+    # ====== SEASONAL POLE STAR VARIATION ======
+    # Show how pole star position varies slightly with season
+    season_angles = np.linspace(0, 2*np.pi, 12)
+    for i, angle in enumerate(season_angles):
+        seasonal_x = polaris_x + precession_radius * 0.3 * np.cos(angle)
+        seasonal_y = polaris_y + precession_radius * 0.3 * np.sin(angle)
+        ax.scatter(seasonal_x, seasonal_y, color='yellow', s=20, alpha=0.5, marker='.')
+
+    # ====== FINAL STYLING ======
+    ax.set_aspect('equal')
+    ax.set_xlim(-yantra_radius*1.3, yantra_radius*1.3)
+    ax.set_ylim(-yantra_radius*1.3, yantra_radius*1.3)
+    ax.set_facecolor('black')
+
+    ax.set_title(f"Dhruva-Protha-Chakra Yantra - Polar Star Tracker\n"
+                 f"Location: {latitude:.2f}°N, {longitude:.2f}°E | "
+                 f"{result['observation_date']} {result['observation_time']}\n"
+                 f"LST: {LST:.3f}h | Polaris Alt: {result['polaris_data']['altitude_deg']:.1f}° | "
+                 f"Visible Stars: {len(star_positions)}",
+                 fontsize=14, pad=20, color='white')
+
+    ax.set_xlabel("East-West (meters)", fontsize=12, color='white')
+    ax.set_ylabel("North-South (meters)", fontsize=12, color='white')
+    ax.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10,
+              facecolor='lightgray', edgecolor='black')
+
+    # Make axes labels white for dark background
+    ax.tick_params(colors='white')
+    ax.xaxis.label.set_color('white')
+    ax.yaxis.label.set_color('white')
+
+    ax.grid(True, alpha=0.3, color='gray')
+    ax.figure.tight_layout()
+
+# ====== SCRIPT MODE ======
+def main():
+    import matplotlib.pyplot as plt
+
+    latitude = float(input("Enter Latitude (e.g., 28.6139): "))
+    longitude = float(input("Enter Longitude (e.g., 77.2090): "))
+    scale_m = float(input("Enter scale (meters, e.g., 4.0): "))
+    date_str = input("Enter date (YYYY-MM-DD): ")
+    time_str = input("Enter time (HH:MM, 24hr format): ")
+
+    output = compute_dhruva_yantra(latitude, longitude, scale_m, date_str, time_str)
+
+    fig, ax = plt.subplots(1, 1, figsize=FIGURE_SIZE)
+    draw_dhruva_yantra(ax, output)
+    plt.show()
+
+    with open("dhruva_protha_chakra_yantra.json", "w") as f:
+        json.dump(output, f, indent=2)
+
+    print(summarize_dhruva_yantra(output))
+    print(f"📊 JSON saved as dhruva_protha_chakra_yantra.json")
+
+if __name__ == "__main__":
+    main()
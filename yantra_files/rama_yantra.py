@@ -1,59 +1,11 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import yantra_astro
 import json
 from datetime import datetime, timedelta
 
-# ====== INPUT ======
-latitude = float(input("Enter Latitude (e.g., 28.6139): "))
-longitude = float(input("Enter Longitude (e.g., 77.2090): "))
-scale_m = float(input("Enter scale (meters, e.g., 3.0): "))
-date_str = input("Enter date (YYYY-MM-DD): ")
-time_str = input("Enter time (HH:MM, 24hr format): ")
-
-# ====== DATE AND TIME HANDLING ======
-date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-time_obj = datetime.strptime(time_str, "%H:%M")
-datetime_obj = datetime.combine(date_obj.date(), time_obj.time())
-day_of_year = date_obj.timetuple().tm_yday
-hour_decimal = time_obj.hour + time_obj.minute / 60.0
-
-# ====== SOLAR CALCULATIONS ======
-standard_meridian = 82.5  # IST
-
-# Equation of Time
-B = 2 * np.pi * (day_of_year - 1) / 365
-EoT = 229.18 * (
-    0.000075 + 0.001868*np.cos(B) - 0.032077*np.sin(B)
-    - 0.014615*np.cos(2*B) - 0.040849*np.sin(2*B)
-)
-
-# Longitude correction
-longitude_correction = 4 * (longitude - standard_meridian)
-
-# Solar declination
-declination = 23.45 * np.sin(np.radians(360 * (284 + day_of_year)/365))
-
-# Solar hour angle
-solar_time = hour_decimal + (longitude_correction + EoT) / 60
-hour_angle = 15 * (solar_time - 12)
-
-# Solar altitude and azimuth
-lat_rad = np.radians(latitude)
-dec_rad = np.radians(declination)
-ha_rad = np.radians(hour_angle)
-
-sin_alt = np.sin(dec_rad) * np.sin(lat_rad) + np.cos(dec_rad) * np.cos(lat_rad) * np.cos(ha_rad)
-solar_altitude = np.degrees(np.arcsin(np.clip(sin_alt, -1, 1)))
-
-cos_az = (np.sin(dec_rad) - np.sin(lat_rad) * sin_alt) / (np.cos(lat_rad) * np.cos(np.radians(solar_altitude)))
-solar_azimuth = np.degrees(np.arccos(np.clip(cos_az, -1, 1)))
-if np.sin(ha_rad) > 0:
-    solar_azimuth = 360 - solar_azimuth
-
-# ====== YAMA YANTRA PARAMETERS ======
-yantra_radius = scale_m
-central_pillar_height = scale_m * 1.5
-base_thickness = scale_m * 0.1
+# ====== CONSTANTS ======
+standard_meridian = yantra_astro.STANDARD_MERIDIAN  # IST
+FIGURE_SIZE = (16, 16)
 
 # The Yama Yantra has graduated scales for measuring altitude
 max_altitude = 90  # degrees
@@ -76,380 +28,565 @@ celestial_bodies = [
     {"name": "Aldebaran", "ra": 4.599, "dec": 16.509, "mag": 0.85, "type": "star"},
 ]
 
-# ====== SIDEREAL TIME FOR STAR POSITIONS ======
-# Greenwich Sidereal Time calculation
-J2000_epoch = datetime(2000, 1, 1, 12, 0, 0)
-days_since_J2000 = (datetime_obj - J2000_epoch).total_seconds() / 86400.0
-GMST0 = 18.697374558 + 24.06570982441908 * days_since_J2000
-GMST0 = GMST0 % 24
-GMST = (GMST0 + 1.00273790935 * hour_decimal) % 24
-LST = (GMST + longitude / 15.0) % 24
-
-# ====== COORDINATE TRANSFORMATION ======
-def celestial_to_altaz(ra_hours, dec_deg, lst_hours, lat_deg):
-    """Convert celestial coordinates to altitude-azimuth"""
-    ha = (lst_hours - ra_hours) * 15
-    ha_rad = np.radians(ha)
-    dec_rad = np.radians(dec_deg)
-    lat_rad = np.radians(lat_deg)
-    
-    sin_alt = np.sin(dec_rad) * np.sin(lat_rad) + np.cos(dec_rad) * np.cos(lat_rad) * np.cos(ha_rad)
-    altitude = np.degrees(np.arcsin(np.clip(sin_alt, -1, 1)))
-    
-    cos_az = (np.sin(dec_rad) - np.sin(lat_rad) * sin_alt) / (np.cos(lat_rad) * np.cos(np.radians(altitude)))
-    azimuth = np.degrees(np.arccos(np.clip(cos_az, -1, 1)))
-    
-    if np.sin(ha_rad) > 0:
-        azimuth = 360 - azimuth
-    
-    return altitude, azimuth
-
-# ====== CALCULATE POSITIONS OF CELESTIAL BODIES ======
-visible_bodies = []
-for body in celestial_bodies:
-    alt, az = celestial_to_altaz(body["ra"], body["dec"], LST, latitude)
-    
-    if alt > 0:  # Above horizon
-        visible_bodies.append({
-            "name": body["name"],
-            "type": body["type"],
-            "magnitude": body["mag"],
-            "altitude": alt,
-            "azimuth": az,
-            "ra": body["ra"],
-            "dec": body["dec"]
-        })
+# Indexed by declination band, so only bodies that can be up are transformed
+body_catalog = yantra_astro.star_catalog_from_records(celestial_bodies)
+
+# ====== STRUCTURED ARRAY LAYOUTS ======
+SCALE_DTYPE = np.dtype([
+    ("altitude_deg", "<i4"),
+    ("radius_m", "<f8"),
+    ("major", "?"),
+])
+# A position on the yantra face, for stars, planets and the sun
+PROJECTED_DTYPE = np.dtype([
+    ("altitude_deg", "<f8"),
+    ("azimuth_deg", "<f8"),
+    ("x_m", "<f8"),
+    ("y_m", "<f8"),
+])
+SUN_PATH_DTYPE = np.dtype(PROJECTED_DTYPE.descr + [("solar_time_hours", "<f8")])
 
 # ====== YAMA YANTRA GEOMETRY ======
-def create_altitude_scale():
-    """Create the graduated altitude measurement scale"""
-    scale_points = []
-    
-    # Main altitude divisions (every 10 degrees)
-    for alt in altitude_divisions:
-        # Distance from center proportional to (90 - altitude)
-        radius = yantra_radius * (90 - alt) / 90
-        scale_points.append({
-            "altitude": alt,
-            "radius": radius,
-            "type": "major",
-            "label": f"{alt}°"
-        })
-    
-    # Fine divisions (every 5 degrees)  
-    for alt in fine_divisions:
-        if alt not in altitude_divisions:
-            radius = yantra_radius * (90 - alt) / 90
-            scale_points.append({
-                "altitude": alt,
-                "radius": radius,
-                "type": "minor",
-                "label": f"{alt}°"
-            })
-    
-    return scale_points
-
-def create_azimuth_divisions():
+def create_altitude_scale(yantra_radius):
+    """
+    The graduated altitude scale as SCALE_DTYPE rows: every 10° division
+    (major), then the 5° divisions between them (minor)
+    """
+    minor_divisions = np.setdiff1d(fine_divisions, altitude_divisions)
+    altitudes = np.concatenate([altitude_divisions, minor_divisions])
+    scale = np.empty(altitudes.size, dtype=SCALE_DTYPE)
+    scale["altitude_deg"] = altitudes
+    # Distance from center proportional to (90 - altitude)
+    scale["radius_m"] = yantra_radius * (90 - altitudes) / 90
+    scale["major"] = np.arange(altitudes.size) < altitude_divisions.size
+    return scale
+
+def create_azimuth_divisions(yantra_radius):
     """Create azimuth angle divisions"""
     azimuth_lines = []
-    
+
     # 16 main directions (every 22.5 degrees)
     directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
                  'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
-    
+
     for i, direction in enumerate(directions):
         angle = i * 22.5
         angle_rad = np.radians(angle - 90)  # Convert to math convention
-        
+
         x_end = yantra_radius * np.cos(angle_rad)
         y_end = yantra_radius * np.sin(angle_rad)
-        
+
         azimuth_lines.append({
             "direction": direction,
             "angle": angle,
             "start": [0, 0],
             "end": [x_end, y_end]
         })
-    
+
     return azimuth_lines
 
 # ====== RAMA YANTRA MEASUREMENT FUNCTIONS ======
-def project_celestial_body(altitude, azimuth):
+def project_celestial_body(altitude, azimuth, yantra_radius):
     """Project celestial body onto Yama Yantra surface"""
     # Radius based on altitude (90° at center, 0° at edge)
     r = yantra_radius * (90 - altitude) / 90
-    
+
     # Convert azimuth to mathematical angle
     theta = np.radians(azimuth - 90)
-    
+
     x = r * np.cos(theta)
     y = r * np.sin(theta)
-    
+
     return x, y
 
-def create_seasonal_sun_paths():
-    """Create sun paths for different seasons"""
+def project_positions(altitude, azimuth, yantra_radius):
+    """PROJECTED_DTYPE array (broadcast shape of the inputs) of positions on the yantra face"""
+    altitude, azimuth = np.broadcast_arrays(altitude, azimuth)
+    positions = np.empty(altitude.shape, dtype=PROJECTED_DTYPE)
+    positions["altitude_deg"], positions["azimuth_deg"] = altitude, azimuth
+    positions["x_m"], positions["y_m"] = project_celestial_body(altitude, azimuth, yantra_radius)
+    return positions
+
+def sun_path_kernel(latitude, declination_deg, solar_time_hours, yantra_radius):
+    """
+    SUN_PATH_DTYPE array of the sun's position for declinations and true
+    solar times broadcast against each other, e.g. (season, 1) x (1, t).
+    Samples below the horizon are included; mask on altitude_deg > 0.
+    """
+    declination_deg, solar_time_hours = np.broadcast_arrays(declination_deg, solar_time_hours)
+    altitude, azimuth = yantra_astro.hour_angle_to_horizontal(
+        yantra_astro.solar_hour_angle(solar_time_hours), declination_deg, latitude)
+    path = np.empty(altitude.shape, dtype=SUN_PATH_DTYPE)
+    projected = project_positions(altitude, azimuth, yantra_radius)
+    for name in PROJECTED_DTYPE.names:
+        path[name] = projected[name]
+    path["solar_time_hours"] = solar_time_hours
+    return path
+
+def create_seasonal_sun_paths(latitude, yantra_radius):
+    """Sun paths for the solstices and equinoxes, 6 AM to 6 PM, from one (season x t) kernel call"""
     seasons = [
         {"name": "Summer Solstice", "declination": 23.45, "color": "#FF6B6B", "day": 172},
         {"name": "Spring Equinox", "declination": 0, "color": "#4ECDC4", "day": 80},
         {"name": "Winter Solstice", "declination": -23.45, "color": "#45B7D1", "day": 355},
         {"name": "Autumn Equinox", "declination": 0, "color": "#96CEB4", "day": 266}
     ]
-    
+    declinations = np.array([season["declination"] for season in seasons])
+    times = np.linspace(6, 18, 50)  # 6 AM to 6 PM
+    paths = sun_path_kernel(latitude, declinations[:, None], times[None, :], yantra_radius)
+
     sun_paths = []
-    for season in seasons:
-        path_points = []
-        times = np.linspace(6, 18, 50)  # 6 AM to 6 PM
-        
-        for t in times:
-            # Calculate sun position for this time
-            ha = 15 * (t - 12)
-            ha_rad = np.radians(ha)
-            dec_rad = np.radians(season["declination"])
-            
-            sin_alt = np.sin(dec_rad) * np.sin(lat_rad) + np.cos(dec_rad) * np.cos(lat_rad) * np.cos(ha_rad)
-            alt = np.degrees(np.arcsin(np.clip(sin_alt, -1, 1)))
-            
-            if alt > 0:  # Above horizon
-                cos_az = (np.sin(dec_rad) - np.sin(lat_rad) * sin_alt) / (np.cos(lat_rad) * np.cos(np.radians(alt)))
-                az = np.degrees(np.arccos(np.clip(cos_az, -1, 1)))
-                if ha > 0:
-                    az = 360 - az
-                
-                x, y = project_celestial_body(alt, az)
-                path_points.append([x, y, alt, az, t])
-        
-        if path_points:
+    for season, path in zip(seasons, paths):
+        points = path[path["altitude_deg"] > 0]  # Above horizon
+        if points.size:
             sun_paths.append({
                 "season": season["name"],
                 "color": season["color"],
-                "points": path_points,
+                "points": points,
                 "declination": season["declination"]
             })
-    
+
     return sun_paths
 
-# ====== FIGURE SETUP ======
-fig, ax = plt.subplots(1, 1, figsize=(16, 16))
-
-# ====== DRAW ALTITUDE SCALE CIRCLES ======
-altitude_scale = create_altitude_scale()
-for scale_point in altitude_scale:
-    if scale_point["type"] == "major":
-        circle = plt.Circle((0, 0), scale_point["radius"], fill=False,
-                          color='black', linewidth=2, alpha=0.7)
-        ax.add_patch(circle)
-        
-        # Add altitude labels
-        ax.text(scale_point["radius"] + 0.1, 0, scale_point["label"],
-               ha='left', va='center', fontsize=10, fontweight='bold')
-    else:
-        circle = plt.Circle((0, 0), scale_point["radius"], fill=False,
-                          color='gray', linewidth=1, alpha=0.5)
-        ax.add_patch(circle)
-
-# ====== DRAW OUTER YANTRA BOUNDARY ======
-outer_boundary = plt.Circle((0, 0), yantra_radius, fill=False,
-                          color='saddlebrown', linewidth=4)
-ax.add_patch(outer_boundary)
-
-# Central pillar base
-central_base = plt.Circle((0, 0), yantra_radius * 0.02, fill=True,
-                        color='#5C4033', alpha=0.8)
-ax.add_patch(central_base)
-
-# ====== DRAW AZIMUTH DIRECTION LINES ======
-azimuth_divisions = create_azimuth_divisions()
-for az_line in azimuth_divisions:
-    x0, y0 = az_line['start']
-    x1, y1 = az_line['end']
-    
-    # Main cardinal directions in bold
-    if az_line['direction'] in ['N', 'E', 'S', 'W']:
-        ax.plot([x0, x1], [y0, y1], color='darkblue', linewidth=2.5, alpha=0.8)
-    else:
-        ax.plot([x0, x1], [y0, y1], color='blue', linewidth=1, alpha=0.6)
-    
-    # Direction labels
-    label_radius = yantra_radius * 1.08
-    label_x = label_radius * np.cos(np.radians(az_line['angle'] - 90))
-    label_y = label_radius * np.sin(np.radians(az_line['angle'] - 90))
-    
-    ax.text(label_x, label_y, az_line['direction'], ha='center', va='center',
-           fontsize=11, fontweight='bold',
-           bbox=dict(boxstyle="round,pad=0.3", facecolor='lightcyan', alpha=0.8))
-
-# ====== DRAW SEASONAL SUN PATHS ======
-sun_paths = create_seasonal_sun_paths()
-for path in sun_paths:
-    if len(path["points"]) > 1:
-        points = np.array(path["points"])
-        ax.plot(points[:, 0], points[:, 1], color=path["color"],
-               linewidth=3, alpha=0.7, label=f'{path["season"]} (δ={path["declination"]:.1f}°)')
-        
-        # Mark noon position (highest point)
-        if len(points) > 0:
-            noon_idx = len(points) // 2
-            noon_point = points[noon_idx]
-            ax.scatter(noon_point[0], noon_point[1], color=path["color"],
-                     s=150, marker='o', edgecolors='black', linewidth=2, zorder=8)
-            
-            # Time labels at key points
-            for i in [0, noon_idx, -1]:
-                if i < len(points):
-                    point = points[i]
-                    time_label = f"{int(point[4]):02d}:00"
-                    ax.text(point[0], point[1] + yantra_radius * 0.03, time_label,
-                           ha='center', va='bottom', fontsize=8, color=path["color"],
-                           bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
-
-# ====== DRAW CURRENT SUN POSITION ======
-if solar_altitude > 0:
-    sun_x, sun_y = project_celestial_body(solar_altitude, solar_azimuth)
-    ax.scatter(sun_x, sun_y, color='gold', s=400, marker='*',
-              edgecolors='orange', linewidth=3, zorder=10, label='Current Sun Position')
-    
-    # Sun altitude and azimuth labels
-    ax.text(sun_x, sun_y + yantra_radius * 0.05,
-           f'☀️ Alt: {solar_altitude:.1f}°\nAz: {solar_azimuth:.1f}°',
-           ha='center', va='bottom', fontsize=10, fontweight='bold',
-           bbox=dict(boxstyle="round,pad=0.3", facecolor='yellow', alpha=0.9))
-
-# ====== DRAW VISIBLE STARS ======
-star_colors = {'star': 'white', 'planet': 'yellow'}
-for body in visible_bodies:
-    x, y = project_celestial_body(body["altitude"], body["azimuth"])
-    
-    # Star size based on magnitude (brighter = larger)
-    size = max(30, 150 - body["magnitude"] * 40)
-    color = star_colors.get(body["type"], 'white')
-    
-    ax.scatter(x, y, color=color, s=size, marker='*' if body["type"] == 'star' else 'o',
-              edgecolors='lightgray', linewidth=1, alpha=0.9, zorder=7)
-    
-    # Star labels for bright objects
-    if body["magnitude"] < 1.0:
-        ax.text(x, y + yantra_radius * 0.03, body["name"],
-               ha='center', va='bottom', fontsize=8, color='white',
-               bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.7))
-
-# ====== MEASUREMENT CROSSHAIRS ======
-# Add measuring crosshairs at center for precise alignment
-crosshair_size = yantra_radius * 0.05
-ax.plot([-crosshair_size, crosshair_size], [0, 0], color='red', linewidth=2)
-ax.plot([0, 0], [-crosshair_size, crosshair_size], color='red', linewidth=2)
-
-# ====== CENTRAL PILLAR REPRESENTATION ======
-# Vertical pillar for sighting
-pillar_x = [0, 0]
-pillar_y = [0, central_pillar_height * 0.1]  # Projected height
-ax.plot(pillar_x, pillar_y, color='#654321', linewidth=8,
-        label=f'Central Pillar ({central_pillar_height:.1f}m)')
-
-# Pillar shadow
-if solar_altitude > 0:
-    shadow_length = central_pillar_height / np.tan(np.radians(solar_altitude))
-    shadow_direction = np.radians(solar_azimuth - 90)
-    shadow_x = shadow_length * 0.1 * np.cos(shadow_direction)
-    shadow_y = shadow_length * 0.1 * np.sin(shadow_direction)
-    ax.plot([0, shadow_x], [0, shadow_y], color='gray', linewidth=4,
-           alpha=0.6, linestyle=':', label='Pillar Shadow')
-
-# ====== ALTITUDE MEASUREMENT ARCS ======
-# Show measurement arcs for current observations
-measurement_altitudes = [30, 45, 60]
-for alt in measurement_altitudes:
-    if any(abs(body["altitude"] - alt) < 5 for body in visible_bodies if body["altitude"] > 0):
-        radius = yantra_radius * (90 - alt) / 90
-        circle = plt.Circle((0, 0), radius, fill=False,
-                          color='red', linewidth=3, linestyle='--', alpha=0.8)
-        ax.add_patch(circle)
-
-# ====== FINAL STYLING ======
-ax.set_aspect('equal')
-ax.set_xlim(-yantra_radius*1.2, yantra_radius*1.2)
-ax.set_ylim(-yantra_radius*1.2, yantra_radius*1.2)
-
-plt.title(f"Yama Yantra - Altitude Measurement Instrument\n"
-          f"Location: {latitude:.2f}°N, {longitude:.2f}°E | {date_str} {time_str}\n"
-          f"Sun: Alt {solar_altitude:.1f}°, Az {solar_azimuth:.1f}° | "
-          f"Visible Objects: {len(visible_bodies) + (1 if solar_altitude > 0 else 0)}", 
-          fontsize=14, pad=20)
-
-plt.xlabel("East-West (meters)", fontsize=12)
-plt.ylabel("North-South (meters)", fontsize=12)
-plt.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
-
-# ====== JSON SAVE ======
-output = {
-    "yantra_type": "yama",
-    "latitude": latitude,
-    "longitude": longitude,
-    "scale_m": scale_m,
-    "observation_date": date_str,
-    "observation_time": time_str,
-    "local_sidereal_time": round(LST, 4),
-    "solar_data": {
-        "altitude_deg": round(solar_altitude, 2),
-        "azimuth_deg": round(solar_azimuth, 2),
-        "declination_deg": round(declination, 2),
-        "hour_angle_deg": round(hour_angle, 2),
-        "equation_of_time_min": round(EoT, 2)
-    },
-    "components": {
-        "yantra": {"radius_m": yantra_radius},
-        "central_pillar": {"height_m": central_pillar_height},
-        "base_thickness": {"thickness_m": base_thickness},
-        "altitude_scale": [
+# ====== CALCULATION ======
+def compute_rama_yantra(latitude: float, longitude: float, scale_m: float,
+                        date_str: str, time_str: str, tolerance_mm: float = None) -> dict:
+    """
+    Compute Rama (Yama) Yantra scales, sun position and visible bodies.
+    With tolerance_mm, the boundary and altitude circles also carry
+    fabrication outlines (outline_m) within that chord error.
+    Returns the JSON-serialisable yantra description.
+    """
+    # ====== DATE AND TIME HANDLING ======
+    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    time_obj = datetime.strptime(time_str, "%H:%M")
+    datetime_obj = datetime.combine(date_obj.date(), time_obj.time())
+    hour_decimal = time_obj.hour + time_obj.minute / 60.0
+
+    # ====== SOLAR CALCULATIONS ======
+    # Equation of Time, declination, hour angle and solar altitude/azimuth
+    sun = yantra_astro.solar_position(date_str, hour_decimal, latitude, longitude, standard_meridian)
+    EoT = sun["equation_of_time_min"]
+    declination = sun["declination_deg"]
+    hour_angle = sun["hour_angle_deg"]
+    solar_altitude = sun["altitude_deg"]
+    solar_azimuth = sun["azimuth_deg"]
+
+    # ====== YAMA YANTRA PARAMETERS ======
+    yantra_radius = scale_m
+    central_pillar_height = scale_m * 1.5
+    base_thickness = scale_m * 0.1
+
+    # ====== SIDEREAL TIME FOR STAR POSITIONS ======
+    # Greenwich and Local Sidereal Time (hours)
+    GMST, LST = yantra_astro.sidereal_time(np.datetime64(datetime_obj), longitude)
+
+    # ====== CALCULATE POSITIONS OF CELESTIAL BODIES ======
+    # Catalog positions are J2000: precess them to the date (one matrix
+    # product) and use apparent sidereal time to match
+    frame, equation_of_equinoxes = yantra_astro.apparent_frame(date_str)
+    apparent_LST = (LST + equation_of_equinoxes) % 24
+    zenith_ra, zenith_dec = yantra_astro.catalog_frame_zenith(apparent_LST, latitude, frame)
+    candidates = body_catalog.above_horizon_candidates(zenith_ra, zenith_dec)
+    body_ra, body_dec = yantra_astro.rotate_equatorial(candidates["ra_hours"], candidates["dec_deg"], frame)
+    body_altitude, body_azimuth = yantra_astro.equatorial_to_horizontal(body_ra, body_dec, apparent_LST, latitude)
+
+    # Visible bodies projected onto the yantra face together
+    visible = body_altitude > 0  # Above horizon
+    visible_positions = project_positions(body_altitude[visible], body_azimuth[visible], yantra_radius)
+    visible_bodies = [
+        {
+            "name": body["name"],
+            "type": body["type"],
+            "magnitude": body["mag"],
+            "altitude": position["altitude_deg"],
+            "azimuth": position["azimuth_deg"],
+            "x": position["x_m"],
+            "y": position["y_m"],
+            "ra": ra,
+            "dec": dec
+        } for body, position, ra, dec in zip(
+            [celestial_bodies[number] for number in candidates["number"][visible].tolist()],
+            visible_positions, body_ra[visible], body_dec[visible])
+    ]
+
+    altitude_scale = create_altitude_scale(yantra_radius)
+    azimuth_divisions = create_azimuth_divisions(yantra_radius)
+    sun_paths = create_seasonal_sun_paths(latitude, yantra_radius)
+    sun_visible = bool(solar_altitude > 0)
+
+    result = {
+        "yantra_type": "yama",
+        "latitude": latitude,
+        "longitude": longitude,
+        "scale_m": scale_m,
+        "observation_date": date_str,
+        "observation_time": time_str,
+        "local_sidereal_time": round(float(LST), 4),
+        "solar_data": {
+            "altitude_deg": round(float(solar_altitude), 2),
+            "azimuth_deg": round(float(solar_azimuth), 2),
+            "declination_deg": round(float(declination), 2),
+            "hour_angle_deg": round(float(hour_angle), 2),
+            "equation_of_time_min": round(float(EoT), 2)
+        },
+        "components": {
+            "yantra": {"radius_m": yantra_radius},
+            "central_pillar": {"height_m": central_pillar_height},
+            "base_thickness": {"thickness_m": base_thickness},
+            "altitude_scale": [
+                {
+                    "altitude_deg": altitude,
+                    "radius_m": radius,
+                    "type": "major" if major else "minor"
+                } for altitude, radius, major in altitude_scale.tolist()
+            ],
+            "azimuth_divisions": [
+                {
+                    "direction": az["direction"],
+                    "angle_deg": az["angle"]
+                } for az in azimuth_divisions
+            ]
+        },
+        "seasonal_sun_paths": [
             {
-                "altitude_deg": scale["altitude"],
-                "radius_m": scale["radius"],
-                "type": scale["type"]
-            } for scale in altitude_scale
+                "season": path["season"],
+                "declination_deg": path["declination"],
+                "color": path["color"],
+                "path_points": len(path["points"])
+            } for path in sun_paths
         ],
-        "azimuth_divisions": [
+        "visible_celestial_bodies": [
             {
-                "direction": az["direction"],
-                "angle_deg": az["angle"]
-            } for az in azimuth_divisions
-        ]
-    },
-    "seasonal_sun_paths": [
-        {
-            "season": path["season"],
-            "declination_deg": path["declination"],
-            "color": path["color"],
-            "path_points": len(path["points"])
-        } for path in sun_paths
-    ],
-    "visible_celestial_bodies": [
-        {
+                "name": body["name"],
+                "type": body["type"],
+                "magnitude": body["magnitude"],
+                "altitude_deg": round(float(body["altitude"]), 2),
+                "azimuth_deg": round(float(body["azimuth"]), 2),
+                "x_pos_m": round(float(body["x"]), 3),
+                "y_pos_m": round(float(body["y"]), 3),
+                "right_ascension_hours": round(float(body["ra"]), 4),
+                "declination_deg": round(float(body["dec"]), 4)
+            } for body in visible_bodies
+        ],
+        "measurements": {
+            "sun_visible": sun_visible,
+            "total_visible_objects": len(visible_bodies) + (1 if sun_visible else 0),
+            "measurement_precision": "1 degree",
+            "altitude_range": "0-90 degrees",
+            "azimuth_range": "0-360 degrees"
+        }
+    }
+
+    # ====== FABRICATION OUTLINES ======
+    if tolerance_mm:
+        components = result["components"]
+        tolerance = yantra_astro.fabrication_tolerance(tolerance_mm)
+        result["chord_tolerance_mm"] = tolerance_mm
+        components["yantra"]["outline_m"] = yantra_astro.outline_json(
+            yantra_astro.circle_points(yantra_radius, tolerance))
+        for entry in components["altitude_scale"]:
+            if entry["radius_m"] > 0:
+                entry["outline_m"] = yantra_astro.outline_json(
+                    yantra_astro.circle_points(entry["radius_m"], tolerance))
+    return result
+
+# ====== RISE / SET / TRANSIT EVENTS ======
+RISE_ALTITUDE_DEG = -0.5667  # a star's centre at the horizon, with standard refraction
+EVENT_GRID_MINUTES = 10  # bracketing grid; rises and sets closer than this can be missed
+EVENT_TOLERANCE_S = 1.0
+EVENT_CHUNK_DAYS = 30  # one precession/nutation frame per chunk (< 0.2 s of drift)
+
+def body_events_in_chunk(latitude, longitude, start, days):
+    """
+    Rise, set and upper-transit times (hours after start, UT) of every
+    celestial body within [start, start + days), as
+    {kind: (hours, body index)}, plus the bodies' apparent RA/Dec
+    """
+    frame, equation_of_equinoxes = yantra_astro.apparent_frame(start + np.timedelta64(days * 12, "h"))
+    ra, dec = yantra_astro.rotate_equatorial(body_catalog.stars["ra_hours"], body_catalog.stars["dec_deg"], frame)
+    _, LST0 = yantra_astro.sidereal_time(start, longitude)
+    LST0 = LST0 + equation_of_equinoxes
+
+    def hour_angle(hours, body):
+        return (LST0 + yantra_astro.SIDEREAL_RATE * hours - ra[body] + 12) % 24 - 12
+
+    def altitude(hours, body):
+        return yantra_astro.hour_angle_to_horizontal(15 * hour_angle(hours, body), dec[body],
+                                                     latitude)[0] - RISE_ALTITUDE_DEG
+
+    # Coarse (time x body) grid brackets every event; bisection refines them all at once
+    step = EVENT_GRID_MINUTES / 60
+    grid = np.arange(0, days * 24 + step / 2, step)
+    bodies = np.arange(len(ra))
+    rising, setting = yantra_astro.crossing_brackets(altitude(grid[:, None], bodies[None, :]))
+    transiting, _ = yantra_astro.crossing_brackets(hour_angle(grid[:, None], bodies[None, :]), max_jump=12)
+
+    events = {}
+    for kind, f, (index, body) in [("rise", altitude, rising), ("set", altitude, setting),
+                                   ("transit", hour_angle, transiting)]:
+        hours = yantra_astro.refine_roots(f, grid[index], grid[index + 1], body, EVENT_TOLERANCE_S / 3600)
+        events[kind] = (hours, body)
+    return events, ra, dec, hour_angle
+
+def compute_rama_events(latitude: float, longitude: float, start_date: str, end_date: str) -> dict:
+    """
+    Rise, set and culmination times of every celestial body for each UT
+    day from start_date through end_date, with rise/set azimuths and
+    culmination altitudes. Times are UT and standard-meridian clock time.
+    """
+    start = np.datetime64(start_date, "D")
+    end = np.datetime64(end_date, "D") + 1
+    total_days = int((end - start).astype(np.int64))
+
+    columns = {kind: {"hours": [], "body": [], "value": []} for kind in ("rise", "set", "transit")}
+    for offset in range(0, total_days, EVENT_CHUNK_DAYS):
+        days = min(EVENT_CHUNK_DAYS, total_days - offset)
+        events, ra, dec, hour_angle = body_events_in_chunk(latitude, longitude, start + offset, days)
+        for kind, (hours, body) in events.items():
+            altitude, azimuth = yantra_astro.hour_angle_to_horizontal(
+                15 * hour_angle(hours, body), dec[body], latitude)
+            columns[kind]["hours"].append(hours + offset * 24)
+            columns[kind]["body"].append(body)
+            columns[kind]["value"].append(azimuth if kind != "transit" else altitude)
+
+    # Highest and lowest altitudes (upper and lower culmination) classify the bodies
+    upper, _ = yantra_astro.hour_angle_to_horizontal(0, dec, latitude)
+    lower, _ = yantra_astro.hour_angle_to_horizontal(180, dec, latitude)
+
+    def timestamps(hours, shift_hours=0):
+        seconds = np.round((hours + shift_hours) * 3600).astype(np.int64)
+        return np.datetime_as_string(start.astype("datetime64[s]") + seconds, unit="s").tolist()
+
+    value_names = {"rise": "azimuth_deg", "set": "azimuth_deg", "transit": "altitude_deg"}
+    columns = {kind: {name: np.concatenate(values) for name, values in column.items()}
+               for kind, column in columns.items()}
+    bodies = []
+    for row in body_catalog.by_number.tolist():  # catalog order
+        body = celestial_bodies[body_catalog.stars["number"][row]]
+        entry = {
             "name": body["name"],
             "type": body["type"],
-            "magnitude": body["magnitude"],
-            "altitude_deg": round(body["altitude"], 2),
-            "azimuth_deg": round(body["azimuth"], 2),
-            "right_ascension_hours": body["ra"],
-            "declination_deg": body["dec"]
-        } for body in visible_bodies
-    ],
-    "measurements": {
-        "sun_visible": solar_altitude > 0,
-        "total_visible_objects": len(visible_bodies) + (1 if solar_altitude > 0 else 0),
-        "measurement_precision": "1 degree",
-        "altitude_range": "0-90 degrees",
-        "azimuth_range": "0-360 degrees"
+            "magnitude": body["mag"],
+            "circumpolar": bool(lower[row] > RISE_ALTITUDE_DEG),
+            "never_rises": bool(upper[row] < RISE_ALTITUDE_DEG),
+        }
+        for kind, column in columns.items():
+            mine = np.flatnonzero(column["body"] == row)
+            mine = mine[np.argsort(column["hours"][mine], kind="stable")]
+            entry[kind] = {
+                "time_ut": timestamps(column["hours"][mine]),
+                "time_local": timestamps(column["hours"][mine], standard_meridian / 15),
+                value_names[kind]: np.round(column["value"][mine], 2).tolist(),
+            }
+        bodies.append(entry)
+
+    return {
+        "yantra_type": "rama_events",
+        "latitude": latitude,
+        "longitude": longitude,
+        "start_date": str(start),
+        "end_date": str(end - 1),
+        "days": total_days,
+        "standard_meridian": standard_meridian,
+        "rise_altitude_deg": RISE_ALTITUDE_DEG,
+        "bodies": bodies,
     }
-}
 
-with open("rama_yantra.json", "w") as f:
-    json.dump(output, f, indent=2)
-
-print(f"✅ rama Yantra generated!")
-print(f"☀️ Sun Position: Alt {solar_altitude:.1f}°, Az {solar_azimuth:.1f}°" if solar_altitude > 0 else "☀️ Sun below horizon")
-print(f"⭐ Visible Stars/Objects: {len(visible_bodies)}")
-print(f"📐 Measurement Range: 0-90° altitude, 0-360° azimuth")
-print(f"📊 JSON saved as yama_yantra.json")
\ No newline at end of file
+def summarize_rama_yantra(result):
+    """Console summary of a computed Rama Yantra"""
+    solar = result["solar_data"]
+    return "\n".join([
+        f"✅ rama Yantra generated!",
+        f"☀️ Sun Position: Alt {solar['altitude_deg']:.1f}°, Az {solar['azimuth_deg']:.1f}°"
+        if result["measurements"]["sun_visible"] else "☀️ Sun below horizon",
+        f"⭐ Visible Stars/Objects: {len(result['visible_celestial_bodies'])}",
+        f"📐 Measurement Range: 0-90° altitude, 0-360° azimuth",
+    ])
+
+# ====== FIGURE ======
+def draw_rama_yantra(ax, result):
+    """Draw a computed Rama Yantra onto a matplotlib Axes"""
+    from matplotlib.patches import Circle
+
+    latitude = result["latitude"]
+    longitude = result["longitude"]
+    components = result["components"]
+    yantra_radius = components["yantra"]["radius_m"]
+    central_pillar_height = components["central_pillar"]["height_m"]
+    solar_altitude = result["solar_data"]["altitude_deg"]
+    solar_azimuth = result["solar_data"]["azimuth_deg"]
+    visible_bodies = result["visible_celestial_bodies"]
+
+    # ====== DRAW ALTITUDE SCALE CIRCLES ======
+    for altitude, radius, major in create_altitude_scale(yantra_radius).tolist():
+        if major:
+            circle = Circle((0, 0), radius, fill=False,
+                            color='black', linewidth=2, alpha=0.7)
+            ax.add_patch(circle)
+
+            # Add altitude labels
+            ax.text(radius + 0.1, 0, f"{altitude}°",
+                   ha='left', va='center', fontsize=10, fontweight='bold')
+        else:
+            circle = Circle((0, 0), radius, fill=False,
+                            color='gray', linewidth=1, alpha=0.5)
+            ax.add_patch(circle)
+
+    # ====== DRAW OUTER YANTRA BOUNDARY ======
+    outer_boundary = Circle((0, 0), yantra_radius, fill=False,
+                            color='saddlebrown', linewidth=4)
+    ax.add_patch(outer_boundary)
+
+    # Central pillar base
+    central_base = Circle((0, 0), yantra_radius * 0.02, fill=True,
+                          color='#5C4033', alpha=0.8)
+    ax.add_patch(central_base)
+
+    # ====== DRAW AZIMUTH DIRECTION LINES ======
+    for az_line in create_azimuth_divisions(yantra_radius):
+        x0, y0 = az_line['start']
+        x1, y1 = az_line['end']
+
+        # Main cardinal directions in bold
+        if az_line['direction'] in ['N', 'E', 'S', 'W']:
+            ax.plot([x0, x1], [y0, y1], color='darkblue', linewidth=2.5, alpha=0.8)
+        else:
+            ax.plot([x0, x1], [y0, y1], color='blue', linewidth=1, alpha=0.6)
+
+        # Direction labels
+        label_radius = yantra_radius * 1.08
+        label_x = label_radius * np.cos(np.radians(az_line['angle'] - 90))
+        label_y = label_radius * np.sin(np.radians(az_line['angle'] - 90))
+
+        ax.text(label_x, label_y, az_line['direction'], ha='center', va='center',
+               fontsize=11, fontweight='bold',
+               bbox=dict(boxstyle="round,pad=0.3", facecolor='lightcyan', alpha=0.8))
+
+    # ====== DRAW SEASONAL SUN PATHS ======
+    for path in create_seasonal_sun_paths(latitude, yantra_radius):
+        if len(path["points"]) > 1:
+            points = path["points"]
+            ax.plot(points["x_m"], points["y_m"], color=path["color"],
+                   linewidth=3, alpha=0.7, label=f'{path["season"]} (δ={path["declination"]:.1f}°)')
+
+            # Mark noon position (highest point)
+            if len(points) > 0:
+                noon_idx = len(points) // 2
+                noon_point = points[noon_idx]
+                ax.scatter(noon_point["x_m"], noon_point["y_m"], color=path["color"],
+                         s=150, marker='o', edgecolors='black', linewidth=2, zorder=8)
+
+                # Time labels at key points
+                for i in [0, noon_idx, -1]:
+                    if i < len(points):
+                        point = points[i]
+                        time_label = f"{int(point['solar_time_hours']):02d}:00"
+                        ax.text(point["x_m"], point["y_m"] + yantra_radius * 0.03, time_label,
+                               ha='center', va='bottom', fontsize=8, color=path["color"],
+                               bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
+
+    # ====== DRAW CURRENT SUN POSITION ======
+    if solar_altitude > 0:
+        sun_x, sun_y = project_celestial_body(solar_altitude, solar_azimuth, yantra_radius)
+        ax.scatter(sun_x, sun_y, color='gold', s=400, marker='*',
+                  edgecolors='orange', linewidth=3, zorder=10, label='Current Sun Position')
+
+        # Sun altitude and azimuth labels
+        ax.text(sun_x, sun_y + yantra_radius * 0.05,
+               f'☀️ Alt: {solar_altitude:.1f}°\nAz: {solar_azimuth:.1f}°',
+               ha='center', va='bottom', fontsize=10, fontweight='bold',
+               bbox=dict(boxstyle="round,pad=0.3", facecolor='yellow', alpha=0.9))
+
+    # ====== DRAW VISIBLE STARS ======
+    star_colors = {'star': 'white', 'planet': 'yellow'}
+    for body in visible_bodies:
+        x, y = body["x_pos_m"], body["y_pos_m"]
+
+        # Star size based on magnitude (brighter = larger)
+        size = max(30, 150 - body["magnitude"] * 40)
+        color = star_colors.get(body["type"], 'white')
+
+        ax.scatter(x, y, color=color, s=size, marker='*' if body["type"] == 'star' else 'o',
+                  edgecolors='lightgray', linewidth=1, alpha=0.9, zorder=7)
+
+        # Star labels for bright objects
+        if body["magnitude"] < 1.0:
+            ax.text(x, y + yantra_radius * 0.03, body["name"],
+                   ha='center', va='bottom', fontsize=8, color='white',
+                   bbox=dict(boxstyle="round,pad=0.2", facecolor='black', alpha=0.7))
+
+    # ====== MEASUREMENT CROSSHAIRS ======
+    # Add measuring crosshairs at center for precise alignment
+    crosshair_size = yantra_radius * 0.05
+    ax.plot([-crosshair_size, crosshair_size], [0, 0], color='red', linewidth=2)
+    ax.plot([0, 0], [-crosshair_size, crosshair_size], color='red', linewidth=2)
+
+    # ====== CENTRAL PILLAR REPRESENTATION ======
+    # Vertical pillar for sighting
+    pillar_x = [0, 0]
+    pillar_y = [0, central_pillar_height * 0.1]  # Projected height
+    ax.plot(pillar_x, pillar_y, color='#654321', linewidth=8,
+            label=f'Central Pillar ({central_pillar_height:.1f}m)')
+
+    # Pillar shadow
+    if solar_altitude > 0:
+        shadow_length = central_pillar_height / np.tan(np.radians(solar_altitude))
+        shadow_direction = np.radians(solar_azimuth - 90)
+        shadow_x = shadow_length * 0.1 * np.cos(shadow_direction)
+        shadow_y = shadow_length * 0.1 * np.sin(shadow_direction)
+        ax.plot([0, shadow_x], [0, shadow_y], color='gray', linewidth=4,
+               alpha=0.6, linestyle=':', label='Pillar Shadow')
+
+    # ====== ALTITUDE MEASUREMENT ARCS ======
+    # Show measurement arcs for current observations
+    measurement_altitudes = [30, 45, 60]
+    for alt in measurement_altitudes:
+        if any(abs(body["altitude_deg"] - alt) < 5 for body in visible_bodies if body["altitude_deg"] > 0):
+            radius = yantra_radius * (90 - alt) / 90
+            circle = Circle((0, 0), radius, fill=False,
+                            color='red', linewidth=3, linestyle='--', alpha=0.8)
+            ax.add_patch(circle)
+
+    # ====== FINAL STYLING ======
+    ax.set_aspect('equal')
+    ax.set_xlim(-yantra_radius*1.2, yantra_radius*1.2)
+    ax.set_ylim(-yantra_radius*1.2, yantra_radius*1.2)
+
+    ax.set_title(f"Yama Yantra - Altitude Measurement Instrument\n"
+                 f"Location: {latitude:.2f}°N, {longitude:.2f}°E | "
+                 f"{result['observation_date']} {result['observation_time']}\n"
+                 f"Sun: Alt {solar_altitude:.1f}°, Az {solar_azimuth:.1f}° | "
+                 f"Visible Objects: {result['measurements']['total_visible_objects']}",
+                 fontsize=14, pad=20)
+
+    ax.set_xlabel("East-West (meters)", fontsize=12)
+    ax.set_ylabel("North-South (meters)", fontsize=12)
+    ax.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10)
+    ax.grid(True, alpha=0.3)
+    ax.figure.tight_layout()
+
+# ====== SCRIPT MODE ======
+def main():
+    import matplotlib.pyplot as plt
+
+    latitude = float(input("Enter Latitude (e.g., 28.6139): "))
+    longitude = float(input("Enter Longitude (e.g., 77.2090): "))
+    scale_m = float(input("Enter scale (meters, e.g., 3.0): "))
+    date_str = input("Enter date (YYYY-MM-DD): ")
+    time_str = input("Enter time (HH:MM, 24hr format): ")
+
+    output = compute_rama_yantra(latitude, longitude, scale_m, date_str, time_str)
+
+    fig, ax = plt.subplots(1, 1, figsize=FIGURE_SIZE)
+    draw_rama_yantra(ax, output)
+    plt.show()
+
+    with open("rama_yantra.json", "w") as f:
+        json.dump(output, f, indent=2)
+
+    print(summarize_rama_yantra(output))
+    print(f"📊 JSON saved as rama_yantra.json")
+
+if __name__ == "__main__":
+    main()
@@ -1,372 +1,443 @@
 import numpy as np
-import matplotlib.pyplot as plt
+import yantra_astro
 import json
 from datetime import datetime, timedelta
 
-# ====== INPUT ======
-latitude = float(input("Enter Latitude (e.g., 28.6139): "))
-longitude = float(input("Enter Longitude (e.g., 77.2090): "))
-scale_m = float(input("Enter scale (meters, e.g., 5.0): "))
-date_str = input("Enter date (YYYY-MM-DD): ")
-
-# ====== DATE HANDLING ======
-date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-day_of_year = date_obj.timetuple().tm_yday
+# ====== CONSTANTS ======
+standard_meridian = yantra_astro.STANDARD_MERIDIAN  # IST
+FIGURE_SIZE = (12, 12)
 
 # ====== ZODIAC SIGN CALCULATION ======
-# 12 zodiac signs with their date ranges and Sanskrit names
+# 12 zodiac signs, each 30° of solar (ecliptic) longitude from the vernal equinox, with Sanskrit names
 zodiac_signs = [
-    {"name": "Mesha (Aries)", "start_day": 80, "end_day": 110, "color": "#FF6B6B"},
-    {"name": "Vrishabha (Taurus)", "start_day": 111, "end_day": 141, "color": "#4ECDC4"},
-    {"name": "Mithuna (Gemini)", "start_day": 142, "end_day": 172, "color": "#45B7D1"},
-    {"name": "Karka (Cancer)", "start_day": 173, "end_day": 203, "color": "#96CEB4"},
-    {"name": "Simha (Leo)", "start_day": 204, "end_day": 234, "color": "#FFEAA7"},
-    {"name": "Kanya (Virgo)", "start_day": 235, "end_day": 265, "color": "#DDA0DD"},
-    {"name": "Tula (Libra)", "start_day": 266, "end_day": 296, "color": "#98D8C8"},
-    {"name": "Vrishchika (Scorpio)", "start_day": 297, "end_day": 327, "color": "#F7DC6F"},
-    {"name": "Dhanus (Sagittarius)", "start_day": 328, "end_day": 358, "color": "#BB8FCE"},
-    {"name": "Makara (Capricorn)", "start_day": 359, "end_day": 19, "color": "#85C1E9"},  # crosses year
-    {"name": "Kumbha (Aquarius)", "start_day": 20, "end_day": 50, "color": "#F8C471"},
-    {"name": "Meena (Pisces)", "start_day": 51, "end_day": 79, "color": "#82E0AA"}
+    {"name": "Mesha (Aries)", "start_longitude": 0, "color": "#FF6B6B"},
+    {"name": "Vrishabha (Taurus)", "start_longitude": 30, "color": "#4ECDC4"},
+    {"name": "Mithuna (Gemini)", "start_longitude": 60, "color": "#45B7D1"},
+    {"name": "Karka (Cancer)", "start_longitude": 90, "color": "#96CEB4"},
+    {"name": "Simha (Leo)", "start_longitude": 120, "color": "#FFEAA7"},
+    {"name": "Kanya (Virgo)", "start_longitude": 150, "color": "#DDA0DD"},
+    {"name": "Tula (Libra)", "start_longitude": 180, "color": "#98D8C8"},
+    {"name": "Vrishchika (Scorpio)", "start_longitude": 210, "color": "#F7DC6F"},
+    {"name": "Dhanus (Sagittarius)", "start_longitude": 240, "color": "#BB8FCE"},
+    {"name": "Makara (Capricorn)", "start_longitude": 270, "color": "#85C1E9"},
+    {"name": "Kumbha (Aquarius)", "start_longitude": 300, "color": "#F8C471"},
+    {"name": "Meena (Pisces)", "start_longitude": 330, "color": "#82E0AA"}
 ]
 
-# Find current zodiac sign
-current_sign = None
-for sign in zodiac_signs:
-    if sign["start_day"] <= sign["end_day"]:  # Normal case
-        if sign["start_day"] <= day_of_year <= sign["end_day"]:
-            current_sign = sign
-            break
-    else:  # Capricorn case (crosses new year)
-        if day_of_year >= sign["start_day"] or day_of_year <= sign["end_day"]:
-            current_sign = sign
-            break
-
-# ====== LOCAL SOLAR TIME CALC ======
-standard_meridian = 82.5  # IST
-
-# Equation of Time (more precise)
-B = 2 * np.pi * (day_of_year - 1) / 365
-EoT = 229.18 * (
-    0.000075 + 0.001868*np.cos(B) - 0.032077*np.sin(B)
-    - 0.014615*np.cos(2*B) - 0.040849*np.sin(2*B)
-)
-
-# Longitude correction (minutes)
-longitude_correction = 4 * (longitude - standard_meridian)
-
-# True Solar Time at local noon
-LST_noon = 12 + (longitude_correction + EoT) / 60  # in hours
-
-# ====== SOLAR DECLINATION ======
-declination = 23.45 * np.sin(np.radians(360 * (284 + day_of_year)/365))
-
-# ====== ECLIPTIC COORDINATES ======
-# Solar longitude (position along ecliptic)
-solar_longitude = (280.460 + 0.9856474 * day_of_year) % 360
-
-# ====== PARAMETERS ======
-yantra_radius = scale_m
-gnomon_height = scale_m * 0.8
-platform_thickness = scale_m * 0.1
-
-# ====== RASIVALAYA SPECIFIC GEOMETRY ======
 # The Rasivalaya has 12 segments for zodiac signs
 segment_angle = 30  # degrees per zodiac sign
-hours = np.arange(-6, 7, 1)  # -6 to +6 hrs from noon
+
+# Solar longitude at which each sign begins, ascending from 0°
+zodiac_boundaries = np.array([sign["start_longitude"] for sign in zodiac_signs], dtype=np.float64)
+zodiac_sign_names = np.array([sign["name"] for sign in zodiac_signs])
+
+def zodiac_sign_index(solar_longitude):
+    """Index into zodiac_signs of the sign the sun occupies, for any array of solar longitudes"""
+    return np.searchsorted(zodiac_boundaries, np.asarray(solar_longitude) % 360, side="right") - 1
 
 # ====== ZODIAC SEGMENT CALCULATION ======
-def create_zodiac_segments():
-    """Create 12 zodiac segments around the yantra"""
+def create_zodiac_segments(yantra_radius, tolerance):
+    """Create 12 zodiac segments around the yantra, outlined to within tolerance (metres)"""
     segments = []
     for i, sign in enumerate(zodiac_signs):
         start_angle = i * segment_angle - 90  # Start from top (North)
         end_angle = start_angle + segment_angle
-        
-        # Create arc points
-        angles = np.linspace(np.radians(start_angle), np.radians(end_angle), 50)
-        inner_radius = yantra_radius * 0.7
-        outer_radius = yantra_radius
-        
-        # Outer arc
-        x_outer = outer_radius * np.cos(angles)
-        y_outer = outer_radius * np.sin(angles)
-        
-        # Inner arc
-        x_inner = inner_radius * np.cos(angles[::-1])
-        y_inner = inner_radius * np.sin(angles[::-1])
-        
-        # Combine for filled segment
-        x_segment = np.concatenate([x_outer, x_inner])
-        y_segment = np.concatenate([y_outer, y_inner])
-        
+
+        # Outer arc, then inner arc back, as one filled segment
+        outline = yantra_astro.annulus_sector(yantra_radius * 0.7, yantra_radius,
+                                              start_angle, end_angle, tolerance)
+
         segments.append({
             "sign": sign["name"],
             "start_angle": start_angle,
             "end_angle": end_angle,
             "color": sign["color"],
-            "x_coords": x_segment,
-            "y_coords": y_segment,
+            "x_coords": outline[:, 0],
+            "y_coords": outline[:, 1],
             "center_angle": start_angle + segment_angle/2,
             "text_radius": yantra_radius * 0.85
         })
-    
+
     return segments
 
 # ====== HOUR LINE CALCULATION FOR RASIVALAYA ======
-def rasivalaya_hour_line(phi_deg, delta_deg, t_hours, rashi_offset=0):
+def rasivalaya_hour_line(phi_deg, delta_deg, t_hours, solar_longitude, rashi_offset=0):
     """
     Calculate hour line for Rasivalaya Yantra
     phi_deg = latitude
-    delta_deg = solar declination  
+    delta_deg = solar declination
     t_hours = hours from local noon
+    solar_longitude = sun's ecliptic longitude in degrees
     rashi_offset = zodiac position offset
     """
-    H = np.radians(15 * t_hours)  # hour angle
+    H = np.radians(15 * np.asarray(t_hours))  # hour angle
     phi = np.radians(phi_deg)
     delta = np.radians(delta_deg)
-    
+
     # Base angle calculation
-    if np.cos(H) != 0:
-        theta = np.arctan(np.sin(phi) * np.tan(H))
-    else:
-        theta = np.pi/2 if H > 0 else -np.pi/2
-    
+    with np.errstate(invalid="ignore"):
+        theta = np.where(np.cos(H) != 0, np.arctan(np.sin(phi) * np.tan(H)), np.sign(H) * np.pi/2)
+
     # Adjust for zodiac position
     zodiac_angle = np.radians(solar_longitude - rashi_offset)
     adjusted_theta = theta + zodiac_angle * 0.1  # Small correction factor
-    
-    return np.degrees(adjusted_theta)
 
-# ====== CREATE HOUR LINES ======
-hour_lines = []
-for t in hours:
-    theta = rasivalaya_hour_line(latitude, declination, t, solar_longitude)
-    radius = yantra_radius * 0.6  # Hour lines in inner circle
-    x_end = radius * np.sin(np.radians(theta))
-    y_end = radius * np.cos(np.radians(theta))
-    hour_lines.append({
-        "time": f"{12+t:02.0f}:00",
-        "t": 12+t,
-        "angle_deg": theta,
-        "start": [0,0],
-        "end": [x_end, y_end]
-    })
+    return np.degrees(adjusted_theta)
 
 # ====== SEASONAL CURVES ======
-def create_seasonal_curves():
+def create_seasonal_curves(latitude, yantra_radius, solar_longitude):
     """Create curves showing sun's path during different seasons"""
     seasons = [
         {"name": "Summer Solstice", "declination": 23.45, "color": "orange"},
         {"name": "Equinox", "declination": 0, "color": "green"},
         {"name": "Winter Solstice", "declination": -23.45, "color": "blue"}
     ]
-    
-    curves = []
-    for season in seasons:
-        points = []
-        for t in np.linspace(-6, 6, 50):
-            theta = rasivalaya_hour_line(latitude, season["declination"], t)
-            radius = yantra_radius * 0.5
-            x = radius * np.sin(np.radians(theta))
-            y = radius * np.cos(np.radians(theta))
-            points.append([x, y])
-        
-        curves.append({
+
+    # Every season and time in one (season x t) broadcast
+    declinations = np.array([season["declination"] for season in seasons])
+    t = np.linspace(-6, 6, 50)
+    theta = np.radians(rasivalaya_hour_line(latitude, declinations[:, None], t[None, :], solar_longitude))
+    theta = np.broadcast_to(theta, (len(seasons), t.size))  # the angle does not vary with declination
+    radius = yantra_radius * 0.5
+    points = np.stack([radius * np.sin(theta), radius * np.cos(theta)], axis=-1)
+
+    return [
+        {
             "name": season["name"],
             "color": season["color"],
-            "points": points
-        })
-    
-    return curves
-
-# ====== FIGURE SETUP ======
-fig, ax = plt.subplots(1, 1, figsize=(12, 12))
-
-# ====== DRAW ZODIAC SEGMENTS ======
-zodiac_segments = create_zodiac_segments()
-for segment in zodiac_segments:
-    # Fill zodiac segment
-    ax.fill(segment["x_coords"], segment["y_coords"], 
-           color=segment["color"], alpha=0.3, edgecolor='black', linewidth=0.5)
-    
-    # Add zodiac sign labels
-    text_angle = np.radians(segment["center_angle"])
-    text_x = segment["text_radius"] * np.cos(text_angle)
-    text_y = segment["text_radius"] * np.sin(text_angle)
-    
-    # Rotate text to follow the arc
-    rotation = segment["center_angle"] + 90
-    if rotation > 90 and rotation < 270:
-        rotation += 180
-    
-    ax.text(text_x, text_y, segment["sign"].split('(')[0], 
-           rotation=rotation, ha='center', va='center', fontsize=8, fontweight='bold')
-
-# ====== HIGHLIGHT CURRENT ZODIAC SIGN ======
-if current_sign:
-    current_segment = next(seg for seg in zodiac_segments if current_sign["name"] in seg["sign"])
-    ax.fill(current_segment["x_coords"], current_segment["y_coords"], 
-           color=current_sign["color"], alpha=0.7, edgecolor='red', linewidth=3)
-
-# ====== DRAW PLATFORM CIRCLES ======
-# Outer boundary
-outer_circle = plt.Circle((0,0), yantra_radius, fill=False, color='black', linewidth=3)
-ax.add_patch(outer_circle)
-
-# Inner measurement circle
-inner_circle = plt.Circle((0,0), yantra_radius * 0.6, fill=False, color='gray', linewidth=2, linestyle='--')
-ax.add_patch(inner_circle)
-
-# Central gnomon base
-gnomon_base = plt.Circle((0,0), yantra_radius * 0.05, fill=True, color='saddlebrown')
-ax.add_patch(gnomon_base)
-
-# ====== DRAW HOUR LINES ======
-for line in hour_lines:
-    x0, y0 = line['start']
-    x1, y1 = line['end']
-    ax.plot([x0,x1],[y0,y1], color='darkred', linewidth=1.5, alpha=0.8)
-    
-    # Add time labels
-    label_radius = yantra_radius * 0.65
-    label_x = label_radius * np.sin(np.radians(line['angle_deg']))
-    label_y = label_radius * np.cos(np.radians(line['angle_deg']))
-    ax.text(label_x, label_y, line['time'], ha='center', va='center', 
-           fontsize=8, bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
-
-# ====== DRAW SEASONAL CURVES ======
-seasonal_curves = create_seasonal_curves()
-for curve in seasonal_curves:
-    points = np.array(curve["points"])
-    ax.plot(points[:,0], points[:,1], color=curve["color"], 
-           linewidth=2, alpha=0.7, label=curve["name"])
-
-# ====== CURRENT SOLAR TIME LINE ======
-t_frac = LST_noon - 12
-theta_frac = rasivalaya_hour_line(latitude, declination, t_frac, solar_longitude)
-radius_frac = yantra_radius * 0.6
-x_end_frac = radius_frac * np.sin(np.radians(theta_frac))
-y_end_frac = radius_frac * np.cos(np.radians(theta_frac))
-
-# Calculate precise time
-total_seconds = LST_noon * 3600
-LST_hour = int(total_seconds // 3600)
-LST_minute = int((total_seconds % 3600) // 60)
-LST_second = int(total_seconds % 60)
-
-if LST_second == 60:
-    LST_minute += 1
-    LST_second = 0
-if LST_minute == 60:
-    LST_hour += 1
-    LST_minute = 0
-
-LST_str = f"{LST_hour:02d}:{LST_minute:02d}"
-
-# Draw current time line
-ax.plot([0, x_end_frac], [0, y_end_frac], color='gold', linewidth=4, 
-        label=f"Current Solar Time: {LST_str}")
-
-# Add sun symbol at the end
-ax.scatter(x_end_frac, y_end_frac, color='gold', s=200, marker='*', 
-          edgecolors='orange', linewidth=2, zorder=10, label='Sun Position')
-
-# ====== GNOMON ======
-# The gnomon is tilted at latitude angle
-gnomon_top_x = gnomon_height * np.sin(np.radians(latitude))
-gnomon_top_y = gnomon_height * np.cos(np.radians(latitude))
-
-ax.plot([0, gnomon_top_x], [0, gnomon_top_y], color='darkblue', 
-        linewidth=6, label=f'Gnomon (tilted {latitude:.1f}°)')
-
-# Gnomon shadow based on sun position
-shadow_length = gnomon_height / np.tan(np.radians(90 - abs(declination)))
-shadow_x = shadow_length * np.sin(np.radians(theta_frac))
-shadow_y = shadow_length * np.cos(np.radians(theta_frac))
-ax.plot([0, shadow_x], [0, shadow_y], color='gray', linewidth=3, 
-        alpha=0.6, linestyle=':', label='Gnomon Shadow')
-
-# ====== DIRECTIONAL MARKERS ======
-directions = ['N', 'E', 'S', 'W']
-dir_angles = [90, 0, -90, 180]
-for direction, angle in zip(directions, dir_angles):
-    dir_radius = yantra_radius * 1.1
-    dir_x = dir_radius * np.cos(np.radians(angle))
-    dir_y = dir_radius * np.sin(np.radians(angle))
-    ax.text(dir_x, dir_y, direction, ha='center', va='center', 
-           fontsize=12, fontweight='bold', 
-           bbox=dict(boxstyle="circle,pad=0.3", facecolor='lightblue'))
-
-# ====== FINAL STYLING ======
-ax.set_aspect('equal')
-ax.set_xlim(-yantra_radius*1.3, yantra_radius*1.3)
-ax.set_ylim(-yantra_radius*1.3, yantra_radius*1.3)
-
-plt.title(f"Rasivalaya Yantra - {current_sign['name'] if current_sign else 'Unknown Rashi'}\n"
-          f"Location: {latitude:.2f}°N, {longitude:.2f}°E | Date: {date_str}\n"
-          f"Solar Longitude: {solar_longitude:.1f}° | Declination: {declination:.2f}°", 
-          fontsize=14, pad=20)
-
-plt.xlabel("East-West (meters)", fontsize=12)
-plt.ylabel("North-South (meters)", fontsize=12)
-plt.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
-
-# ====== JSON SAVE ======
-output = {
-    "yantra_type": "rasivalaya",
-    "latitude": latitude,
-    "longitude": longitude,
-    "scale_m": scale_m,
-    "date": date_str,
-    "day_of_year": day_of_year,
-    "current_zodiac_sign": current_sign["name"] if current_sign else "Unknown",
-    "solar_longitude": round(solar_longitude, 2),
-    "solar_declination": round(declination, 2),
-    "solar_time_highlighted": LST_str,
-    "equation_of_time_minutes": round(EoT, 2),
-    "components": {
-        "yantra": {"radius_m": yantra_radius},
-        "gnomon": {"height_m": gnomon_height, "tilt_deg": latitude},
-        "zodiac_segments": [
-            {
-                "sign": seg["sign"],
-                "start_angle": seg["start_angle"],
-                "end_angle": seg["end_angle"],
-                "color": seg["color"]
-            } for seg in zodiac_segments
-        ],
-        "hour_lines": hour_lines,
-        "seasonal_curves": [
-            {
-                "season": curve["name"],
-                "color": curve["color"],
-                "points": len(curve["points"])
-            } for curve in seasonal_curves
-        ],
-        "current_sun_position": {
-            "angle_deg": round(theta_frac, 2),
-            "x_pos": round(x_end_frac, 2),
-            "y_pos": round(y_end_frac, 2)
+            "points": season_points
+        } for season, season_points in zip(seasons, points)
+    ]
+
+def format_solar_time(hours):
+    """Format decimal solar hours as HH:MM"""
+    total_seconds = hours * 3600
+    LST_hour = int(total_seconds // 3600)
+    LST_minute = int((total_seconds % 3600) // 60)
+    LST_second = int(total_seconds % 60)
+
+    if LST_second == 60:
+        LST_minute += 1
+        LST_second = 0
+    if LST_minute == 60:
+        LST_hour += 1
+        LST_minute = 0
+
+    return f"{LST_hour:02d}:{LST_minute:02d}"
+
+# ====== CALCULATION ======
+def compute_rasivalaya_yantra(latitude: float, longitude: float, scale_m: float, date_str: str,
+                              tolerance_mm: float = None) -> dict:
+    """
+    Compute Rasivalaya Yantra geometry for a site and date. With
+    tolerance_mm, circles and arcs also carry fabrication outlines
+    (outline_m) within that chord error.
+    Returns the JSON-serialisable yantra description.
+    """
+    # ====== DATE HANDLING ======
+    date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    day_of_year = date_obj.timetuple().tm_yday
+
+    # ====== EPHEMERIS ======
+    # Equation of Time, solar declination and solar longitude (position
+    # along the ecliptic) for the date. The table and chebyshev backends
+    # give the apparent longitude, so the sign changes at the actual
+    # ingress; the formula backend's mean longitude can be ~2 days off.
+    ephemeris = yantra_astro.solar_ephemeris(date_str)
+    EoT = ephemeris["equation_of_time_min"]
+    declination = ephemeris["declination_deg"]
+    solar_longitude = ephemeris["solar_longitude_deg"]
+
+    # Current zodiac sign from the sun's longitude
+    current_sign = zodiac_signs[int(zodiac_sign_index(solar_longitude))]
+
+    # ====== LOCAL SOLAR TIME CALC ======
+    # True Solar Time at local noon
+    LST_noon = yantra_astro.local_solar_time(12, EoT, longitude, standard_meridian)  # in hours
+
+    # ====== PARAMETERS ======
+    yantra_radius = scale_m
+    gnomon_height = scale_m * 0.8
+    hours = np.arange(-6, 7, 1)  # -6 to +6 hrs from noon
+
+    # ====== CREATE HOUR LINES ======
+    thetas = rasivalaya_hour_line(latitude, declination, hours, solar_longitude, solar_longitude)
+    radius = yantra_radius * 0.6  # Hour lines in inner circle
+    x_ends = radius * np.sin(np.radians(thetas))
+    y_ends = radius * np.cos(np.radians(thetas))
+    hour_lines = [
+        {
+            "time": f"{12+t:02.0f}:00",
+            "t": int(12+t),
+            "angle_deg": theta,
+            "start": [0,0],
+            "end": [x_end, y_end]
+        } for t, theta, x_end, y_end in zip(hours.tolist(), thetas.tolist(), x_ends.tolist(), y_ends.tolist())
+    ]
+
+    tolerance = yantra_astro.fabrication_tolerance(tolerance_mm)
+    zodiac_segments = create_zodiac_segments(yantra_radius, tolerance)
+    seasonal_curves = create_seasonal_curves(latitude, yantra_radius, solar_longitude)
+
+    # ====== CURRENT SOLAR TIME LINE ======
+    t_frac = LST_noon - 12
+    theta_frac = rasivalaya_hour_line(latitude, declination, t_frac, solar_longitude, solar_longitude)
+    radius_frac = yantra_radius * 0.6
+    x_end_frac = radius_frac * np.sin(np.radians(theta_frac))
+    y_end_frac = radius_frac * np.cos(np.radians(theta_frac))
+    LST_str = format_solar_time(LST_noon)
+
+    sign_name = current_sign["name"]
+
+    result = {
+        "yantra_type": "rasivalaya",
+        "latitude": latitude,
+        "longitude": longitude,
+        "scale_m": scale_m,
+        "date": date_str,
+        "day_of_year": day_of_year,
+        "current_zodiac_sign": sign_name,
+        "solar_longitude": round(float(solar_longitude), 2),
+        "solar_declination": round(float(declination), 2),
+        "solar_time_highlighted": LST_str,
+        "equation_of_time_minutes": round(float(EoT), 2),
+        "components": {
+            "yantra": {"radius_m": yantra_radius},
+            "gnomon": {"height_m": gnomon_height, "tilt_deg": latitude},
+            "zodiac_segments": [
+                {
+                    "sign": seg["sign"],
+                    "start_angle": seg["start_angle"],
+                    "end_angle": seg["end_angle"],
+                    "color": seg["color"]
+                } for seg in zodiac_segments
+            ],
+            "hour_lines": hour_lines,
+            "seasonal_curves": [
+                {
+                    "season": curve["name"],
+                    "color": curve["color"],
+                    "points": len(curve["points"])
+                } for curve in seasonal_curves
+            ],
+            "current_sun_position": {
+                "angle_deg": round(float(theta_frac), 2),
+                "x_pos": round(float(x_end_frac), 2),
+                "y_pos": round(float(y_end_frac), 2)
+            }
+        },
+        "astronomical_data": {
+            "solar_longitude_deg": round(float(solar_longitude), 2),
+            "declination_deg": round(float(declination), 2),
+            "equation_of_time_min": round(float(EoT), 2),
+            "local_solar_time": LST_str,
+            "zodiac_position": f"Sun in {sign_name}"
         }
-    },
-    "astronomical_data": {
-        "solar_longitude_deg": round(solar_longitude, 2),
-        "declination_deg": round(declination, 2),
-        "equation_of_time_min": round(EoT, 2),
-        "local_solar_time": LST_str,
-        "zodiac_position": f"Sun in {current_sign['name'] if current_sign else 'Unknown'}"
     }
-}
 
-with open("rasivalaya_yantra.json", "w") as f:
-    json.dump(output, f, indent=2)
+    # ====== FABRICATION OUTLINES ======
+    if tolerance_mm:
+        components = result["components"]
+        result["chord_tolerance_mm"] = tolerance_mm
+        components["yantra"]["outline_m"] = yantra_astro.outline_json(
+            yantra_astro.circle_points(yantra_radius, tolerance))
+        for entry, seg in zip(components["zodiac_segments"], zodiac_segments):
+            entry["outline_m"] = yantra_astro.outline_json(np.stack([seg["x_coords"], seg["y_coords"]], axis=1))
+    return result
+
+# ====== BATCH CALCULATION ======
+def compute_rasivalaya_batch(latitude, longitude, scale_m, dates):
+    """
+    Vectorised Rasivalaya hour lines, solar longitude and zodiac sign for
+    many (site, date) rows at once. All arguments are equal-length 1-D
+    arrays; returns a dict of columns.
+    """
+    hours = np.arange(-6, 7, 1)
+
+    ephemeris = yantra_astro.solar_ephemeris(dates)
+    EoT = ephemeris["equation_of_time_min"]
+    declination = ephemeris["declination_deg"]
+    solar_longitude = ephemeris["solar_longitude_deg"]
+    LST_noon = yantra_astro.local_solar_time(12, EoT, longitude, standard_meridian)
+
+    # Same hour-line maths as compute_rasivalaya_yantra, with rows on the
+    # first axis and hour offsets on the second
+    hour_angles = rasivalaya_hour_line(latitude[:, None], declination[:, None], hours[None, :],
+                                       solar_longitude[:, None], solar_longitude[:, None])
+    theta_frac = rasivalaya_hour_line(latitude, declination, LST_noon - 12, solar_longitude, solar_longitude)
+    radius_frac = scale_m * 0.6
+
+    sign_index = zodiac_sign_index(solar_longitude)
+
+    return {
+        "hour_offsets": hours,
+        "equation_of_time_min": EoT,
+        "declination_deg": declination,
+        "solar_longitude_deg": solar_longitude,
+        "local_solar_noon_hours": LST_noon,
+        "zodiac_sign_index": sign_index,
+        "zodiac_sign": zodiac_sign_names[sign_index],
+        "hour_line_angle_deg": hour_angles,
+        "solar_time_line_angle_deg": theta_frac,
+        "solar_time_line_end_x_m": radius_frac * np.sin(np.radians(theta_frac)),
+        "solar_time_line_end_y_m": radius_frac * np.cos(np.radians(theta_frac)),
+    }
 
-print(f"✅ Rasivalaya Yantra generated!")
-print(f"🌟 Current Zodiac Sign: {current_sign['name'] if current_sign else 'Unknown'}")
-print(f"☀️ Solar Time: {LST_str}")
-print(f"🔄 Solar Longitude: {solar_longitude:.1f}°")
-print(f"📊 JSON saved as rasivalaya_yantra.json")
\ No newline at end of file
+def summarize_rasivalaya_yantra(result):
+    """Console summary of a computed Rasivalaya Yantra"""
+    return "\n".join([
+        f"✅ Rasivalaya Yantra generated!",
+        f"🌟 Current Zodiac Sign: {result['current_zodiac_sign']}",
+        f"☀️ Solar Time: {result['solar_time_highlighted']}",
+        f"🔄 Solar Longitude: {result['solar_longitude']:.1f}°",
+    ])
+
+# ====== FIGURE ======
+def draw_rasivalaya_yantra(ax, result):
+    """Draw a computed Rasivalaya Yantra onto a matplotlib Axes"""
+    from matplotlib.patches import Circle
+
+    latitude = result["latitude"]
+    longitude = result["longitude"]
+    components = result["components"]
+    yantra_radius = components["yantra"]["radius_m"]
+    gnomon_height = components["gnomon"]["height_m"]
+    declination = result["solar_declination"]
+    solar_longitude = result["astronomical_data"]["solar_longitude_deg"]
+    theta_frac = components["current_sun_position"]["angle_deg"]
+    current_sign_name = result["current_zodiac_sign"]
+
+    # ====== DRAW ZODIAC SEGMENTS ======
+    zodiac_segments = create_zodiac_segments(yantra_radius, yantra_astro.axes_tolerance(ax, yantra_radius * 2.6))
+    for segment in zodiac_segments:
+        # Fill zodiac segment
+        ax.fill(segment["x_coords"], segment["y_coords"],
+               color=segment["color"], alpha=0.3, edgecolor='black', linewidth=0.5)
+
+        # Add zodiac sign labels
+        text_angle = np.radians(segment["center_angle"])
+        text_x = segment["text_radius"] * np.cos(text_angle)
+        text_y = segment["text_radius"] * np.sin(text_angle)
+
+        # Rotate text to follow the arc
+        rotation = segment["center_angle"] + 90
+        if rotation > 90 and rotation < 270:
+            rotation += 180
+
+        ax.text(text_x, text_y, segment["sign"].split('(')[0],
+               rotation=rotation, ha='center', va='center', fontsize=8, fontweight='bold')
+
+    # ====== HIGHLIGHT CURRENT ZODIAC SIGN ======
+    current_segment = next((seg for seg in zodiac_segments if seg["sign"] == current_sign_name), None)
+    if current_segment:
+        ax.fill(current_segment["x_coords"], current_segment["y_coords"],
+               color=current_segment["color"], alpha=0.7, edgecolor='red', linewidth=3)
+
+    # ====== DRAW PLATFORM CIRCLES ======
+    # Outer boundary
+    outer_circle = Circle((0,0), yantra_radius, fill=False, color='black', linewidth=3)
+    ax.add_patch(outer_circle)
+
+    # Inner measurement circle
+    inner_circle = Circle((0,0), yantra_radius * 0.6, fill=False, color='gray', linewidth=2, linestyle='--')
+    ax.add_patch(inner_circle)
+
+    # Central gnomon base
+    gnomon_base = Circle((0,0), yantra_radius * 0.05, fill=True, color='saddlebrown')
+    ax.add_patch(gnomon_base)
+
+    # ====== DRAW HOUR LINES ======
+    for line in components["hour_lines"]:
+        x0, y0 = line['start']
+        x1, y1 = line['end']
+        ax.plot([x0,x1],[y0,y1], color='darkred', linewidth=1.5, alpha=0.8)
+
+        # Add time labels
+        label_radius = yantra_radius * 0.65
+        label_x = label_radius * np.sin(np.radians(line['angle_deg']))
+        label_y = label_radius * np.cos(np.radians(line['angle_deg']))
+        ax.text(label_x, label_y, line['time'], ha='center', va='center',
+               fontsize=8, bbox=dict(boxstyle="round,pad=0.2", facecolor='white', alpha=0.8))
+
+    # ====== DRAW SEASONAL CURVES ======
+    seasonal_curves = create_seasonal_curves(latitude, yantra_radius, solar_longitude)
+    for curve in seasonal_curves:
+        points = np.array(curve["points"])
+        ax.plot(points[:,0], points[:,1], color=curve["color"],
+               linewidth=2, alpha=0.7, label=curve["name"])
+
+    # ====== CURRENT SOLAR TIME LINE ======
+    x_end_frac = components["current_sun_position"]["x_pos"]
+    y_end_frac = components["current_sun_position"]["y_pos"]
+    ax.plot([0, x_end_frac], [0, y_end_frac], color='gold', linewidth=4,
+            label=f"Current Solar Time: {result['solar_time_highlighted']}")
+
+    # Add sun symbol at the end
+    ax.scatter(x_end_frac, y_end_frac, color='gold', s=200, marker='*',
+              edgecolors='orange', linewidth=2, zorder=10, label='Sun Position')
+
+    # ====== GNOMON ======
+    # The gnomon is tilted at latitude angle
+    gnomon_top_x = gnomon_height * np.sin(np.radians(latitude))
+    gnomon_top_y = gnomon_height * np.cos(np.radians(latitude))
+
+    ax.plot([0, gnomon_top_x], [0, gnomon_top_y], color='darkblue',
+            linewidth=6, label=f'Gnomon (tilted {latitude:.1f}°)')
+
+    # Gnomon shadow based on sun position
+    shadow_length = gnomon_height / np.tan(np.radians(90 - abs(declination)))
+    shadow_x = shadow_length * np.sin(np.radians(theta_frac))
+    shadow_y = shadow_length * np.cos(np.radians(theta_frac))
+    ax.plot([0, shadow_x], [0, shadow_y], color='gray', linewidth=3,
+            alpha=0.6, linestyle=':', label='Gnomon Shadow')
+
+    # ====== DIRECTIONAL MARKERS ======
+    directions = ['N', 'E', 'S', 'W']
+    dir_angles = [90, 0, -90, 180]
+    for direction, angle in zip(directions, dir_angles):
+        dir_radius = yantra_radius * 1.1
+        dir_x = dir_radius * np.cos(np.radians(angle))
+        dir_y = dir_radius * np.sin(np.radians(angle))
+        ax.text(dir_x, dir_y, direction, ha='center', va='center',
+               fontsize=12, fontweight='bold',
+               bbox=dict(boxstyle="circle,pad=0.3", facecolor='lightblue'))
+
+    # ====== FINAL STYLING ======
+    ax.set_aspect('equal')
+    ax.set_xlim(-yantra_radius*1.3, yantra_radius*1.3)
+    ax.set_ylim(-yantra_radius*1.3, yantra_radius*1.3)
+
+    ax.set_title(f"Rasivalaya Yantra - {current_sign_name if current_segment else 'Unknown Rashi'}\n"
+                 f"Location: {latitude:.2f}°N, {longitude:.2f}°E | Date: {result['date']}\n"
+                 f"Solar Longitude: {solar_longitude:.1f}° | Declination: {declination:.2f}°",
+                 fontsize=14, pad=20)
+
+    ax.set_xlabel("East-West (meters)", fontsize=12)
+    ax.set_ylabel("North-South (meters)", fontsize=12)
+    ax.legend(loc='upper left', bbox_to_anchor=(1.05, 1), fontsize=10)
+    ax.grid(True, alpha=0.3)
+    ax.figure.tight_layout()
+
+# ====== SCRIPT MODE ======
+def main():
+    import matplotlib.pyplot as plt
+
+    latitude = float(input("Enter Latitude (e.g., 28.6139): "))
+    longitude = float(input("Enter Longitude (e.g., 77.2090): "))
+    scale_m = float(input("Enter scale (meters, e.g., 5.0): "))
+    date_str = input("Enter date (YYYY-MM-DD): ")
+
+    output = compute_rasivalaya_yantra(latitude, longitude, scale_m, date_str)
+
+    fig, ax = plt.subplots(1, 1, figsize=FIGURE_SIZE)
+    draw_rasivalaya_yantra(ax, output)
+    plt.show()
+
+    with open("rasivalaya_yantra.json", "w") as f:
+        json.dump(output, f, indent=2)
+
+    print(summarize_rasivalaya_yantra(output))
+    print(f"📊 JSON saved as rasivalaya_yantra.json")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import numpy as np
+import yantra_astro
+import json
+import os
+import tempfile
+from datetime import datetime
+
+from Samrat_Yantra_Calcs import hour_line_angle
+from rama_yantra import project_celestial_body
+
+# ====== CONSTANTS ======
+standard_meridian = yantra_astro.STANDARD_MERIDIAN  # IST
+MINUTES_PER_DAY = 1440
+CHUNK_DAYS = 32  # days computed per chunk; bounds peak memory to a few MB
+
+# Channels of the grid's last axis
+GRID_CHANNELS = ["altitude_deg", "azimuth_deg", "samrat_angle_deg"]
+ALTITUDE, AZIMUTH, SAMRAT_ANGLE = range(len(GRID_CHANNELS))
+
+# ====== GRID GENERATION ======
+def year_grid_name(latitude, longitude, year, version=0):
+    """
+    File name of a site's grid, stable for the same site, year, ephemeris
+    backend and result version (so grids from older code are not reused)
+    """
+    backend = yantra_astro.get_ephemeris_backend()
+    return f"solar_grid_v{version}_{latitude:+.4f}_{longitude:+.4f}_{year}_{backend}.npy"
+
+def generate_year_grid(latitude, longitude, year, path, chunk_days=CHUNK_DAYS):
+    """
+    Sun's altitude, azimuth and Samrat hour-line angle at every clock
+    minute of every day of a year, written to a memory-mapped .npy file
+    of shape (days, 1440, 3) float32. Days are computed chunk_days at a
+    time, so memory stays bounded regardless of grid size.
+    """
+    first_day = np.datetime64(f"{year}-01-01", "D")
+    days = int((np.datetime64(f"{year + 1}-01-01", "D") - first_day).astype(int))
+    clock_hours = np.arange(MINUTES_PER_DAY) / 60
+
+    # Write to a temporary file of our own and rename, so readers never see
+    # a partial grid and concurrent writers never share a file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    os.close(fd)
+    try:
+        grid = np.lib.format.open_memmap(tmp_path, mode="w+", dtype="<f4",
+                                         shape=(days, MINUTES_PER_DAY, len(GRID_CHANNELS)))
+        for start in range(0, days, chunk_days):
+            dates = first_day + np.arange(start, min(start + chunk_days, days))[:, None]
+            sun = yantra_astro.solar_position(dates, clock_hours[None, :],
+                                              latitude, longitude, standard_meridian)
+            chunk = grid[start:start + dates.shape[0]]
+            chunk[..., ALTITUDE] = sun["altitude_deg"]
+            chunk[..., AZIMUTH] = sun["azimuth_deg"]
+            chunk[..., SAMRAT_ANGLE] = hour_line_angle(latitude, sun["declination_deg"],
+                                                       sun["hour_angle_deg"] / 15)
+        grid.flush()
+        del grid
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return path
+
+def load_year_grid(path):
+    """Open a generated grid read-only without loading it into memory"""
+    return np.load(path, mmap_mode="r")
+
+# ====== DERIVED CURVES ======
+def derive_analemma(grid, clock_time="12:00", yantra_radius=1.0):
+    """
+    The analemma: the sun's position at the same clock time on every day
+    of the year, a figure-eight in altitude/azimuth. Rama face
+    coordinates are given for a yantra of yantra_radius.
+    """
+    time_obj = datetime.strptime(clock_time, "%H:%M")
+    minute = time_obj.hour * 60 + time_obj.minute
+    altitude = np.asarray(grid[:, minute, ALTITUDE], dtype=np.float64)
+    azimuth = np.asarray(grid[:, minute, AZIMUTH], dtype=np.float64)
+    x, y = project_celestial_body(altitude, azimuth, yantra_radius)
+    return {
+        "clock_time": clock_time,
+        "altitude_deg": altitude,
+        "azimuth_deg": azimuth,
+        "samrat_angle_deg": np.asarray(grid[:, minute, SAMRAT_ANGLE], dtype=np.float64),
+        "rama_x_m": x,
+        "rama_y_m": y,
+        "above_horizon": altitude > 0,
+    }
+
+def derive_seasonal_envelope(grid, chunk_days=CHUNK_DAYS):
+    """
+    Highest and lowest solar altitude reached at each clock minute over
+    the year (the summer and winter bounds of the daily sun paths), plus
+    the days they occur on. Reduced chunk by chunk over the memmap.
+    """
+    minutes = grid.shape[1]
+    high = np.full(minutes, -np.inf)
+    low = np.full(minutes, np.inf)
+    high_day = np.zeros(minutes, dtype=np.int64)
+    low_day = np.zeros(minutes, dtype=np.int64)
+
+    for start in range(0, grid.shape[0], chunk_days):
+        altitude = np.asarray(grid[start:start + chunk_days, :, ALTITUDE])
+        chunk_high = altitude.max(axis=0)
+        chunk_low = altitude.min(axis=0)
+        higher = chunk_high > high
+        lower = chunk_low < low
+        high = np.where(higher, chunk_high, high)
+        low = np.where(lower, chunk_low, low)
+        high_day = np.where(higher, altitude.argmax(axis=0) + start + 1, high_day)
+        low_day = np.where(lower, altitude.argmin(axis=0) + start + 1, low_day)
+
+    return {
+        "clock_minutes": np.arange(minutes),
+        "max_altitude_deg": high,
+        "max_altitude_day": high_day,
+        "min_altitude_deg": low,
+        "min_altitude_day": low_day,
+    }
+
+def summarize_year_grid(grid, analemma, envelope):
+    """Compact JSON-serialisable description of a grid and its derived curves"""
+    visible = analemma["above_horizon"]
+    return {
+        "shape": list(grid.shape),
+        "channels": GRID_CHANNELS,
+        "dtype": "float32",
+        "analemma": {
+            "clock_time": analemma["clock_time"],
+            "days": int(visible.size),
+            "altitude_range_deg": [float(analemma["altitude_deg"].min()),
+                                   float(analemma["altitude_deg"].max())],
+            "azimuth_range_deg": [float(analemma["azimuth_deg"][visible].min()),
+                                  float(analemma["azimuth_deg"][visible].max())] if visible.any() else None,
+            "altitude_deg": np.round(analemma["altitude_deg"], 3).tolist(),
+            "azimuth_deg": np.round(analemma["azimuth_deg"], 3).tolist(),
+            "samrat_angle_deg": np.round(analemma["samrat_angle_deg"], 3).tolist(),
+            "rama_x_m": np.round(analemma["rama_x_m"], 4).tolist(),
+            "rama_y_m": np.round(analemma["rama_y_m"], 4).tolist(),
+        },
+        "seasonal_envelope": {
+            "max_altitude_deg": np.round(envelope["max_altitude_deg"], 3).tolist(),
+            "max_altitude_day": envelope["max_altitude_day"].tolist(),
+            "min_altitude_deg": np.round(envelope["min_altitude_deg"], 3).tolist(),
+            "min_altitude_day": envelope["min_altitude_day"].tolist(),
+        },
+    }
+
+# ====== SCRIPT MODE ======
+def main():
+    latitude = float(input("Enter Latitude (e.g., 26.9124): "))
+    longitude = float(input("Enter Longitude (e.g., 75.7873): "))
+    year = int(input("Enter year (e.g., 2024): "))
+
+    output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "yantra_outputs")
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, year_grid_name(latitude, longitude, year))
+    generate_year_grid(latitude, longitude, year, path)
+
+    grid = load_year_grid(path)
+    summary = summarize_year_grid(grid, derive_analemma(grid), derive_seasonal_envelope(grid))
+    with open("solar_year_grid.json", "w") as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"✅ Year grid {tuple(grid.shape)} written to {path}; "
+          f"analemma and seasonal envelope saved as solar_year_grid.json")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Shared, array-first astronomy for the yantra modules.
+
+Every function takes scalars or NumPy arrays (of timestamps, day numbers,
+sites) and broadcasts them, so the same code serves a single request and
+a year-long grid. Equation of time, declination and solar longitude for
+dates come from solar_ephemeris(), backed by a memory-mapped daily table
+by default or by Chebyshev fits to a high-accuracy reference sun (see
+ephemeris.py). Run `python -m yantra_astro.benchmark` from yantra_files
+to measure throughput.
+"""
+from .coordinates import equatorial_to_horizontal, hour_angle_to_horizontal
+from .sidereal import (J2000_EPOCH, SIDEREAL_RATE, days_since_j2000,
+                       greenwich_sidereal_time, local_sidereal_time)
+from .solar import (STANDARD_MERIDIAN, OBLIQUITY_DEG, day_of_year, equation_of_time,
+                    solar_declination, solar_longitude, longitude_correction, local_solar_time,
+                    solar_hour_angle, sunrise_hour_angle, altitude_hour_angle, solar_position)
+from .ephemeris import (EPHEMERIS_BACKENDS, solar_ephemeris, set_ephemeris_backend,
+                        get_ephemeris_backend, preload_ephemeris, load_ephemeris_table,
+                        build_ephemeris_table, sidereal_time)
+from .chebyshev import (chebyshev_ephemeris, fit_chebyshev_ephemeris,
+                        load_chebyshev_coefficients)
+from .reference import reference_ephemeris
+from .precession import (mean_obliquity, nutation, precession_matrix, nutation_matrix,
+                         apparent_frame, equatorial_vectors, vectors_to_equatorial,
+                         rotate_equatorial, catalog_frame_zenith)
+from .events import crossing_brackets, refine_roots
+from .tessellation import (screen_tolerance, axes_tolerance, fabrication_tolerance,
+                           unit_circle_table, arc_points, circle_points, annulus_sector,
+                           outline_json)
+from .polyline import encode_polylines, decode_polyline
+from .igrf import igrf_declination, load_igrf_coefficients
+from .magnetic import (build_declination_grid, declination_grid_path, load_declination_grid,
+                       decimal_year, interpolate_declination)
+from .stars import (STAR_DTYPE, StarCatalog, star_catalog_from_records, load_star_catalog,
+                    pack_star_catalog, read_csv_catalog, horizontal_positions, star_labels)
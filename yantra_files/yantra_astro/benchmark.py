@@ -0,0 +1,60 @@
+"""
+Throughput benchmark for the yantra_astro kernels.
+
+    python -m yantra_astro.benchmark [N]
+
+Evaluates each kernel over N random sites/timestamps (default one
+million) and prints millions of evaluations per second.
+"""
+import sys
+import time
+
+import numpy as np
+
+import yantra_astro
+
+def timed(fn, repeat=3):
+    """Best wall time of several runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    latitude = rng.uniform(-60, 60, n)
+    longitude = rng.uniform(-180, 180, n)
+    doy = rng.integers(1, 366, n)
+    eot = yantra_astro.equation_of_time(doy)
+    hours = rng.uniform(0, 24, n)
+    timestamps = np.datetime64("2024-01-01T00:00:00") + rng.integers(0, 366 * 86400, n).astype("timedelta64[s]")
+    dates = timestamps.astype("datetime64[D]")
+    ra = rng.uniform(0, 24, n)
+    dec = rng.uniform(-90, 90, n)
+    lst = rng.uniform(0, 24, n)
+
+    kernels = {
+        "day_of_year": lambda: yantra_astro.day_of_year(timestamps),
+        "equation_of_time": lambda: yantra_astro.equation_of_time(doy),
+        "solar_declination": lambda: yantra_astro.solar_declination(doy),
+        "ephemeris[formula]": lambda: yantra_astro.solar_ephemeris(timestamps, "formula"),
+        "ephemeris[table]": lambda: yantra_astro.solar_ephemeris(timestamps, "table"),
+        "ephemeris[chebyshev]": lambda: yantra_astro.solar_ephemeris(timestamps, "chebyshev"),
+        "local_solar_time": lambda: yantra_astro.local_solar_time(hours, eot, longitude),
+        "solar_position": lambda: yantra_astro.solar_position(dates, hours, latitude, longitude),
+        "sidereal_time": lambda: yantra_astro.local_sidereal_time(
+            yantra_astro.greenwich_sidereal_time(yantra_astro.days_since_j2000(timestamps), hours), longitude),
+        "sidereal_time[table]": lambda: yantra_astro.sidereal_time(timestamps, longitude),
+        "equatorial_to_horizontal": lambda: yantra_astro.equatorial_to_horizontal(ra, dec, lst, latitude),
+    }
+
+    print(f"{'kernel':<28}{'seconds':>10}{'M evals/s':>12}")
+    for name, kernel in kernels.items():
+        seconds = timed(kernel)
+        print(f"{name:<28}{seconds:>10.4f}{n / seconds / 1e6:>12.1f}")
+
+if __name__ == "__main__":
+    main()
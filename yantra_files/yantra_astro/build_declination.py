@@ -0,0 +1,41 @@
+"""
+Offline build of the magnetic declination grid.
+
+    python -m yantra_astro.build_declination
+
+Samples the bundled IGRF coefficients at every grid node (into
+YANTRA_DECLINATION_GRID if set, else the default grid file), then
+reports how far grid interpolation strays from evaluating IGRF directly
+at random sites and dates, away from and near the magnetic poles.
+"""
+import os
+import time
+
+import numpy as np
+
+from . import magnetic
+from .igrf import igrf_declination
+
+def main():
+    start = time.perf_counter()
+    path = magnetic.build_declination_grid(igrf_declination,
+                                           os.environ.get("YANTRA_DECLINATION_GRID", magnetic.DEFAULT_GRID_PATH))
+    print(f"Built {magnetic.GRID_SHAPE} declination grid {path} in {time.perf_counter() - start:.1f} s")
+
+    rng = np.random.default_rng(1)
+    latitude = np.degrees(np.arcsin(rng.uniform(-1, 1, 200_000)))  # uniform over the sphere
+    longitude = rng.uniform(-180, 180, latitude.size)
+    year = rng.uniform(magnetic.GRID_EPOCHS[0], magnetic.GRID_EPOCHS[-1], latitude.size)
+    grid = magnetic.load_declination_grid(path)
+    error = (magnetic.interpolate_declination(grid, latitude, longitude, year)
+             - igrf_declination(latitude, longitude, year) + 180) % 360 - 180
+
+    print(f"{'latitudes':<14}{'sites':>10}{'median':>10}{'p99':>10}{'max':>10}")
+    print(f"{'':<14}{'':>10}{'deg':>10}{'deg':>10}{'deg':>10}")
+    for label, band in [("|lat| <= 60", np.abs(latitude) <= 60), ("|lat| > 60", np.abs(latitude) > 60)]:
+        band_error = np.abs(error[band])
+        print(f"{label:<14}{band.sum():>10}{np.median(band_error):>10.3g}"
+              f"{np.percentile(band_error, 99):>10.3g}{band_error.max():>10.3g}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Equatorial to horizontal coordinate conversion, array first.
+Azimuths are measured from North through East, in degrees.
+"""
+import numpy as np
+
+def hour_angle_to_horizontal(hour_angle_deg, dec_deg, lat_deg):
+    """
+    Altitude and azimuth (degrees) of a body at a given hour angle and
+    declination, seen from latitude lat_deg
+    """
+    ha_rad = np.radians(hour_angle_deg)
+    dec_rad = np.radians(dec_deg)
+    lat_rad = np.radians(lat_deg)
+
+    sin_alt = np.sin(dec_rad) * np.sin(lat_rad) + np.cos(dec_rad) * np.cos(lat_rad) * np.cos(ha_rad)
+    altitude = np.degrees(np.arcsin(np.clip(sin_alt, -1, 1)))
+
+    # Azimuth is undefined at the zenith and poles; clip keeps it finite
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_az = (np.sin(dec_rad) - np.sin(lat_rad) * sin_alt) / (np.cos(lat_rad) * np.cos(np.radians(altitude)))
+    azimuth = np.degrees(np.arccos(np.clip(np.nan_to_num(cos_az), -1, 1)))
+
+    # Bodies west of the meridian (positive hour angle) have azimuth > 180°
+    azimuth = np.where(np.sin(ha_rad) > 0, 360 - azimuth, azimuth)
+    return altitude, azimuth
+
+def equatorial_to_horizontal(ra_hours, dec_deg, lst_hours, lat_deg):
+    """Altitude and azimuth (degrees) of a body from its RA/Dec and the local sidereal time"""
+    hour_angle = (np.asarray(lst_hours) - ra_hours) * 15
+    return hour_angle_to_horizontal(hour_angle, dec_deg, lat_deg)
@@ -0,0 +1,194 @@
+"""
+Solar ephemeris backends.
+
+solar_ephemeris(timestamps) returns the equation of time, solar
+declination and solar longitude for any array of dates/timestamps using
+the selected backend:
+
+    formula    evaluate the day-of-year formulas; mean solar longitude,
+               up to ~2° from the apparent one
+    table      interpolate a precomputed daily table for 1900-2100
+               (default); apparent solar longitude from the reference sun
+    chebyshev  evaluate polynomials fitted to the high-accuracy reference
+               sun (see chebyshev.py); sub-arcsecond, true solar longitude
+
+The table is a compact binary .npy (one row per day: EoT, declination,
+solar longitude, GMST at 0h UT, the last read by sidereal_time()) that
+is built on first use, then memory-mapped, so every
+worker process on a host shares the same pages. Dates outside the table
+fall back to the formulas. Select a backend with set_ephemeris_backend()
+or the YANTRA_EPHEMERIS_BACKEND environment variable.
+"""
+import os
+import threading
+
+import numpy as np
+
+from .sidereal import (SIDEREAL_RATE, days_since_j2000, greenwich_sidereal_time,
+                       local_sidereal_time)
+from .solar import day_of_year, equation_of_time, solar_declination, solar_longitude
+from .chebyshev import chebyshev_ephemeris, load_chebyshev_coefficients
+from .reference import reference_ephemeris
+
+# ====== TABLE LAYOUT ======
+TABLE_START = np.datetime64("1900-01-01", "D")
+TABLE_END = np.datetime64("2101-01-01", "D")  # exclusive
+TABLE_DAYS = int((TABLE_END - TABLE_START).astype(np.int64))
+TABLE_DTYPE = np.dtype([
+    ("equation_of_time_min", "<f8"),
+    ("declination_deg", "<f8"),
+    ("solar_longitude_deg", "<f8"),
+    ("gmst0_hours", "<f8"),
+])
+# v2: solar_longitude_deg is the apparent longitude (v1 held the mean one)
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data",
+                                  "ephemeris_daily_1900_2100_v2.npy")
+
+_table = None
+_table_lock = threading.Lock()
+
+# ====== TABLE BUILD & LOAD ======
+def build_ephemeris_table(path):
+    """
+    Compute the daily table and write it atomically: EoT and declination
+    from the formulas, the apparent solar longitude from the reference
+    sun (about half a second for the 201 years)
+    """
+    dates = np.arange(TABLE_START, TABLE_END)
+    table = np.empty(dates.size, dtype=TABLE_DTYPE)
+    for name, values in formula_ephemeris(dates).items():
+        table[name] = values
+    table["solar_longitude_deg"] = reference_ephemeris(dates)["solar_longitude_deg"]
+    table["gmst0_hours"] = greenwich_sidereal_time(days_since_j2000(dates), 0)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+    return path
+
+def load_ephemeris_table(path=None):
+    """
+    Memory-map the daily table, building it first if the file is missing.
+    The mapping is opened once per process and reused.
+    """
+    global _table
+    with _table_lock:
+        if _table is None:
+            path = path or os.environ.get("YANTRA_EPHEMERIS_TABLE", DEFAULT_TABLE_PATH)
+            if not os.path.exists(path):
+                build_ephemeris_table(path)
+            table = np.load(path, mmap_mode="r")
+            if table.dtype != TABLE_DTYPE or table.shape != (TABLE_DAYS,):
+                build_ephemeris_table(path)
+                table = np.load(path, mmap_mode="r")
+            _table = table
+        return _table
+
+def table_lookup(timestamps, field, period=None):
+    """
+    Linearly interpolate one table column at datetime64 timestamps.
+    Angles that wrap (period=360) are interpolated the short way round.
+    Returns (values, in_range); values outside the table are NaN.
+    """
+    table = load_ephemeris_table()
+    days = (np.asarray(timestamps, dtype="datetime64[s]") - TABLE_START).astype(np.float64) / 86400.0
+    in_range = (days >= 0) & (days <= table.shape[0] - 1)
+
+    index = np.clip(np.floor(days), 0, table.shape[0] - 2).astype(np.int64)
+    frac = np.where(in_range, days - index, 0.0)
+    column = table[field]
+    step = column[index + 1] - column[index]
+    if period:
+        step = (step + period / 2) % period - period / 2
+    values = column[index] + step * frac
+    if period:
+        values = values % period
+    return np.where(in_range, values, np.nan), in_range
+
+# ====== BACKENDS ======
+def formula_ephemeris(timestamps):
+    """EoT (minutes), declination and mean solar longitude (degrees) from the day-of-year formulas"""
+    doy = day_of_year(timestamps)
+    return {
+        "equation_of_time_min": equation_of_time(doy),
+        "declination_deg": solar_declination(doy),
+        "solar_longitude_deg": solar_longitude(doy),
+    }
+
+def table_ephemeris(timestamps):
+    """
+    EoT, declination and apparent solar longitude interpolated from the
+    daily table (formula values, with the mean longitude, outside it)
+    """
+    timestamps = np.asarray(timestamps, dtype="datetime64[s]")
+    result = {}
+    for name, period in [("equation_of_time_min", None), ("declination_deg", None),
+                         ("solar_longitude_deg", 360)]:
+        result[name], in_range = table_lookup(timestamps, name, period)
+    if not in_range.all():
+        fallback = formula_ephemeris(timestamps[~in_range])
+        for name, values in result.items():
+            values[~in_range] = fallback[name]
+    return result
+
+def sidereal_time(timestamps, longitude):
+    """
+    (GMST, LST) in hours at UT timestamps: the 0h series at the start of
+    each date plus the sidereal rate over the hours elapsed since. With
+    the table backend, 0h GMST is read from the table's gmst0_hours
+    column; dates outside the table (and other backends) use the series.
+    """
+    timestamps = np.asarray(timestamps, dtype="datetime64[s]")
+    midnight = timestamps.astype("datetime64[D]")
+    hours = (timestamps - midnight).astype(np.float64) / 3600.0
+    if _backend == "table":
+        day = (midnight - TABLE_START).astype(np.int64)
+        in_range = (day >= 0) & (day < TABLE_DAYS)
+        gmst0 = np.array(load_ephemeris_table()["gmst0_hours"][np.clip(day, 0, TABLE_DAYS - 1)])
+        if not in_range.all():
+            gmst0[~in_range] = greenwich_sidereal_time(days_since_j2000(midnight[~in_range]), 0)
+    else:
+        gmst0 = greenwich_sidereal_time(days_since_j2000(midnight), 0)
+    gmst = (gmst0 + SIDEREAL_RATE * hours) % 24
+    return gmst, local_sidereal_time(gmst, longitude)
+
+EPHEMERIS_BACKENDS = {
+    "formula": formula_ephemeris,
+    "table": table_ephemeris,
+    "chebyshev": chebyshev_ephemeris,
+}
+
+# Data files each backend maps; the formula backend needs none
+EPHEMERIS_LOADERS = {
+    "table": load_ephemeris_table,
+    "chebyshev": load_chebyshev_coefficients,
+}
+
+_backend = os.environ.get("YANTRA_EPHEMERIS_BACKEND", "table")
+
+def set_ephemeris_backend(name):
+    """Select the backend used by solar_ephemeris for this process"""
+    global _backend
+    if name not in EPHEMERIS_BACKENDS:
+        raise ValueError(f"Unknown ephemeris backend: {name}")
+    _backend = name
+
+def get_ephemeris_backend():
+    return _backend
+
+def preload_ephemeris(backend=None):
+    """Map the selected backend's data file now rather than on first use"""
+    loader = EPHEMERIS_LOADERS.get(backend or _backend)
+    if loader:
+        loader()
+
+def solar_ephemeris(timestamps, backend=None):
+    """
+    Equation of time (minutes), solar declination and solar longitude
+    (degrees) for dates or timestamps, from the selected backend.
+    Scalars in, scalars out.
+    """
+    result = EPHEMERIS_BACKENDS[backend or _backend](timestamps)
+    return {name: values[()] for name, values in result.items()}
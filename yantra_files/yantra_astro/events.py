@@ -0,0 +1,43 @@
+"""
+Event finding (rising, setting, culmination) for many bodies at once.
+
+A function of time is sampled on a coarse grid for every body in one
+broadcast; grid intervals where it changes sign bracket the events, and
+all brackets are then refined together by bisection, one vectorized
+function evaluation per iteration. Events closer together than the grid
+step (a body grazing the horizon) can be missed, so the step should be
+well below the shortest interval of interest.
+"""
+import numpy as np
+
+def crossing_brackets(values, max_jump=None):
+    """
+    Grid intervals (time index, body) where values (time x body) cross
+    zero upward and downward. max_jump excludes intervals whose change is
+    a wrap-around (e.g. an hour angle passing ±12h) rather than a crossing.
+    Returns (rising, falling), each a (time index, body) pair of arrays.
+    """
+    before, after = values[:-1], values[1:]
+    valid = True if max_jump is None else np.abs(after - before) < max_jump
+    rising = np.nonzero((before < 0) & (after >= 0) & valid)
+    falling = np.nonzero((before >= 0) & (after < 0) & valid)
+    return rising, falling
+
+def refine_roots(f, lo, hi, body, tolerance):
+    """
+    Roots of f(t, body) inside brackets [lo, hi] (arrays, one per bracket)
+    by simultaneous bisection until every bracket is narrower than
+    tolerance. f must take arrays of times and body indices.
+    """
+    lo, hi = np.array(lo, dtype=np.float64), np.array(hi, dtype=np.float64)
+    if lo.size == 0:
+        return lo
+    f_lo = f(lo, body)
+    iterations = int(np.ceil(np.log2(max(np.max(hi - lo), tolerance) / tolerance)))
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        f_mid = f(mid, body)
+        same_side = np.sign(f_mid) == np.sign(f_lo)
+        lo, f_lo = np.where(same_side, mid, lo), np.where(same_side, f_mid, f_lo)
+        hi = np.where(same_side, hi, mid)
+    return (lo + hi) / 2
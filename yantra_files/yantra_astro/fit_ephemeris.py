@@ -0,0 +1,42 @@
+"""
+Offline build of the ephemeris data files.
+
+    python -m yantra_astro.fit_ephemeris
+
+Rebuilds the daily table and refits the Chebyshev coefficients, then
+reports each backend's largest deviation from the reference sun at
+random instants between the fitting nodes.
+"""
+import os
+import time
+
+import numpy as np
+
+from . import chebyshev, ephemeris
+from .reference import reference_ephemeris
+
+def main():
+    start = time.perf_counter()
+    ephemeris.build_ephemeris_table(os.environ.get("YANTRA_EPHEMERIS_TABLE", ephemeris.DEFAULT_TABLE_PATH))
+    chebyshev.fit_chebyshev_ephemeris(os.environ.get("YANTRA_CHEBYSHEV_COEFFICIENTS",
+                                                     chebyshev.DEFAULT_COEFFICIENTS_PATH))
+    print(f"Built table and fitted {chebyshev.SEGMENTS} Chebyshev segments "
+          f"(degree {chebyshev.DEGREE}) in {time.perf_counter() - start:.1f} s")
+
+    rng = np.random.default_rng(1)
+    span = int((chebyshev.CHEBYSHEV_END - chebyshev.CHEBYSHEV_START).astype("timedelta64[s]").astype(np.int64))
+    timestamps = chebyshev.CHEBYSHEV_START + rng.integers(0, span, 200_000).astype("timedelta64[s]")
+    reference = reference_ephemeris(timestamps)
+
+    print(f"{'backend':<12}{'longitude':>14}{'declination':>14}{'EoT':>12}")
+    print(f"{'':<12}{'arcsec':>14}{'arcsec':>14}{'seconds':>12}")
+    for name in ephemeris.EPHEMERIS_BACKENDS:
+        result = ephemeris.solar_ephemeris(timestamps, name)
+        lon = (result["solar_longitude_deg"] - reference["solar_longitude_deg"] + 180) % 360 - 180
+        dec = result["declination_deg"] - reference["declination_deg"]
+        eot = result["equation_of_time_min"] - reference["equation_of_time_min"]
+        print(f"{name:<12}{np.abs(lon).max() * 3600:>14.3g}{np.abs(dec).max() * 3600:>14.3g}"
+              f"{np.abs(eot).max() * 60:>12.3g}")
+
+if __name__ == "__main__":
+    main()
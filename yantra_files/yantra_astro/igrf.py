@@ -0,0 +1,141 @@
+"""
+Magnetic declination from the International Geomagnetic Reference Field.
+
+IGRF-14 (IAGA, 2024) gives the main field as Gauss coefficients of a
+degree-13 spherical harmonic expansion at 5-year epochs from 1900 to
+2025, plus a predicted 2030 epoch; coefficients vary linearly in time
+between epochs. They ship with the package as IGRF14.shc, the model's
+published coefficient file (https://doi.org/10.5281/zenodo.14012302).
+
+igrf_declination() evaluates the field at sea level on the WGS84
+ellipsoid for any broadcastable arrays of geodetic latitudes, longitudes
+and decimal years. Each term only broadcasts the axes it depends on, so
+a (years, latitudes, longitudes) grid costs little more than its output.
+It is used offline to sample the declination grid (magnetic.py); request
+paths interpolate that grid instead.
+"""
+import os
+import threading
+
+import numpy as np
+
+# ====== MODEL CONSTANTS ======
+DEFAULT_COEFFICIENTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "IGRF14.shc")
+REFERENCE_RADIUS_KM = 6371.2
+WGS84_A_KM = 6378.137
+WGS84_B_KM = 6356.7523142
+
+_models = {}
+_models_lock = threading.Lock()
+
+# ====== COEFFICIENTS ======
+def read_shc(path):
+    """
+    Parse a .shc coefficient file. Returns (epochs, g, h) with g and h of
+    shape (epochs, degree + 1, order + 1) in nT.
+    """
+    with open(path) as f:
+        lines = [line.split() for line in f if line.strip() and not line.startswith("#")]
+    max_degree, epoch_count = int(lines[0][1]), int(lines[0][2])
+    epochs = np.array(lines[1], dtype=np.float64)[:epoch_count]
+
+    g = np.zeros((epoch_count, max_degree + 1, max_degree + 1))
+    h = np.zeros_like(g)
+    for row in lines[2:]:
+        n, m = int(row[0]), int(row[1])
+        values = np.array(row[2:2 + epoch_count], dtype=np.float64)
+        if m >= 0:
+            g[:, n, m] = values
+        else:
+            h[:, n, -m] = values
+    return epochs, g, h
+
+def load_igrf_coefficients(path=None):
+    """IGRF coefficients (epochs, g, h), read once per process and path"""
+    path = os.path.abspath(path or DEFAULT_COEFFICIENTS_PATH)
+    with _models_lock:
+        if path not in _models:
+            _models[path] = read_shc(path)
+        return _models[path]
+
+def schmidt_factors(max_degree):
+    """Factors turning Gauss-normalised Legendre functions into Schmidt semi-normalised ones"""
+    factors = np.zeros((max_degree + 1, max_degree + 1))
+    factors[0, 0] = 1.0
+    for n in range(1, max_degree + 1):
+        factors[n, 0] = factors[n - 1, 0] * (2 * n - 1) / n
+        for m in range(1, n + 1):
+            factors[n, m] = factors[n, m - 1] * np.sqrt((n - m + 1) * (2 if m == 1 else 1) / (n + m))
+    return factors
+
+# ====== FIELD ======
+def geodetic_to_geocentric(latitude):
+    """
+    Geocentric radius (km) and the cosine and sine of the geocentric
+    colatitude for sea-level points at geodetic latitudes (degrees), with
+    the cosine and sine of the angle between the two verticals
+    """
+    sin_lat, cos_lat = np.sin(np.radians(latitude)), np.cos(np.radians(latitude))
+    a2, b2 = WGS84_A_KM ** 2, WGS84_B_KM ** 2
+    one, two = a2 * cos_lat ** 2, b2 * sin_lat ** 2
+    rho = np.sqrt(one + two)
+    radius = np.sqrt((a2 * one + b2 * two) / (one + two))
+    cos_d, sin_d = rho / radius, (a2 - b2) / rho * sin_lat * cos_lat / radius
+    cos_theta = sin_lat * cos_d - cos_lat * sin_d
+    sin_theta = cos_lat * cos_d + sin_lat * sin_d
+    return radius, cos_theta, sin_theta, cos_d, sin_d
+
+def igrf_declination(latitude, longitude, year, path=None):
+    """
+    Magnetic declination in degrees (positive = East) at sea level for
+    broadcastable arrays of geodetic latitudes, longitudes (degrees) and
+    decimal years. Years outside the model's epochs take the nearest one.
+    """
+    epochs, g, h = load_igrf_coefficients(path)
+    max_degree = g.shape[1] - 1
+    factors = schmidt_factors(max_degree)
+
+    # Coefficients at each year, linear between epochs: (*year.shape, n, m)
+    year = np.clip(np.asarray(year, dtype=np.float64), epochs[0], epochs[-1])
+    k = np.clip(np.searchsorted(epochs, year, side="right") - 1, 0, epochs.size - 2)
+    t = ((year - epochs[k]) / (epochs[k + 1] - epochs[k]))[..., None, None]
+    g_year = g[k] * (1 - t) + g[k + 1] * t
+    h_year = h[k] * (1 - t) + h[k + 1] * t
+
+    radius, ct, st, cos_d, sin_d = geodetic_to_geocentric(np.asarray(latitude, dtype=np.float64))
+    st = np.maximum(st, 1e-12)  # geographic poles: the limit along the meridian
+    phi = np.radians(np.asarray(longitude, dtype=np.float64))
+    ratio = REFERENCE_RADIUS_KM / radius
+
+    b_r = b_theta = b_phi = 0.0
+    # Gauss-normalised P(n, m) and dP/dθ by the standard recursions in n
+    # for each order m, starting from the sectoral P(m, m). Sums over n
+    # only involve latitude and year; longitude enters once per order.
+    p_mm, dp_mm = np.ones_like(ct), np.zeros_like(ct)
+    for m in range(max_degree + 1):
+        if m:
+            p_mm, dp_mm = st * p_mm, st * dp_mm + ct * p_mm
+        p, dp, p_prev, dp_prev = p_mm, dp_mm, 0.0, 0.0
+        radial_g = radial_h = polar_g = polar_h = azimuthal_g = azimuthal_h = 0.0
+        for n in range(m, max_degree + 1):
+            if n > m:
+                k_nm = ((n - 1) ** 2 - m ** 2) / ((2 * n - 1) * (2 * n - 3)) if n > 1 else 0.0
+                p, p_prev = ct * p - k_nm * p_prev, p
+                dp, dp_prev = ct * dp - st * p_prev - k_nm * dp_prev, dp
+            if n == 0:
+                continue
+            g_nm, h_nm = g_year[..., n, m], h_year[..., n, m]
+            scale = ratio ** (n + 2) * factors[n, m]
+            azimuthal_g, azimuthal_h = azimuthal_g + scale * p * g_nm, azimuthal_h + scale * p * h_nm
+            radial_g, radial_h = radial_g + (n + 1) * scale * p * g_nm, radial_h + (n + 1) * scale * p * h_nm
+            polar_g, polar_h = polar_g + scale * dp * g_nm, polar_h + scale * dp * h_nm
+
+        cos_m, sin_m = np.cos(m * phi), np.sin(m * phi)
+        b_r = b_r + radial_g * cos_m + radial_h * sin_m
+        b_theta = b_theta - (polar_g * cos_m + polar_h * sin_m)
+        b_phi = b_phi + m * (azimuthal_g * sin_m - azimuthal_h * cos_m)
+
+    # North component in the geodetic frame; east needs no rotation
+    north = -b_theta * cos_d - b_r * sin_d
+    east = b_phi / st
+    return np.degrees(np.arctan2(east, north))
@@ -0,0 +1,131 @@
+"""
+Gridded magnetic declination for batch lookups.
+
+Declination is stored as a float32 .npy of shape (epochs, latitudes,
+longitudes) on fixed axes: 1° in latitude (-90..90) and longitude
+(-180..180, both edges kept) at IGRF's 5-year epochs from 1900 to 2030
+(about 7 MB). The default grid is sampled from the bundled IGRF-14
+coefficients (igrf.py) on first use, or offline with
+
+    python -m yantra_astro.build_declination
+
+YANTRA_DECLINATION_GRID names a grid file to use instead, for example
+one sampled from the World Magnetic Model with build_declination_grid().
+The file is memory-mapped, so every worker process on a host shares the
+same pages. Lookups are bilinear in space and linear in time for any
+arrays of sites and dates; dates outside the epoch range take the
+nearest epoch. IGRF itself is linear in time between these epochs, so
+only the spatial interpolation departs from the model.
+"""
+import os
+import threading
+
+import numpy as np
+
+from .igrf import DEFAULT_COEFFICIENTS_PATH, igrf_declination
+
+# ====== GRID LAYOUT ======
+GRID_STEP_DEG = 1.0
+GRID_LATITUDES = np.arange(-90.0, 90.0 + GRID_STEP_DEG, GRID_STEP_DEG)
+GRID_LONGITUDES = np.arange(-180.0, 180.0 + GRID_STEP_DEG, GRID_STEP_DEG)
+GRID_EPOCH_STEP_YEARS = 5.0
+GRID_EPOCHS = np.arange(1900.0, 2030.0 + GRID_EPOCH_STEP_YEARS, GRID_EPOCH_STEP_YEARS)
+GRID_SHAPE = (GRID_EPOCHS.size, GRID_LATITUDES.size, GRID_LONGITUDES.size)
+DEFAULT_GRID_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data",
+                                 "magnetic_declination_igrf14_1900_2030.npy")
+
+_grids = {}
+_grids_lock = threading.Lock()
+
+# ====== GRID BUILD & LOAD ======
+def build_declination_grid(model=igrf_declination, path=DEFAULT_GRID_PATH):
+    """
+    Sample model(latitude, longitude, year), which must broadcast over
+    arrays, at every grid node and write the grid atomically (IGRF into
+    the default grid file unless told otherwise)
+    """
+    declination = model(GRID_LATITUDES[None, :, None], GRID_LONGITUDES[None, None, :],
+                        GRID_EPOCHS[:, None, None])
+    grid = np.broadcast_to(declination, GRID_SHAPE).astype("<f4")
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, grid)
+    os.replace(tmp_path, path)
+    return path
+
+def declination_grid_path():
+    """
+    The grid file named by YANTRA_DECLINATION_GRID, else the default IGRF
+    grid; None when neither that grid nor the IGRF coefficients to build
+    it are present
+    """
+    path = os.environ.get("YANTRA_DECLINATION_GRID")
+    if path:
+        return path
+    if os.path.exists(DEFAULT_GRID_PATH) or os.path.exists(DEFAULT_COEFFICIENTS_PATH):
+        return DEFAULT_GRID_PATH
+    return None
+
+def load_declination_grid(path=DEFAULT_GRID_PATH):
+    """
+    Memory-map a declination grid, opened once per process and path. The
+    default grid is built from IGRF first if the file is missing.
+    Raises ValueError if the file does not have the grid layout.
+    """
+    path = os.path.abspath(path)
+    with _grids_lock:
+        if path not in _grids:
+            if path == os.path.abspath(DEFAULT_GRID_PATH) and not os.path.exists(path):
+                build_declination_grid(igrf_declination, path)
+            grid = np.load(path, mmap_mode="r")
+            if grid.shape != GRID_SHAPE:
+                raise ValueError(f"Declination grid {path} has shape {grid.shape}, expected {GRID_SHAPE}")
+            _grids[path] = grid
+        return _grids[path]
+
+# ====== LOOKUP ======
+def decimal_year(timestamps):
+    """Dates or datetime64 timestamps as fractional years (2024-07-02 -> ~2024.5)"""
+    timestamps = np.asarray(timestamps, dtype="datetime64[s]")
+    year = timestamps.astype("datetime64[Y]")
+    start = year.astype("datetime64[s]")
+    length = (year + 1).astype("datetime64[s]") - start
+    return year.astype(np.float64) + 1970 + (timestamps - start) / length
+
+def _grid_cell(values, first, step, size):
+    """Lower node index and fraction towards the next node along one axis"""
+    position = (values - first) / step
+    index = np.clip(np.floor(position), 0, size - 2).astype(np.int64)
+    return index, position - index
+
+def interpolate_declination(grid, latitude, longitude, year):
+    """
+    Declination in degrees (positive = East) at any broadcastable arrays
+    of latitudes, longitudes and decimal years: bilinear between the four
+    surrounding nodes at the two bracketing epochs, then linear in time.
+    Nodes are taken relative to one corner the short way round, so cells
+    where declination wraps through ±180° (near the magnetic poles)
+    interpolate correctly.
+    """
+    latitude = np.clip(np.asarray(latitude, dtype=np.float64), -90, 90)
+    longitude = (np.asarray(longitude, dtype=np.float64) + 180) % 360 - 180
+    year = np.clip(np.asarray(year, dtype=np.float64), GRID_EPOCHS[0], GRID_EPOCHS[-1])
+    latitude, longitude, year = np.broadcast_arrays(latitude, longitude, year)
+
+    i, ty = _grid_cell(latitude, GRID_LATITUDES[0], GRID_STEP_DEG, GRID_LATITUDES.size)
+    j, tx = _grid_cell(longitude, GRID_LONGITUDES[0], GRID_STEP_DEG, GRID_LONGITUDES.size)
+    k, tt = _grid_cell(year, GRID_EPOCHS[0], GRID_EPOCH_STEP_YEARS, GRID_EPOCHS.size)
+
+    base = grid[k, i, j].astype(np.float64)
+
+    def node(epoch, lat_index, lon_index):
+        return (grid[epoch, lat_index, lon_index] - base + 180) % 360 - 180
+
+    def bilinear(epoch):
+        south = node(epoch, i, j) * (1 - tx) + node(epoch, i, j + 1) * tx
+        north = node(epoch, i + 1, j) * (1 - tx) + node(epoch, i + 1, j + 1) * tx
+        return south * (1 - ty) + north * ty
+
+    return (base + bilinear(k) * (1 - tt) + bilinear(k + 1) * tt + 180) % 360 - 180
@@ -0,0 +1,27 @@
+"""
+Convert a CSV star catalog to the packed, memory-mappable format.
+
+    python -m yantra_astro.pack_catalog stars.csv stars.npy
+
+The CSV needs a header with at least ra (hours), dec (degrees) and mag;
+name and constellation columns are kept when present.
+"""
+import sys
+
+import numpy as np
+
+from .stars import STAR_DTYPE, StarCatalog, pack_star_catalog, read_csv_catalog
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit(__doc__)
+    source, target = sys.argv[1:]
+    pack_star_catalog(read_csv_catalog(source), target)
+
+    catalog = StarCatalog(np.load(target, mmap_mode="r"))
+    occupied = int((np.diff(catalog.band_offsets) > 0).sum())
+    print(f"Packed {len(catalog)} stars ({STAR_DTYPE.itemsize} bytes each) into {target}; "
+          f"{occupied} of {len(catalog.band_offsets) - 1} declination bands occupied")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Sidereal time for the star yantras. Timestamps are treated as UT.
+"""
+import numpy as np
+
+# ====== CONSTANTS ======
+J2000_EPOCH = np.datetime64("2000-01-01T12:00:00")
+SIDEREAL_RATE = 1.00273790935  # sidereal hours per solar hour
+
+def days_since_j2000(timestamps):
+    """Fractional days since J2000.0 for datetime64 values or ISO strings"""
+    seconds = (np.asarray(timestamps, dtype="datetime64[s]") - J2000_EPOCH).astype(np.float64)
+    return seconds / 86400.0
+
+def greenwich_sidereal_time(days_since_j2000, hour_decimal):
+    """
+    Greenwich mean sidereal time in hours, as the yantras compute it:
+    the 0h sidereal time series evaluated at days_since_j2000, advanced
+    by the sidereal rate over hour_decimal hours of the day
+    """
+    GMST0 = (18.697374558 + 24.06570982441908 * np.asarray(days_since_j2000)) % 24
+    return (GMST0 + SIDEREAL_RATE * np.asarray(hour_decimal)) % 24
+
+def local_sidereal_time(gmst_hours, longitude):
+    """Local sidereal time in hours from GMST and east longitude in degrees"""
+    return (np.asarray(gmst_hours) + np.asarray(longitude) / 15.0) % 24
@@ -0,0 +1,98 @@
+"""
+Solar quantities used by the sundial yantras: equation of time, solar
+declination, local solar time and the sun's altitude/azimuth. Every
+function accepts scalars or NumPy arrays and broadcasts its arguments.
+"""
+import numpy as np
+
+from .coordinates import hour_angle_to_horizontal
+
+# ====== CONSTANTS ======
+STANDARD_MERIDIAN = 82.5  # IST
+OBLIQUITY_DEG = 23.45
+
+# ====== DATES ======
+def day_of_year(dates):
+    """
+    Day of year (1-366) for dates given as datetime64 values, ISO date
+    strings or anything np.datetime64 accepts
+    """
+    days = np.asarray(dates, dtype="datetime64[D]")
+    return (days - days.astype("datetime64[Y]")).astype(np.int64) + 1
+
+# ====== EQUATION OF TIME & DECLINATION ======
+def equation_of_time(day_of_year):
+    """Equation of time in minutes (Spencer's Fourier series)"""
+    B = 2 * np.pi * (np.asarray(day_of_year) - 1) / 365
+    return 229.18 * (
+        0.000075 + 0.001868*np.cos(B) - 0.032077*np.sin(B)
+        - 0.014615*np.cos(2*B) - 0.040849*np.sin(2*B)
+    )
+
+def solar_declination(day_of_year):
+    """δ = 23.45° * sin(360*(284 + n)/365), in degrees"""
+    return OBLIQUITY_DEG * np.sin(np.radians(360 * (284 + np.asarray(day_of_year)) / 365))
+
+def solar_longitude(day_of_year):
+    """Sun's mean ecliptic longitude in degrees, L = 280.460° + 0.9856474° n"""
+    return (280.460 + 0.9856474 * np.asarray(day_of_year)) % 360
+
+# ====== LOCAL SOLAR TIME ======
+def longitude_correction(longitude, standard_meridian=STANDARD_MERIDIAN):
+    """Minutes between local mean time and the standard meridian's clock time"""
+    return 4 * (np.asarray(longitude) - standard_meridian)
+
+def local_solar_time(clock_hours, equation_of_time_min, longitude, standard_meridian=STANDARD_MERIDIAN):
+    """True solar time in hours for a standard-meridian clock time"""
+    correction = longitude_correction(longitude, standard_meridian) + equation_of_time_min
+    return clock_hours + correction / 60
+
+def solar_hour_angle(solar_time_hours):
+    """Hour angle in degrees from true solar time (negative before noon)"""
+    return 15 * (np.asarray(solar_time_hours) - 12)
+
+def sunrise_hour_angle(latitude, declination_deg):
+    """
+    Hour angle of sunrise/sunset in degrees, cos H0 = -tan φ tan δ.
+    0 during polar night, 180 during midnight sun.
+    """
+    cos_h0 = -np.tan(np.radians(latitude)) * np.tan(np.radians(declination_deg))
+    return np.degrees(np.arccos(np.clip(cos_h0, -1, 1)))
+
+def altitude_hour_angle(latitude, declination_deg, altitude_deg):
+    """
+    Hour angle in degrees at which a body crosses an altitude (twilight,
+    refraction-corrected rising). 0 if it never gets that high, 180 if it
+    never gets that low.
+    """
+    lat, dec, alt = np.radians(latitude), np.radians(declination_deg), np.radians(altitude_deg)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cos_h = (np.sin(alt) - np.sin(lat) * np.sin(dec)) / (np.cos(lat) * np.cos(dec))
+    cos_h = np.where(np.isnan(cos_h), np.sign(np.sin(alt) - np.sin(lat) * np.sin(dec)), cos_h)
+    return np.degrees(np.arccos(np.clip(cos_h, -1, 1)))
+
+# ====== SOLAR POSITION ======
+def solar_position(dates, clock_hours, latitude, longitude,
+                   standard_meridian=STANDARD_MERIDIAN):
+    """
+    Sun's position for a clock time on a date at a site, with EoT and
+    declination from the selected ephemeris backend.
+    Returns a dict of arrays: altitude_deg, azimuth_deg (from North,
+    clockwise), hour_angle_deg, declination_deg, equation_of_time_min and
+    solar_longitude_deg.
+    """
+    from .ephemeris import solar_ephemeris
+
+    ephemeris = solar_ephemeris(dates)
+    eot = ephemeris["equation_of_time_min"]
+    declination = ephemeris["declination_deg"]
+    hour_angle = solar_hour_angle(local_solar_time(clock_hours, eot, longitude, standard_meridian))
+    altitude, azimuth = hour_angle_to_horizontal(hour_angle, declination, latitude)
+    return {
+        "altitude_deg": altitude,
+        "azimuth_deg": azimuth,
+        "hour_angle_deg": hour_angle,
+        "declination_deg": declination,
+        "equation_of_time_min": eot,
+        "solar_longitude_deg": ephemeris["solar_longitude_deg"],
+    }
@@ -0,0 +1,178 @@
+"""
+Star catalogs as packed, declination-indexed structured arrays.
+
+A catalog is one fixed-size row per star (STAR_DTYPE, 56 bytes), stored
+sorted by 1° declination band and by right ascension within each band.
+An index of where every band starts lets queries slice out just the
+rows they need: "within N° of the pole" or "brighter than M in this
+declination range" are contiguous slices, and "above the horizon now"
+is at most two RA windows per band. Only those rows are transformed,
+and on a memory-mapped catalog only those rows are read (plus the
+position columns, once per process, to build the band index).
+
+Catalogs come from a packed .npy file (memory-mapped and shared by
+every process on a host) or from a CSV with a header naming at least the
+columns ra (hours, J2000), dec (degrees, J2000) and mag; name and
+constellation are optional. Convert a CSV once with
+
+    python -m yantra_astro.pack_catalog stars.csv stars.npy
+"""
+import csv
+import os
+import threading
+
+import numpy as np
+
+from .coordinates import equatorial_to_horizontal
+from .solar import sunrise_hour_angle
+
+# ====== CATALOG FORMAT ======
+STAR_DTYPE = np.dtype([
+    ("number", "<i4"),          # row in the source catalog, its natural order
+    ("ra_hours", "<f8"),
+    ("dec_deg", "<f8"),
+    ("magnitude", "<f4"),
+    ("name", "S24"),            # UTF-8
+    ("constellation", "S8"),
+])
+BAND_DEG = 1.0
+BANDS = int(180 / BAND_DEG)
+
+_catalogs = {}
+_catalogs_lock = threading.Lock()
+
+def declination_band(dec_deg):
+    """Band number (0 at the south pole) of declinations in degrees"""
+    return np.clip(np.floor((np.asarray(dec_deg) + 90) / BAND_DEG), 0, BANDS - 1).astype(np.int64)
+
+# ====== CATALOG ======
+class StarCatalog:
+    """
+    Stars sorted by declination band, then right ascension, with the
+    offset of every band. Query results are STAR_DTYPE rows in catalog
+    (source) order.
+    """
+
+    def __init__(self, stars):
+        if stars.dtype != STAR_DTYPE:
+            raise ValueError("Star catalog rows must use STAR_DTYPE")
+        self.stars = stars
+        # Composite key band * 24 + RA increases monotonically through the
+        # rows, so one searchsorted finds any (band, RA window)
+        self.band_ra_key = declination_band(stars["dec_deg"]) * 24.0 + np.asarray(stars["ra_hours"])
+        if np.any(np.diff(self.band_ra_key) < 0):
+            raise ValueError("Star catalog rows must be sorted by declination band and RA "
+                             "(write the file with pack_star_catalog)")
+        self.band_offsets = np.searchsorted(self.band_ra_key, np.arange(BANDS + 1) * 24.0)
+        self.by_number = np.argsort(stars["number"], kind="stable")
+
+    def __len__(self):
+        return len(self.stars)
+
+    def _rows(self, index, max_magnitude=None):
+        """Rows at sorted positions, magnitude-filtered, in catalog order"""
+        if max_magnitude is not None:
+            index = index[self.stars["magnitude"][index] <= max_magnitude]
+        return self.stars[index[np.argsort(self.stars["number"][index], kind="stable")]]
+
+    def declination_range(self, dec_min, dec_max, max_magnitude=None):
+        """Stars with dec_min <= dec <= dec_max, touching only the covering bands"""
+        start = self.band_offsets[declination_band(dec_min)]
+        stop = self.band_offsets[declination_band(dec_max) + 1]
+        dec = np.asarray(self.stars["dec_deg"][start:stop])
+        index = start + np.flatnonzero((dec >= dec_min) & (dec <= dec_max))
+        return self._rows(index, max_magnitude)
+
+    def near_pole(self, radius_deg, north=True, max_magnitude=None):
+        """Stars within radius_deg of the north (or south) celestial pole"""
+        if north:
+            return self.declination_range(90 - radius_deg, 90, max_magnitude)
+        return self.declination_range(-90, -90 + radius_deg, max_magnitude)
+
+    def circumpolar(self, latitude, max_magnitude=None):
+        """Stars that never set at a latitude"""
+        return self.near_pole(abs(latitude), north=latitude >= 0, max_magnitude=max_magnitude)
+
+    def above_horizon_candidates(self, lst_hours, latitude, max_magnitude=None):
+        """
+        Every star that can be above the horizon at a local sidereal time:
+        per band, the RA window within the band's largest rising hour
+        angle of the meridian. A superset; callers test altitude > 0.
+        """
+        bands = np.arange(BANDS)
+        edges = -90 + bands * BAND_DEG
+        h0 = np.maximum(sunrise_hour_angle(latitude, edges),
+                        sunrise_hour_angle(latitude, edges + BAND_DEG)) / 15
+
+        # Up to two RA intervals per band: the window and, if it wraps past
+        # 24h, its continuation from 0h
+        whole = h0 >= 12
+        start = np.where(whole, 0, (lst_hours - h0) % 24)
+        stop = np.where(whole, 24, start + 2 * h0)
+        first_lo, first_hi = start, np.minimum(stop, 24)
+        second_lo, second_hi = np.zeros(BANDS), np.maximum(stop - 24, 0)
+
+        lows = np.concatenate([first_lo, second_lo]) + np.tile(bands, 2) * 24.0
+        highs = np.concatenate([first_hi, second_hi]) + np.tile(bands, 2) * 24.0
+        keep = (highs > lows) & (np.tile(h0, 2) > 0)
+        lo_rows = np.searchsorted(self.band_ra_key, lows[keep], side="left")
+        hi_rows = np.searchsorted(self.band_ra_key, highs[keep], side="left")
+        # Expand the row ranges without a Python loop
+        lengths = np.maximum(hi_rows - lo_rows, 0)
+        index = np.repeat(lo_rows - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        return self._rows(index, max_magnitude)
+
+# ====== BUILDING & LOADING ======
+def pack_star_rows(records):
+    """STAR_DTYPE rows, sorted by band and RA, from dicts with ra, dec, mag and optional name/constellation"""
+    stars = np.empty(len(records), dtype=STAR_DTYPE)
+    for i, star in enumerate(records):
+        stars[i] = (i, float(star["ra"]) % 24, float(star["dec"]), float(star["mag"]),
+                    str(star.get("name") or "").encode("utf-8")[:24],
+                    str(star.get("constellation") or "").encode("utf-8")[:8])
+    order = np.lexsort((stars["ra_hours"], declination_band(stars["dec_deg"])))
+    return stars[order]
+
+def star_catalog_from_records(records):
+    """In-memory StarCatalog from dicts with the keys ra, dec, mag, name and constellation"""
+    return StarCatalog(pack_star_rows(records))
+
+def read_csv_catalog(path):
+    """Rows of a CSV catalog as dicts; raises ValueError if required columns are missing"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = {"ra", "dec", "mag"} - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"Star catalog {path} lacks columns: {', '.join(sorted(missing))}")
+        return [row for row in reader if row["ra"] and row["dec"] and row["mag"]]
+
+def pack_star_catalog(records, path):
+    """Write a packed catalog .npy atomically"""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.save(f, pack_star_rows(records))
+    os.replace(tmp_path, path)
+    return path
+
+def load_star_catalog(path):
+    """
+    StarCatalog for a packed .npy (memory-mapped) or CSV file, loaded
+    once per process and path
+    """
+    path = os.path.abspath(path)
+    with _catalogs_lock:
+        if path not in _catalogs:
+            if path.endswith(".npy"):
+                _catalogs[path] = StarCatalog(np.load(path, mmap_mode="r"))
+            else:
+                _catalogs[path] = star_catalog_from_records(read_csv_catalog(path))
+        return _catalogs[path]
+
+# ====== POSITIONS ======
+def horizontal_positions(stars, lst_hours, latitude):
+    """Altitude and azimuth (degrees) of catalog rows at one sidereal time"""
+    return equatorial_to_horizontal(stars["ra_hours"], stars["dec_deg"], lst_hours, latitude)
+
+def star_labels(stars, field="name"):
+    """Decoded text of a bytes column (name or constellation) as a list"""
+    return np.char.decode(stars[field], "utf-8").tolist()
@@ -0,0 +1,88 @@
+"""
+Adaptive tessellation of the yantras' circles and arcs.
+
+Instead of a fixed point count, the number of vertices follows from how
+far a chord may stray from the true arc (its sagitta, r (1 - cos(step/2)))
+at the output's resolution: a fraction of a pixel for a preview, a
+fraction of a millimetre for a fabrication drawing. Vertices come from
+shared unit-circle tables of BASE_SEGMENTS * 2**level points per turn,
+built once per process and read-only; 96 points per turn puts every 30°
+zodiac boundary and every 11.25° compass point on a table node, and arcs
+between other angles get exact endpoints.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+# ====== TOLERANCES ======
+BASE_SEGMENTS = 96
+MAX_LEVEL = 12  # 393,216 points per turn
+DEFAULT_SCREEN_TOLERANCE_PX = 0.25
+DEFAULT_FABRICATION_TOLERANCE_MM = 0.05
+MIN_FABRICATION_TOLERANCE_MM = 0.01  # finer than any cutter; MAX_LEVEL caps the rest
+
+def screen_tolerance(extent_m, pixels, tolerance_px=DEFAULT_SCREEN_TOLERANCE_PX):
+    """Chord tolerance in metres for a drawing extent_m wide shown across pixels"""
+    return tolerance_px * extent_m / pixels
+
+def axes_tolerance(ax, extent_m, tolerance_px=DEFAULT_SCREEN_TOLERANCE_PX):
+    """Chord tolerance in metres for a drawing extent_m wide filling a matplotlib Axes' figure"""
+    pixels = ax.figure.dpi * min(ax.figure.get_size_inches())
+    return screen_tolerance(extent_m, pixels, tolerance_px)
+
+def fabrication_tolerance(tolerance_mm=None):
+    """
+    Chord tolerance in metres for a fabrication drawing (None for the
+    default), never finer than MIN_FABRICATION_TOLERANCE_MM
+    """
+    return max(tolerance_mm or DEFAULT_FABRICATION_TOLERANCE_MM, MIN_FABRICATION_TOLERANCE_MM) / 1000.0
+
+# ====== UNIT CIRCLE TABLES ======
+@lru_cache(maxsize=None)
+def unit_circle_table(level):
+    """(cos, sin) rows at BASE_SEGMENTS * 2**level angles, counterclockwise from +x"""
+    angles = np.linspace(0, 2 * np.pi, BASE_SEGMENTS * 2**level, endpoint=False)
+    table = np.stack([np.cos(angles), np.sin(angles)])
+    table.setflags(write=False)
+    return table
+
+def tessellation_level(radius, tolerance):
+    """Coarsest table level whose chords stay within tolerance of a circle of radius"""
+    if tolerance >= radius:
+        return 0
+    max_step = 2 * np.arccos(1 - tolerance / radius)
+    level = int(np.ceil(np.log2(2 * np.pi / (BASE_SEGMENTS * max_step))))
+    return min(max(level, 0), MAX_LEVEL)
+
+# ====== ARCS ======
+def arc_points(radius, start_deg, end_deg, tolerance, center=(0.0, 0.0)):
+    """
+    (N, 2) vertices along an arc from start_deg to end_deg (degrees,
+    counterclockwise from +x, end_deg > start_deg): the exact endpoints
+    and every table node in between
+    """
+    level = tessellation_level(radius, tolerance)
+    cos_table, sin_table = unit_circle_table(level)
+    step = 360.0 / cos_table.size
+    first = int(np.floor(start_deg / step + 1e-9)) + 1
+    last = int(np.ceil(end_deg / step - 1e-9)) - 1
+    nodes = np.arange(first, last + 1) % cos_table.size
+
+    ends = np.radians([start_deg, end_deg])
+    x = np.concatenate([[np.cos(ends[0])], cos_table[nodes], [np.cos(ends[1])]])
+    y = np.concatenate([[np.sin(ends[0])], sin_table[nodes], [np.sin(ends[1])]])
+    return np.stack([center[0] + radius * x, center[1] + radius * y], axis=1)
+
+def circle_points(radius, tolerance, center=(0.0, 0.0)):
+    """Closed (N, 2) outline of a circle (first vertex repeated last)"""
+    return arc_points(radius, 0.0, 360.0, tolerance, center)
+
+def annulus_sector(inner_radius, outer_radius, start_deg, end_deg, tolerance):
+    """Closed polygon (N, 2) of the ring sector between two radii and two angles"""
+    outer = arc_points(outer_radius, start_deg, end_deg, tolerance)
+    inner = arc_points(inner_radius, start_deg, end_deg, tolerance)[::-1]
+    return np.concatenate([outer, inner])
+
+def outline_json(points, decimals=5):
+    """Vertices as [[x, y], ...] rounded to 10 µm for JSON output"""
+    return np.round(points, decimals).tolist()
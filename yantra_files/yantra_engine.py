@@ -0,0 +1,430 @@
+"""
+In-process yantra calculation engine.
+
+Maps each yantra type to the importable compute/draw functions of its
+module so callers (the Flask backend, workers) can run a yantra without
+starting a new interpreter.
+
+matplotlib is only imported by the draw functions and render_png, so a
+headless run (render=False) computes geometry without ever loading it.
+"""
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+import yantra_astro
+import Samrat_Yantra_Calcs
+import rasi_valya_yantra
+import dpcy_yantra
+import rama_yantra
+import diagsma_yantra
+import solar_year_grid
+
+# Bump when a change to any compute/draw function alters results, so
+# persisted cache entries from older code are no longer addressed
+RESULT_VERSION = 11
+
+# ====== YANTRA REGISTRY ======
+YANTRAS = {
+    "samrat": {
+        "module": Samrat_Yantra_Calcs,
+        "compute": Samrat_Yantra_Calcs.compute_samrat_yantra,
+        "draw": Samrat_Yantra_Calcs.draw_samrat_yantra,
+        "summarize": Samrat_Yantra_Calcs.summarize_samrat_yantra,
+        "required_params": ["latitude", "longitude", "scale_m", "date"],
+        "optional_params": {"tolerance_mm": float},
+        "response_type": "samrat",
+        "json_name": "samrat_yantra.json",
+        "image_name": "samrat_yantra.png",
+    },
+    "rasivalaya": {
+        "module": rasi_valya_yantra,
+        "compute": rasi_valya_yantra.compute_rasivalaya_yantra,
+        "draw": rasi_valya_yantra.draw_rasivalaya_yantra,
+        "summarize": rasi_valya_yantra.summarize_rasivalaya_yantra,
+        "required_params": ["latitude", "longitude", "scale_m", "date"],
+        "optional_params": {"tolerance_mm": float},
+        "response_type": "rasivalaya",
+        "json_name": "rasivalaya_yantra.json",
+        "image_name": "rasivalaya_yantra.png",
+    },
+    "dhruva": {
+        "module": dpcy_yantra,
+        "compute": dpcy_yantra.compute_dhruva_yantra,
+        "draw": dpcy_yantra.draw_dhruva_yantra,
+        "summarize": dpcy_yantra.summarize_dhruva_yantra,
+        "required_params": ["latitude", "longitude", "scale_m", "date", "time"],
+        "optional_params": {"max_magnitude": float, "tolerance_mm": float},
+        "response_type": "dhruva_protha_chakra",
+        "json_name": "dhruva_protha_chakra_yantra.json",
+        "image_name": "dhruva_protha_chakra_yantra.png",
+    },
+    "rama": {
+        "module": rama_yantra,
+        "compute": rama_yantra.compute_rama_yantra,
+        "draw": rama_yantra.draw_rama_yantra,
+        "summarize": rama_yantra.summarize_rama_yantra,
+        "required_params": ["latitude", "longitude", "scale_m", "date", "time"],
+        "optional_params": {"tolerance_mm": float},
+        "response_type": "rama",
+        "json_name": "rama_yantra.json",
+        "image_name": "rama_yantra.png",
+    },
+    "diagsma": {
+        "module": diagsma_yantra,
+        "compute": diagsma_yantra.compute_diagsma_yantra,
+        "draw": diagsma_yantra.draw_diagsma_yantra,
+        "summarize": diagsma_yantra.summarize_diagsma_yantra,
+        "required_params": ["latitude", "longitude", "scale_m", "date", "time"],
+        "optional_params": {"tolerance_mm": float},
+        "response_type": "diagsma",
+        "json_name": "digansha_yantra.json",
+        "image_name": "digansha_yantra.png",
+    },
+}
+
+# Yantras whose core maths can be evaluated over whole arrays of sites/dates
+BATCH_YANTRAS = {
+    "samrat": Samrat_Yantra_Calcs.compute_samrat_batch,
+    "rasivalaya": rasi_valya_yantra.compute_rasivalaya_batch,
+    "diagsma": diagsma_yantra.compute_diagsma_batch,
+}
+
+# Numeric batch columns a yantra accepts in addition to the site/date ones
+BATCH_OPTIONAL_COLUMNS = {
+    "diagsma": ["compass_bearing_deg"],
+}
+
+# Largest yantra accepted, in metres (fabrication outlines grow with scale)
+MAX_SCALE_M = 100.0
+
+# Upper bound on rows in one batch request
+MAX_BATCH_ROWS = 100_000
+
+# Coarsest sampling step accepted for shadow tracks, in seconds
+MAX_TRACK_STEP_SECONDS = 3600
+
+# Coarsest sampling cadence accepted for star trails, in minutes
+MAX_TRAIL_CADENCE_MINUTES = 60
+
+# Longest date range accepted for rise/set/transit events, in days
+MAX_EVENT_DAYS = 3660
+
+# ====== PARAMETER HANDLING ======
+def missing_parameters(yantra_type, params):
+    """Return the required parameters absent from a request body"""
+    return [p for p in YANTRAS[yantra_type]["required_params"] if p not in params]
+
+def parse_parameters(yantra_type, params):
+    """
+    Convert raw request parameters into typed keyword arguments for the
+    yantra's compute function. Raises ValueError on malformed input.
+    """
+    required = YANTRAS[yantra_type]["required_params"]
+    kwargs = {
+        "latitude": float(params["latitude"]),
+        "longitude": float(params["longitude"]),
+        "scale_m": float(params["scale_m"]),
+        "date_str": datetime.strptime(str(params["date"]), "%Y-%m-%d").strftime("%Y-%m-%d"),
+    }
+    if "time" in required:
+        kwargs["time_str"] = datetime.strptime(str(params["time"]), "%H:%M").strftime("%H:%M")
+    for name, convert in YANTRAS[yantra_type].get("optional_params", {}).items():
+        if params.get(name) is not None:
+            kwargs[name] = convert(params[name])
+
+    non_finite = [name for name, value in kwargs.items() if isinstance(value, float) and not np.isfinite(value)]
+    if non_finite:
+        raise ValueError(f"Parameters must be finite numbers: {', '.join(non_finite)}")
+    if not -90 <= kwargs["latitude"] <= 90:
+        raise ValueError("latitude must be between -90 and 90")
+    if not -180 <= kwargs["longitude"] <= 180:
+        raise ValueError("longitude must be between -180 and 180")
+    if not 0 < kwargs["scale_m"] <= MAX_SCALE_M:
+        raise ValueError(f"scale_m must be positive and at most {MAX_SCALE_M:g}")
+    min_tolerance = yantra_astro.tessellation.MIN_FABRICATION_TOLERANCE_MM
+    if kwargs.get("tolerance_mm", min_tolerance) < min_tolerance:
+        raise ValueError(f"tolerance_mm must be at least {min_tolerance:g}")
+    return kwargs
+
+def parse_batch_parameters(params, with_time=False, optional_columns=()):
+    """
+    Convert a batch request into equal-length NumPy columns. Each field is
+    either a list (one value per row) or a scalar broadcast to every row;
+    scale_m defaults to 1. With with_time, a time field (HH:MM) is
+    required too and becomes clock_hours; optional_columns name numeric
+    fields passed through when present. Raises ValueError on malformed
+    input.
+    """
+    fields = {"latitude": params.get("latitude"), "longitude": params.get("longitude"),
+              "date": params.get("date"), "scale_m": params.get("scale_m", 1.0)}
+    if with_time:
+        fields["time"] = params.get("time")
+    optional = {name: params[name] for name in optional_columns if params.get(name) is not None}
+    missing = [name for name, value in fields.items() if value is None]
+    if missing:
+        raise ValueError(f"Missing required parameters: {', '.join(missing)}")
+
+    lengths = {len(value) for value in list(fields.values()) + list(optional.values()) if isinstance(value, list)}
+    if not lengths:
+        raise ValueError("At least one batch parameter must be a list")
+    if len(lengths) > 1:
+        raise ValueError("Batch parameter lists must all have the same length")
+    rows = lengths.pop()
+    if not 0 < rows <= MAX_BATCH_ROWS:
+        raise ValueError(f"Batch size must be between 1 and {MAX_BATCH_ROWS}")
+
+    def column(value, dtype):
+        try:
+            return np.broadcast_to(np.asarray(value, dtype=dtype), (rows,))
+        except (TypeError, ValueError):
+            raise ValueError(f"Malformed batch values ({value!r:.40})")
+
+    latitude = column(fields["latitude"], float)
+    longitude = column(fields["longitude"], float)
+    scale_m = column(fields["scale_m"], float)
+    dates = column(fields["date"], "datetime64[D]")
+
+    if np.isnat(dates).any():
+        raise ValueError("date values must be YYYY-MM-DD")
+    if not np.all((latitude >= -90) & (latitude <= 90)):
+        raise ValueError("latitude must be between -90 and 90")
+    if not np.all((longitude >= -180) & (longitude <= 180)):
+        raise ValueError("longitude must be between -180 and 180")
+    if not np.all((scale_m > 0) & (scale_m <= MAX_SCALE_M)):
+        raise ValueError(f"scale_m must be positive and at most {MAX_SCALE_M:g}")
+
+    columns = {"latitude": latitude, "longitude": longitude, "scale_m": scale_m, "dates": dates}
+    if with_time:
+        # Parse each distinct time once; a batch rarely has many
+        times, rows_of_time = np.unique(column(fields["time"], str), return_inverse=True)
+        hours = []
+        for value in times:
+            clock = datetime.strptime(str(value), "%H:%M")
+            hours.append(clock.hour + clock.minute / 60.0)
+        columns["clock_hours"] = np.asarray(hours)[rows_of_time]
+    for name, value in optional.items():
+        columns[name] = column(value, float)
+        if not np.all(np.isfinite(columns[name])):
+            raise ValueError(f"{name} values must be finite numbers")
+    return columns
+
+def parse_shadow_track_parameters(params):
+    """
+    Typed arguments for Samrat_Yantra_Calcs.compute_samrat_shadow_track.
+    Raises ValueError on malformed input.
+    """
+    kwargs = parse_parameters("samrat", dict({"scale_m": 1.0}, **params))
+    del kwargs["scale_m"]
+    kwargs.pop("tolerance_mm", None)
+    try:
+        step = float(params.get("step_seconds", 1))
+    except (TypeError, ValueError):
+        step = 0.0
+    if not (step.is_integer() and 1 <= step <= MAX_TRACK_STEP_SECONDS):
+        raise ValueError(f"step_seconds must be a whole number between 1 and {MAX_TRACK_STEP_SECONDS}")
+    kwargs["step_seconds"] = int(step)
+    return kwargs
+
+def parse_star_trail_parameters(params):
+    """
+    Typed arguments for dpcy_yantra.compute_dhruva_star_trails.
+    Raises ValueError on malformed input.
+    """
+    kwargs = parse_parameters("dhruva", dict({"scale_m": 1.0, "time": "00:00"}, **params))
+    del kwargs["time_str"]
+    kwargs.pop("tolerance_mm", None)
+    try:
+        cadence = float(params.get("cadence_minutes", 1))
+    except (TypeError, ValueError):
+        cadence = 0.0
+    if not (cadence.is_integer() and 1 <= cadence <= MAX_TRAIL_CADENCE_MINUTES):
+        raise ValueError(f"cadence_minutes must be a whole number between 1 and {MAX_TRAIL_CADENCE_MINUTES}")
+    kwargs["cadence_minutes"] = int(cadence)
+    return kwargs
+
+def parse_event_parameters(params):
+    """
+    Typed site and date range for rama_yantra.compute_rama_events.
+    Raises ValueError on malformed input.
+    """
+    kwargs = parse_parameters("samrat", {"latitude": params["latitude"], "longitude": params["longitude"],
+                                         "scale_m": 1.0, "date": params["start_date"]})
+    end_date = datetime.strptime(str(params.get("end_date", params["start_date"])), "%Y-%m-%d")
+    days = (end_date - datetime.strptime(kwargs["date_str"], "%Y-%m-%d")).days + 1
+    if not 1 <= days <= MAX_EVENT_DAYS:
+        raise ValueError(f"end_date must be on or after start_date and span at most {MAX_EVENT_DAYS} days")
+    return {"latitude": kwargs["latitude"], "longitude": kwargs["longitude"],
+            "start_date": kwargs["date_str"], "end_date": end_date.strftime("%Y-%m-%d")}
+
+def parse_year_grid_parameters(params):
+    """
+    Typed site, year and analemma clock time for a year grid request.
+    Raises ValueError on malformed input.
+    """
+    kwargs = parse_parameters("samrat", {"latitude": params["latitude"], "longitude": params["longitude"],
+                                         "scale_m": params.get("scale_m", 1.0), "date": f"{params['year']}-01-01"})
+    clock_time = datetime.strptime(str(params.get("clock_time", "12:00")), "%H:%M").strftime("%H:%M")
+    return {"latitude": kwargs["latitude"], "longitude": kwargs["longitude"],
+            "year": int(kwargs["date_str"][:4]), "scale_m": kwargs["scale_m"], "clock_time": clock_time}
+
+def cache_key(yantra_type, params, render=True):
+    """
+    Content address of a yantra computation: a hash over the yantra type
+    and its canonicalised (parsed and normalised) parameters, plus the
+    ephemeris backend the result is computed with
+    """
+    canonical = {
+        "version": RESULT_VERSION,
+        "ephemeris": yantra_astro.get_ephemeris_backend(),
+        "yantra_type": yantra_type,
+        "parameters": parse_parameters(yantra_type, params),
+        "render": bool(render),
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def event_cache_key(params):
+    """Content address of a rise/set/transit computation for a site and date range"""
+    canonical = {"version": RESULT_VERSION, "kind": "rama_events", "parameters": parse_event_parameters(params)}
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+# ====== RENDERING ======
+def render_png(yantra_type, yantra_data, dpi=100):
+    """Render a computed yantra to PNG bytes without touching pyplot state"""
+    from matplotlib.figure import Figure
+
+    spec = YANTRAS[yantra_type]
+    fig = Figure(figsize=spec["module"].FIGURE_SIZE)
+    ax = fig.add_subplot(1, 1, 1)
+    spec["draw"](ax, yantra_data)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches="tight", dpi=dpi)
+    return buffer.getvalue()
+
+# ====== ARTIFACTS ======
+def build_artifact(name, kind, media_type, data):
+    """Describe one in-memory output of a job"""
+    return {
+        "name": name,
+        "kind": kind,
+        "media_type": media_type,
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "data": data,
+    }
+
+def artifact_manifest(artifacts):
+    """Artifact descriptions without their payloads, safe to put in a response"""
+    return [{k: v for k, v in artifact.items() if k != "data"} for artifact in artifacts]
+
+def find_artifact(artifacts, kind):
+    """First artifact of the given kind from a job's manifest, or None"""
+    return next((artifact for artifact in artifacts if artifact["kind"] == kind), None)
+
+# ====== EXECUTION ======
+def run_yantra(yantra_type, params, render=True):
+    """
+    Compute a yantra in-process.
+    Returns yantra data, a console summary and the manifest of artifacts
+    the job produced (yantra JSON, plus the PNG when rendered). Artifacts
+    are captured in memory, so concurrent jobs never share files.
+    """
+    spec = YANTRAS[yantra_type]
+    kwargs = parse_parameters(yantra_type, params)
+    yantra_data = spec["compute"](**kwargs)
+
+    artifacts = [
+        build_artifact(spec["json_name"], "data", "application/json",
+                       json.dumps(yantra_data, indent=2).encode("utf-8"))
+    ]
+    if render:
+        artifacts.append(build_artifact(spec["image_name"], "image", "image/png",
+                                        render_png(yantra_type, yantra_data)))
+
+    return {
+        "yantra_data": yantra_data,
+        "output": spec["summarize"](yantra_data),
+        "artifacts": artifacts,
+    }
+
+def run_yantra_batch(yantra_type, params):
+    """
+    Evaluate a yantra's core maths over arrays of parameters in one pass.
+    Returns columnar results: one list per quantity, rows aligned with the
+    request (2-D quantities such as hour-line angles are lists of rows).
+    """
+    with_time = "time" in YANTRAS[yantra_type]["required_params"]
+    columns = parse_batch_parameters(params, with_time, BATCH_OPTIONAL_COLUMNS.get(yantra_type, ()))
+    dates = columns["dates"]
+    results = BATCH_YANTRAS[yantra_type](**columns)
+
+    data = {
+        "latitude": columns["latitude"].tolist(),
+        "longitude": columns["longitude"].tolist(),
+        "scale_m": columns["scale_m"].tolist(),
+        "date": dates.astype(str).tolist(),
+        "day_of_year": yantra_astro.day_of_year(dates).tolist(),
+    }
+    if with_time:
+        data["clock_hours"] = columns["clock_hours"].tolist()
+    for name in BATCH_OPTIONAL_COLUMNS.get(yantra_type, ()):
+        if name in columns:
+            data[name] = columns[name].tolist()
+    data.update({name: np.asarray(values).tolist() for name, values in results.items()})
+    return {"yantra_type": yantra_type, "count": len(dates), "columns": data}
+
+def run_samrat_shadow_track(params):
+    """
+    Samrat shadow track for a site and date: (meta, float32 angle array)
+    """
+    return Samrat_Yantra_Calcs.compute_samrat_shadow_track(**parse_shadow_track_parameters(params))
+
+def run_dhruva_star_trails(params):
+    """
+    Dhruva-Protha-Chakra star trails from dusk to dawn for a site and date
+    """
+    return dpcy_yantra.compute_dhruva_star_trails(**parse_star_trail_parameters(params))
+
+def run_rama_events(params):
+    """
+    Rise, set and culmination times of the Rama Yantra bodies for a site
+    over a date range
+    """
+    return rama_yantra.compute_rama_events(**parse_event_parameters(params))
+
+def run_year_grid(params, output_dir, ensure_grid=None):
+    """
+    Generate (or reuse) a site's minute-by-minute solar grid for a year
+    under output_dir and derive its analemma and seasonal envelope.
+    ensure_grid(name, generate), if given, returns the grid file's path
+    and calls generate(path) when the file must be written, so callers
+    can coalesce concurrent requests and bound the grid directory.
+    Returns (grid file name, summary).
+    """
+    args = parse_year_grid_parameters(params)
+    name = solar_year_grid.year_grid_name(args["latitude"], args["longitude"], args["year"], RESULT_VERSION)
+
+    def generate(path):
+        solar_year_grid.generate_year_grid(args["latitude"], args["longitude"], args["year"], path)
+
+    if ensure_grid:
+        path = ensure_grid(name, generate)
+    else:
+        path = os.path.join(output_dir, name)
+        if not os.path.exists(path):
+            generate(path)
+
+    grid = solar_year_grid.load_year_grid(path)
+    summary = solar_year_grid.summarize_year_grid(
+        grid,
+        solar_year_grid.derive_analemma(grid, args["clock_time"], args["scale_m"]),
+        solar_year_grid.derive_seasonal_envelope(grid)
+    )
+    summary.update({"latitude": args["latitude"], "longitude": args["longitude"], "year": args["year"]})
+    return name, summary
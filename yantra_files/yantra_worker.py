@@ -0,0 +1,94 @@
+"""
+Persistent yantra worker speaking a JSON-lines protocol.
+
+The worker imports numpy, matplotlib and every yantra module once, then
+serves jobs until stdin is closed. Each job is one JSON object per line:
+
+    {"id": "...", "yantra_type": "samrat", "parameters": {...}, "render": true}
+
+and each reply is one JSON line carrying the yantra data, the console
+summary and the manifest of artifacts the job produced, payloads base64
+encoded. Every job runs inside its own scratch directory, so nothing a
+job writes can be picked up by another. The first line written is a
+readiness message so the pool knows the imports have finished.
+"""
+import base64
+import json
+import os
+import resource
+import sys
+import tempfile
+
+import yantra_engine
+
+def peak_rss_kb():
+    """Peak resident set size of this worker in kilobytes"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def handle_job(job, home):
+    """Run one job in a fresh scratch directory and build its reply message"""
+    reply = {"id": job.get("id")}
+    try:
+        yantra_type = job["yantra_type"]
+        if yantra_type not in yantra_engine.YANTRAS:
+            raise ValueError(f"Unknown yantra type: {yantra_type}")
+        with tempfile.TemporaryDirectory(prefix="yantra-job-") as scratch:
+            os.chdir(scratch)
+            try:
+                result = yantra_engine.run_yantra(yantra_type, job.get("parameters", {}),
+                                                  render=job.get("render", True))
+            finally:
+                os.chdir(home)
+    except (KeyError, ValueError) as e:
+        reply.update({"success": False, "error": str(e), "error_type": "invalid_parameters"})
+        return reply
+    except Exception as e:
+        reply.update({"success": False, "error": f"Execution error: {e}", "error_type": "execution_error"})
+        return reply
+
+    reply.update({
+        "success": True,
+        "yantra_data": result["yantra_data"],
+        "output": result["output"],
+        "artifacts": [
+            dict(artifact, data=base64.b64encode(artifact["data"]).decode("ascii"))
+            for artifact in result["artifacts"]
+        ],
+    })
+    return reply
+
+def main():
+    # Keep the protocol stream clean: anything the yantra code prints goes to stderr
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+
+    def send(message):
+        message["pid"] = os.getpid()
+        message["rss_kb"] = peak_rss_kb()
+        protocol.write(json.dumps(message) + "\n")
+        protocol.flush()
+
+    # Workers are long-lived, so load the renderer up front rather than on
+    # the first render job; headless jobs simply never use it
+    import matplotlib.figure  # noqa: F401
+    # Map the ephemeris data before accepting jobs; the pages are shared
+    # with every other worker through the OS page cache
+    yantra_engine.yantra_astro.preload_ephemeris()
+
+    home = os.getcwd()
+    send({"ready": True})
+
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            send({"id": None, "success": False, "error": f"Malformed job line: {e}",
+                  "error_type": "protocol_error"})
+            continue
+        send(handle_job(job, home))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Asynchronous yantra jobs.
+
+Long renders and multi-date requests are submitted as jobs instead of
+being computed on the HTTP thread. Jobs wait in a bounded queue and are
+picked up by a fixed set of job threads; each job is one or more yantra
+computations whose progress and artifacts can be polled by job id.
+Finished jobs are kept for a while so their results can be fetched, then
+dropped.
+"""
+import queue
+import threading
+import time
+import uuid
+
+class QueueFull(Exception):
+    """The job queue is at capacity and cannot accept another job"""
+
+class Job:
+    """One submitted job: its tasks, progress and collected results"""
+
+    def __init__(self, yantra_type, tasks, render=True):
+        self.id = uuid.uuid4().hex
+        self.yantra_type = yantra_type
+        self.tasks = tasks  # list of parameter dicts
+        self.render = render
+        self.status = "queued"
+        self.completed = 0
+        self.results = []  # one execution result per finished task
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ("succeeded", "failed")
+
+    def describe(self):
+        """Status and progress of the job, safe to put in a response"""
+        return {
+            "job_id": self.id,
+            "yantra_type": self.yantra_type,
+            "status": self.status,
+            "progress": {
+                "completed": self.completed,
+                "total": len(self.tasks),
+                "fraction": round(self.completed / len(self.tasks), 4)
+            },
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+class JobManager:
+    """
+    Bounded job queue drained by a fixed number of job threads.
+    runner(yantra_type, parameters, render) computes one task and returns
+    an execution result dict with "success" and, on failure, "error".
+    """
+
+    def __init__(self, runner, workers=2, max_queue=64, retention_seconds=3600,
+                 max_finished=1000):
+        self.runner = runner
+        self.retention_seconds = retention_seconds
+        self.max_finished = max_finished
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = {}  # id -> Job, in submission order
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.rejected = 0
+        self._threads = [
+            threading.Thread(target=self._work, name=f"yantra-job-{i}", daemon=True)
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, yantra_type, tasks, render=True):
+        """Queue a job and return it; raises QueueFull when at capacity"""
+        job = Job(yantra_type, tasks, render)
+        with self._lock:
+            self._prune()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.rejected += 1
+                raise QueueFull(f"Job queue is full ({self._queue.maxsize} jobs waiting)")
+            self._jobs[job.id] = job
+            self.submitted += 1
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            for parameters in job.tasks:
+                try:
+                    result = self.runner(job.yantra_type, parameters, job.render)
+                except Exception as e:
+                    result = {"success": False, "error": f"Execution error: {e}"}
+                if not result["success"]:
+                    job.error = f"Task {job.completed}: {result['error']}"
+                    break
+                job.results.append(result)
+                job.completed += 1
+            # Both fields change together under the lock, so _prune never
+            # sees a finished job without its finish time
+            with self._lock:
+                job.finished_at = time.time()
+                job.status = "failed" if job.error else "succeeded"
+
+    def _prune(self):
+        """Forget finished jobs past retention, and the oldest beyond the cap"""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished:
+            if now - job.finished_at > self.retention_seconds:
+                del self._jobs[job.id]
+        finished = [job for job in finished if job.id in self._jobs]
+        for job in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+
+    def stats(self):
+        with self._lock:
+            by_status = {}
+            for job in self._jobs.values():
+                by_status[job.status] = by_status.get(job.status, 0) + 1
+            return {
+                "workers": len(self._threads),
+                "queued": self._queue.qsize(),
+                "max_queue": self._queue.maxsize,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "jobs": by_status
+            }
+
+    def shutdown(self):
+        """Stop the job threads once the jobs already queued have run"""
+        for _ in self._threads:
+            self._queue.put(None)
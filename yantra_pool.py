@@ -0,0 +1,181 @@
+"""
+Pool of pre-warmed yantra worker processes.
+
+Workers run yantra_files/yantra_worker.py and are reused across requests.
+A job that times out or crashes only costs its own worker, which is
+replaced; workers are also recycled after a number of jobs or once their
+peak memory passes a high-water mark.
+"""
+import itertools
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+class WorkerTimeout(Exception):
+    """A job did not finish within the job timeout"""
+
+class WorkerCrashed(Exception):
+    """A worker process exited while starting up or running a job"""
+
+class YantraWorker:
+    """One long-lived worker process and its reply stream"""
+
+    def __init__(self, worker_script, cwd):
+        self.process = subprocess.Popen(
+            [sys.executable, worker_script],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=cwd
+        )
+        self.replies = queue.Queue()
+        self.ready = False
+        self.jobs_done = 0
+        self.peak_rss_kb = 0
+        reader = threading.Thread(target=self._read_replies, daemon=True)
+        reader.start()
+
+    @property
+    def pid(self):
+        return self.process.pid
+
+    def _read_replies(self):
+        for line in self.process.stdout:
+            self.replies.put(line)
+        self.replies.put(None)  # EOF: the process has exited
+
+    def _next_reply(self, timeout):
+        try:
+            line = self.replies.get(timeout=timeout)
+        except queue.Empty:
+            raise WorkerTimeout(f"Worker {self.pid} did not reply within {timeout}s")
+        if line is None:
+            raise WorkerCrashed(f"Worker {self.pid} exited with code {self.process.wait()}")
+        message = json.loads(line)
+        self.peak_rss_kb = message.get("rss_kb", self.peak_rss_kb)
+        return message
+
+    def wait_ready(self, timeout):
+        if not self.ready:
+            self._next_reply(timeout)
+            self.ready = True
+
+    def run(self, job, timeout):
+        try:
+            self.process.stdin.write(json.dumps(job) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise WorkerCrashed(f"Worker {self.pid} is not accepting jobs")
+        reply = self._next_reply(timeout)
+        self.jobs_done += 1
+        return reply
+
+    def stop(self, timeout=5):
+        """Ask the worker to exit by closing stdin, killing it if it lingers"""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+
+class WorkerPool:
+    """Fixed-size pool of yantra workers handing out one job per idle worker"""
+
+    def __init__(self, worker_script, cwd, size=None, max_jobs_per_worker=500,
+                 max_rss_mb=512, job_timeout=60, startup_timeout=60):
+        self.worker_script = worker_script
+        self.cwd = cwd
+        self.size = size or os.cpu_count() or 1
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_kb = max_rss_mb * 1024
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._idle = queue.Queue()
+        self._closed = False
+        self.stats = {"jobs": 0, "timeouts": 0, "crashes": 0, "recycled": 0}
+
+        # Pre-warm: every worker starts importing numpy/matplotlib right away
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self):
+        return YantraWorker(self.worker_script, self.cwd)
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _needs_recycling(self, worker):
+        return (worker.jobs_done >= self.max_jobs_per_worker
+                or worker.peak_rss_kb >= self.max_rss_kb)
+
+    def run(self, yantra_type, parameters, render=True):
+        """
+        Run one job on an idle worker, blocking until one is free.
+        Returns the worker's reply message.
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool has been shut down")
+
+        job = {
+            "id": next(self._job_ids),
+            "yantra_type": yantra_type,
+            "parameters": parameters,
+            "render": render
+        }
+        worker = self._idle.get()
+        try:
+            worker.wait_ready(self.startup_timeout)
+            reply = worker.run(job, self.job_timeout)
+            self._count("jobs")
+            return reply
+        except WorkerTimeout:
+            # Only this job's worker is lost; the rest of the pool keeps serving
+            self._count("timeouts")
+            worker.kill()
+            worker = self._spawn()
+            raise
+        except WorkerCrashed:
+            self._count("crashes")
+            worker.kill()
+            worker = self._spawn()
+            raise
+        finally:
+            if self._needs_recycling(worker):
+                self._count("recycled")
+                worker.stop()
+                worker = self._spawn()
+            self._idle.put(worker)
+
+    def describe(self):
+        """Pool configuration and counters for status endpoints"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats.update({
+            "size": self.size,
+            "idle_workers": self._idle.qsize(),
+            "max_jobs_per_worker": self.max_jobs_per_worker,
+            "max_rss_mb": self.max_rss_kb // 1024,
+            "job_timeout_s": self.job_timeout
+        })
+        return stats
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            worker.stop()